@@ -1,6 +1,6 @@
 import { Orchestrator } from "../orchestrator/Orchestrator";
 import fs, { write } from "fs";
-import { CSVLogger } from "../util/logger/CSVLogger";
+import { CSVLogger, resolveLogPath } from "../util/logger/CSVLogger";
 
 async function StreamingQueryApproximationApproachOrchestrator() {
     const logger = new CSVLogger('approximation_approach_log.csv');
@@ -74,8 +74,9 @@ WHERE {
 
 
 function startResourceUsageLogging(filePath = 'approximation_approach_resource_usage.csv', intervalMs = 100) {
-    const writeHeader = !fs.existsSync(filePath);
-    const logStream = fs.createWriteStream(filePath, { flags: 'a' });
+    const logPath = resolveLogPath(filePath);
+    const writeHeader = !fs.existsSync(logPath);
+    const logStream = fs.createWriteStream(logPath, { flags: 'a' });
     if (writeHeader) {
         logStream.write('timestamp,cpu_user,cpu_system,rss,heapTotal,heapUsed,heapUsedMB,external\n');
 
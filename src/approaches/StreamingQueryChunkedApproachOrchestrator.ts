@@ -1,7 +1,7 @@
 import { Orchestrator } from "../orchestrator/Orchestrator";
 import fs from 'fs';
 
-import { CSVLogger } from "../util/logger/CSVLogger";
+import { CSVLogger, resolveLogPath } from "../util/logger/CSVLogger";
 /**
  *
  */
@@ -88,8 +88,9 @@ StreamingQueryHiveApproachOrchestrator().catch(error => {
  * @param intervalMs
  */
 function startResourceUsageLogging(filePath = 'streaming_query_hive_resource_log.csv', intervalMs = 100) {
-    const writeHeader = !fs.existsSync(filePath);
-    const logStream = fs.createWriteStream(filePath, { flags: 'a' });
+    const logPath = resolveLogPath(filePath);
+    const writeHeader = !fs.existsSync(logPath);
+    const logStream = fs.createWriteStream(logPath, { flags: 'a' });
     if (writeHeader) {
         logStream.write('timestamp,cpu_user,cpu_system,rss,heapTotal,heapUsed,heapUsedMB,external\n');
     }
@@ -3,6 +3,7 @@ import { RDFStream, RSPEngine, RSPQLParser } from "rsp-js";
 import { hash_string_md5, turtleStringToStore } from "../util/Util";
 import { v4 as uuidv4 } from 'uuid';
 import fs from 'fs';
+import { resolveLogPath } from "../util/logger/CSVLogger";
 const N3 = require('n3');
 const mqtt = require('mqtt');
 const { DataFactory } = N3;
@@ -54,7 +55,7 @@ export class FetchingAllDataClientSide {
      * Initialize CSV logging for this approach
      */
     private initializeLogging() {
-        const logFilePath = 'fetching_client_side_log.csv';
+        const logFilePath = resolveLogPath('fetching_client_side_log.csv');
         const writeHeader = !fs.existsSync(logFilePath);
         this.logStream = fs.createWriteStream(logFilePath, { flags: 'a' });
         
@@ -287,8 +288,9 @@ export class FetchingAllDataClientSide {
      * @param intervalMs
      */
     startResourceUsageLogging(filePath = 'fetching_client_side_resource_usage.csv', intervalMs = 100) {
-        const writeHeader = !fs.existsSync(filePath);
-        const logStream = fs.createWriteStream(filePath, { flags: 'a' });
+        const logPath = resolveLogPath(filePath);
+        const writeHeader = !fs.existsSync(logPath);
+        const logStream = fs.createWriteStream(logPath, { flags: 'a' });
         if (writeHeader) {
             logStream.write('timestamp,cpu_user,cpu_system,rss,heapTotal,heapUsed,heapUsedMB,external\n');
         }
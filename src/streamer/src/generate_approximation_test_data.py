@@ -4,9 +4,10 @@ import numpy as np
 import math
 import os
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import argparse
-from typing import List, Tuple, Callable
+import json
+from typing import List, Optional, Tuple, Callable
 
 class ApproximationTestDataGenerator:
     """
@@ -160,6 +161,44 @@ class ApproximationTestDataGenerator:
         noise = np.random.normal(0, 0.5, self.data_points)
         return (base + noise).tolist()
     
+    def analytic_terms(self, pattern_name: str) -> Optional[List[dict]]:
+        """
+        The pattern as a sum of terms scale * g(x0 + i * dx) over the sample index i
+        (see tools/analysis-py/analytic_truth.py), or None for random and piecewise patterns.
+        """
+        steps = max(self.data_points - 1, 1)
+        term = lambda kind, scale, start, stop: {"kind": kind, "scale": scale, "x0": start, "dx": (stop - start) / steps}
+        constant = lambda value: {"kind": "constant", "scale": value}
+        patterns = {
+            'exponential_growth': [term('exponential', 1.0, 0.0, 5 / 100)],
+            'exponential_decay': [term('exponential', 1000.0, 0.0, -8 / 50)],
+            'extreme_exponential_growth': [term('exponential', 1.0, 0.0, 4 / 20)],
+            'extreme_exponential_decay': [term('exponential', 10000.0, 0.0, -6 / 10)],
+            'logarithmic': [term('logarithmic', 10.0, 1.0, 1000.0)],
+            'sine_wave': [term('sine', 50.0, 0.0, 20 * np.pi), constant(50.0)],
+            'chaotic_oscillation': [term('sine', 30.0, 0.0, 20 * np.pi), term('sine', 20.0, 0.0, 60 * np.pi),
+                                    term('sine', 10.0, 0.0, 140 * np.pi), constant(50.0)],
+            'linear_increasing': [term('linear', 1.0, 10.0, 100.0)],
+            'linear_decreasing': [term('linear', 1.0, 100.0, 10.0)],
+            'smooth_polynomial': [term('quadratic', 10.0, -2.0, 2.0), term('linear', 5.0, -2.0, 2.0), constant(50.0)],
+            'gentle_sine': [term('sine', 5.0, 0.0, 4 * np.pi), constant(50.0)],
+        }
+        return patterns.get(pattern_name)
+
+    def write_ground_truth(self, output_dir: Path, pattern_name: str, timestamps: List[int]):
+        """Write ground_truth.json so window aggregates of the noise-free smartphone stream need no scan."""
+        terms = self.analytic_terms(pattern_name)
+        # write_nt_file writes local wall-clock time with a Z suffix
+        start = datetime.fromtimestamp(timestamps[0] / 1000.0).replace(tzinfo=timezone.utc)
+        spec = None if terms is None else {
+            "start_ms": round(start.timestamp() * 1000),
+            "interval_ms": self.timestamp_interval_ms,
+            "observations": self.data_points,
+            "terms": terms
+        }
+        with open(output_dir / "ground_truth.json", 'w') as f:
+            json.dump({"streams": {"smartphone.acceleration.x": spec, "wearable.acceleration.x": None}}, f, indent=2)
+
     def write_nt_file(self, values: List[float], timestamps: List[int], filepath: Path, device_type: str = "synthetic", pattern_name: str = ""):
         """Write data in N-Triples format matching the existing data structure"""
         filepath.parent.mkdir(parents=True, exist_ok=True)
@@ -245,7 +284,6 @@ class ApproximationTestDataGenerator:
         for pattern_name in self.favorable_patterns.keys():
             config["data_paths"][f"favorable_{pattern_name}"] = f"approximation_test/favorable/{pattern_name}"
         
-        import json
         config_path = self.base_output_path / "experiment_config.json"
         with open(config_path, 'w') as f:
             json.dump(config, f, indent=2)
@@ -327,6 +365,7 @@ echo "Accuracy comparison complete!"
             wearable_values = [v + np.random.normal(0, abs(v) * 0.02) for v in values]  # Add 2% noise
             wearable_file = output_dir / "wearable.acceleration.x" / "data.nt"
             self.write_nt_file(wearable_values, timestamps, wearable_file, "wearable", pattern_name)
+            self.write_ground_truth(output_dir, pattern_name, timestamps)
             
         # Generate favorable patterns
         print("Generating favorable patterns...")
@@ -347,6 +386,7 @@ echo "Accuracy comparison complete!"
             wearable_values = [v + np.random.normal(0, abs(v) * 0.02) for v in values]  # Add 2% noise
             wearable_file = output_dir / "wearable.acceleration.x" / "data.nt"
             self.write_nt_file(wearable_values, timestamps, wearable_file, "wearable", pattern_name)
+            self.write_ground_truth(output_dir, pattern_name, timestamps)
         
         # Generate experiment configuration
         self.generate_experiment_config()
@@ -173,41 +173,6 @@ class SimpleAccelerationNoiseGenerator:
                 print(f"  WARNING: Source file not found: {source_file}")
 
 
-def create_streaming_config(noise_levels: List[float], base_path: str) -> str:
-    """
-    Create a configuration file for streaming with different noise levels.
-    """
-    config_content = f'''# Streaming Configuration for Noisy Datasets
-# Generated automatically
-
-NOISE_DATASETS = {{
-'''
-    
-    for noise_level in noise_levels:
-        config_content += f'''    {noise_level}: {{
-        "wearable": "{base_path}/noise_{noise_level}/wearable.acceleration.x/data.nt",
-        "smartphone": "{base_path}/noise_{noise_level}/smartphone.acceleration.x/data.nt"
-    }},
-'''
-    
-    config_content += '''
-}
-
-def get_dataset_path(noise_level: float, device_type: str) -> str:
-    """Get the path to a specific noisy dataset."""
-    if noise_level in NOISE_DATASETS and device_type in NOISE_DATASETS[noise_level]:
-        return NOISE_DATASETS[noise_level][device_type]
-    else:
-        raise ValueError(f"Dataset not found for noise_level={noise_level}, device_type={device_type}")
-
-def get_available_noise_levels() -> list:
-    """Get list of available noise levels."""
-    return list(NOISE_DATASETS.keys())
-'''
-    
-    return config_content
-
-
 def main():
     parser = argparse.ArgumentParser(description="Generate noisy versions of acceleration datasets")
     parser.add_argument("--data-path", default="/Users/kushbisen/Code/streaming-query-hive/src/streamer/data",
@@ -218,8 +183,6 @@ def main():
                        help="Custom noise levels (default: 0.1 0.5 1.0 2.0 5.0)")
     parser.add_argument("--analyze", action="store_true",
                        help="Analyze original data statistics")
-    parser.add_argument("--create-config", action="store_true",
-                       help="Create streaming configuration file")
     
     args = parser.parse_args()
     
@@ -244,14 +207,6 @@ def main():
     else:
         generator.generate_all_datasets(str(output_path))
     
-    # Create config file if requested
-    if args.create_config:
-        config_content = create_streaming_config(noise_levels, str(output_path))
-        config_file = output_path / "streaming_config.py"
-        with open(config_file, 'w') as f:
-            f.write(config_content)
-        print(f"\\n Created streaming config: {config_file}")
-    
     print(f"{output_path}/")
     for noise_level in noise_levels:
         print(f"├── noise_{noise_level}/")
@@ -263,8 +218,8 @@ def main():
     print(f"python {__file__} --analyze")
     print(f"\\n# Generate with custom noise levels:")
     print(f"python {__file__} --noise-levels 0.2 1.5 3.0")
-    print(f"\\n# Create streaming config:")
-    print(f"python {__file__} --create-config")
+    print(f"\\n# Index the generated streams (path, shape, hash) for the experiment runners:")
+    print(f"python tools/analysis-py/dataset_catalog.py")
 
 
 if __name__ == "__main__":
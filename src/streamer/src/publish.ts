@@ -1,12 +1,31 @@
 
 import { CSVLogger } from '../../util/logger/CSVLogger';
 import { StreamToMQTT } from './publishing/StreamToMQTT';
+import { resolve_stream_file } from './publishing/CompactNTriples';
+import { MergedStreamToMQTT } from './publishing/MergedStreamToMQTT';
 
 /**
  *
  */
 const logger = new CSVLogger('replayer-log.csv');
 
+/**
+ * Publish frequency (Hz) of every replayed stream; capacity sweeps raise it with REPLAY_FREQUENCY.
+ */
+const replayFrequency = Number(process.env.REPLAY_FREQUENCY) || 4;
+
+/**
+ * REPLAY_ORDER=file replays each stream in file order with its event timestamps, for the disordered
+ * workloads of workload_generator.py; the default replays in timestamp order.
+ */
+const replayOrder = process.env.REPLAY_ORDER === 'file' ? 'file' : 'time';
+
+/**
+ * REPLAY_PACING=event publishes on the gaps between event timestamps, for the arrival-process workloads
+ * of workload_generator.py; the default publishes at the fixed replay frequency.
+ */
+const replayPacing = process.env.REPLAY_PACING === 'event' ? 'event' : 'fixed';
+
 /**
  *
  */
@@ -18,9 +37,9 @@ async function replaySmartphoneXStream() {
     
     // Use DATA_PATH environment variable or default to noisy datasets
     const basePath = process.env.DATA_PATH || 'noisy_datasets/noise_0.5';
-    const dataPath = `src/streamer/data/${basePath}/smartphone.acceleration.x/data.nt`;
+    const dataPath = resolve_stream_file(`src/streamer/data/${basePath}/smartphone.acceleration.x/data.nt`);
     
-    const publisher = new StreamToMQTT('mqtt://localhost:1883', 4, dataPath, "smartphoneX", mqttOptions);
+    const publisher = new StreamToMQTT('mqtt://localhost:1883', replayFrequency, dataPath, "smartphoneX", mqttOptions, replayOrder, replayPacing, logger);
     logger.log("Starting replay for SmartphoneX stream");
     await publisher.replay_streams();
     logger.log("Replay completed for SmartphoneX stream");
@@ -37,18 +56,45 @@ async function replayWearableXStream() {
     
     // Use DATA_PATH environment variable or default to noisy datasets
     const basePath = process.env.DATA_PATH || 'noisy_datasets/noise_0.5';
-    const dataPath = `src/streamer/data/${basePath}/wearable.acceleration.x/data.nt`;
+    const dataPath = resolve_stream_file(`src/streamer/data/${basePath}/wearable.acceleration.x/data.nt`);
     
-    const publisher = new StreamToMQTT('mqtt://localhost:1883', 4, dataPath, "wearableX", mqttOptions);
+    const publisher = new StreamToMQTT('mqtt://localhost:1883', replayFrequency, dataPath, "wearableX", mqttOptions, replayOrder, replayPacing, logger);
     logger.log("Starting replay for WearableX stream");
     await publisher.replay_streams();
     logger.log("Replay completed for WearableX stream");
 }
 
+/**
+ * Topic of each stream directory when the streams are replayed from one merged file.
+ */
+const mergedTopics: Record<string, string> = {
+    'smartphone.acceleration.x': 'smartphoneX',
+    'wearable.acceleration.x': 'wearableX'
+};
+
+/**
+ * Replays MERGED_PATH, a time-ordered merge written by nt_merge.py, through one publisher.
+ */
+async function replayMergedStreams(mergedPath: string) {
+    const clientId = 'pub-' + Math.random().toString(16).substr(2, 8);
+    const mqttOptions = { clean: false, clientId };
+
+    const publisher = new MergedStreamToMQTT('mqtt://localhost:1883', replayFrequency, mergedPath, mergedTopics, mqttOptions, logger);
+    logger.log("Starting replay for merged stream");
+    await publisher.replay_streams();
+    logger.log("Replay completed for merged stream");
+}
+
 /**
  *
  */
 async function replayStreams() {
+    if (process.env.MERGED_PATH) {
+        await replayMergedStreams(process.env.MERGED_PATH);
+        logger.log("All streams replayed successfully");
+        process.exit(0);
+    }
+
     await Promise.all([
         replaySmartphoneXStream(),
         replayWearableXStream()
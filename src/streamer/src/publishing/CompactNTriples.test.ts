@@ -0,0 +1,85 @@
+import * as fs from 'fs';
+import * as os from 'os';
+import * as path from 'path';
+import { CompactNTriplesExpander, resolve_stream_file } from './CompactNTriples';
+
+const SUBJECT = '<https://dahcc.idlab.ugent.be/Protego/_participant1/obs';
+
+/**
+ *
+ * @param i
+ * @param timestamp
+ * @param value
+ */
+function observation(i: number, timestamp: string, value: string): string {
+    return `${SUBJECT}${i}> <https://saref.etsi.org/core/hasTimestamp> "${timestamp}"^^<http://www.w3.org/2001/XMLSchema#dateTime> . `
+        + `${SUBJECT}${i}> <https://saref.etsi.org/core/hasValue> "${value}"^^<http://www.w3.org/2001/XMLSchema#float> .`;
+}
+
+// Original stream and its encoding as written by tools/analysis-py/nt_compact.py
+const ORIGINAL = observation(0, '2025-08-25T14:35:35.215Z', '1.000000') + '\n'
+    + observation(1, '2025-08-25T14:35:35.465Z', '-0.250000') + '\n'
+    + '<urn:note> <urn:label> "café ☕ µ" .\n'
+    + observation(2, '2025-08-25T14:35:35.715Z', '3.5e-07');
+const COMPACT = '#ntc 1\n'
+    + '#template <https://dahcc.idlab.ugent.be/Protego/_participant1/obs{s}> <https://saref.etsi.org/core/hasTimestamp> "{t}"^^<http://www.w3.org/2001/XMLSchema#dateTime> . '
+    + '<https://dahcc.idlab.ugent.be/Protego/_participant1/obs{s}> <https://saref.etsi.org/core/hasValue> "{v}"^^<http://www.w3.org/2001/XMLSchema#float> .\n'
+    + '0\t2025-08-25T14:35:35.215Z\t1.000000\n'
+    + '1\t2025-08-25T14:35:35.465Z\t-0.250000\n'
+    + '!<urn:note> <urn:label> "café ☕ µ" .\n'
+    + '2\t2025-08-25T14:35:35.715Z\t3.5e-07\n'
+    + '#no-final-newline\n';
+
+/**
+ *
+ * @param chunks
+ */
+function expand(chunks: Buffer[]): Promise<string> {
+    return new Promise((resolve, reject) => {
+        const expander = new CompactNTriplesExpander();
+        const out: string[] = [];
+        expander.on('data', (data: string) => out.push(data));
+        expander.on('end', () => resolve(out.join('')));
+        expander.on('error', reject);
+        for (const chunk of chunks) expander.write(chunk);
+        expander.end();
+    });
+}
+
+describe('CompactNTriplesExpander', () => {
+    test('should expand nt_compact output to the original bytes', async () => {
+        const expanded = await expand([Buffer.from(COMPACT, 'utf8')]);
+        expect(Buffer.from(expanded, 'utf8').equals(Buffer.from(ORIGINAL, 'utf8'))).toBe(true);
+    });
+
+    test('should expand the same bytes when chunks split lines and characters', async () => {
+        const bytes = Buffer.from(COMPACT, 'utf8');
+        const chunks = Array.from({ length: bytes.length }, (_, i) => bytes.subarray(i, i + 1));
+        expect(await expand(chunks)).toBe(ORIGINAL);
+    });
+
+    test('should keep the final newline when the original had one', async () => {
+        const compact = COMPACT.replace('#no-final-newline\n', '');
+        expect(await expand([Buffer.from(compact, 'utf8')])).toBe(ORIGINAL + '\n');
+    });
+});
+
+describe('resolve_stream_file', () => {
+    let dir: string;
+
+    beforeEach(() => {
+        dir = fs.mkdtempSync(path.join(os.tmpdir(), 'compact-'));
+    });
+
+    afterEach(() => {
+        fs.rmSync(dir, { recursive: true, force: true });
+    });
+
+    test('should prefer data.nt and fall back to data.ntc', () => {
+        const nt = path.join(dir, 'data.nt');
+        fs.writeFileSync(path.join(dir, 'data.ntc'), COMPACT);
+        expect(resolve_stream_file(nt)).toBe(path.join(dir, 'data.ntc'));
+        fs.writeFileSync(nt, ORIGINAL);
+        expect(resolve_stream_file(nt)).toBe(nt);
+    });
+});
@@ -0,0 +1,116 @@
+import * as fs from 'fs';
+import { Transform, TransformCallback } from 'stream';
+import { StringDecoder } from 'string_decoder';
+
+/**
+ * Extension of the compact observation encoding written by tools/analysis-py/nt_compact.py.
+ */
+export const COMPACT_EXTENSION = '.ntc';
+
+const TEMPLATE_DIRECTIVE = '#template ';
+const NO_FINAL_NEWLINE = '#no-final-newline';
+const VERBATIM = '!';
+const SLOTS = ['s', 't', 'v'];
+
+/**
+ * Expands a compact stream back into the exact N-Triples it was encoded from.
+ *
+ * A compact stream holds one `#template` line with `{s}`, `{t}` and `{v}` slots and one
+ * `subject suffix<TAB>timestamp<TAB>value` record per observation; lines that did not fit
+ * the template are stored verbatim behind `!`. Lines are expanded as chunks arrive, so the
+ * file is never held in memory.
+ */
+export class CompactNTriplesExpander extends Transform {
+    private decoder = new StringDecoder('utf8');
+    private pending = '';
+    private pieces: string[] = [];
+    private slots: number[] = [];
+    private previous: string | null = null;
+    private final_newline = true;
+
+    /**
+     *
+     */
+    constructor() {
+        super({ decodeStrings: true, encoding: 'utf8' });
+    }
+
+    /**
+     *
+     * @param chunk
+     * @param encoding
+     * @param callback
+     */
+    _transform(chunk: Buffer, encoding: BufferEncoding, callback: TransformCallback): void {
+        const lines = (this.pending + this.decoder.write(chunk)).split('\n');
+        this.pending = lines.pop() as string;
+        const out: string[] = [];
+        for (const line of lines) {
+            this.expand_line(line, out);
+        }
+        if (out.length > 0) this.push(out.join(''));
+        callback();
+    }
+
+    /**
+     *
+     * @param callback
+     */
+    _flush(callback: TransformCallback): void {
+        const out: string[] = [];
+        const rest = this.pending + this.decoder.end();
+        if (rest !== '') this.expand_line(rest, out);
+        if (this.previous !== null) out.push(this.previous + (this.final_newline ? '\n' : ''));
+        if (out.length > 0) this.push(out.join(''));
+        callback();
+    }
+
+    /**
+     *
+     * @param line
+     * @param out
+     */
+    private expand_line(line: string, out: string[]): void {
+        if (line.startsWith('#')) {
+            if (line.startsWith(TEMPLATE_DIRECTIVE)) this.compile_template(line.slice(TEMPLATE_DIRECTIVE.length));
+            else if (line === NO_FINAL_NEWLINE) this.final_newline = false;
+            return;
+        }
+        // A line's newline is only written once the next line shows it was not the last one
+        if (this.previous !== null) out.push(this.previous + '\n');
+        this.previous = line.startsWith(VERBATIM) ? line.slice(VERBATIM.length) : this.fill(line.split('\t'));
+    }
+
+    /**
+     *
+     * @param template
+     */
+    private compile_template(template: string): void {
+        const split = template.split(/\{([stv])\}/);
+        this.pieces = split.filter((_, i) => i % 2 === 0);
+        this.slots = split.filter((_, i) => i % 2 === 1).map(slot => SLOTS.indexOf(slot));
+    }
+
+    /**
+     *
+     * @param fields
+     */
+    private fill(fields: string[]): string {
+        let line = this.pieces[0];
+        for (let i = 0; i < this.slots.length; i++) {
+            line += fields[this.slots[i]] + this.pieces[i + 1];
+        }
+        return line;
+    }
+}
+
+/**
+ * Returns the stream file to replay: the `data.nt` itself, or its compact `data.ntc`
+ * when only the compact encoding is present.
+ * @param nt_path
+ */
+export function resolve_stream_file(nt_path: string): string {
+    if (fs.existsSync(nt_path)) return nt_path;
+    const compact = nt_path.replace(/\.nt$/, COMPACT_EXTENSION);
+    return fs.existsSync(compact) ? compact : nt_path;
+}
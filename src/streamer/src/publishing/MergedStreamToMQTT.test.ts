@@ -0,0 +1,116 @@
+import * as fs from 'fs';
+import * as mqtt from 'mqtt';
+import * as os from 'os';
+import * as path from 'path';
+import { CSVLogger } from '../../../util/logger/CSVLogger';
+import { MergedStreamToMQTT } from './MergedStreamToMQTT';
+
+jest.mock('mqtt', () => ({ connect: jest.fn() }));
+
+const TIMESTAMP = '<https://saref.etsi.org/core/hasTimestamp>';
+const VALUE = '<https://saref.etsi.org/core/hasValue>';
+
+/**
+ * One merged observation line, laid out as tools/analysis-py/nt_merge.py writes it.
+ * @param stream
+ * @param subject
+ * @param timestamp
+ * @param value
+ */
+function merged_line(stream: string, subject: string, timestamp: string, value: number): string {
+    const graph = `<urn:stream:${stream}>`;
+    return `<${subject}> ${TIMESTAMP} "${timestamp}"^^<http://www.w3.org/2001/XMLSchema#dateTime> ${graph} . `
+        + `<${subject}> ${VALUE} "${value}"^^<http://www.w3.org/2001/XMLSchema#float> ${graph} .`;
+}
+
+// nt_merge.py output for stream a (in order) and stream b (file order b1, b0, b2): time order, with the
+// tie at 00:00:01 broken by stream order
+const MERGED = [
+    '#streams smartphone.acceleration.x wearable.acceleration.x',
+    merged_line('smartphone.acceleration.x', 'urn:a:obs0', '2025-01-01T00:00:00.000Z', 1),
+    merged_line('wearable.acceleration.x', 'urn:b:obs0', '2025-01-01T00:00:00.500Z', 10),
+    merged_line('smartphone.acceleration.x', 'urn:a:obs1', '2025-01-01T00:00:01.000Z', 2),
+    merged_line('wearable.acceleration.x', 'urn:b:obs1', '2025-01-01T00:00:01.000Z', 20),
+    merged_line('smartphone.acceleration.x', 'urn:a:obs2', '2025-01-01T00:00:02.000Z', 3),
+    merged_line('wearable.acceleration.x', 'urn:b:obs2', '2025-01-01T00:00:03.000Z', 30),
+].join('\n') + '\n';
+
+const TOPICS = { 'smartphone.acceleration.x': 'smartphoneX', 'wearable.acceleration.x': 'wearableX' };
+
+describe('MergedStreamToMQTT', () => {
+    let dir: string;
+    let published: { topic: string, data: string }[];
+    let publish_logger: { log: jest.Mock };
+    const log_path = process.env.LOG_PATH;
+
+    beforeEach(() => {
+        dir = fs.mkdtempSync(path.join(os.tmpdir(), 'merged-'));
+        fs.writeFileSync(path.join(dir, 'merged.nq'), MERGED);
+        process.env.LOG_PATH = dir;
+        published = [];
+        publish_logger = { log: jest.fn() };
+        (mqtt.connect as jest.Mock).mockReturnValue({
+            publish: jest.fn((topic: string, data: string, options: any, callback: (err?: any) => void) => {
+                published.push({ topic, data });
+                callback();
+            })
+        });
+    });
+
+    afterEach(() => {
+        if (log_path === undefined) delete process.env.LOG_PATH;
+        else process.env.LOG_PATH = log_path;
+        fs.rmSync(dir, { recursive: true, force: true });
+    });
+
+    /**
+     *
+     * @param frequency
+     */
+    async function replay(frequency: number = 200): Promise<void> {
+        const publisher = new MergedStreamToMQTT('mqtt://localhost:1883', frequency, path.join(dir, 'merged.nq'),
+            TOPICS, undefined, publish_logger as unknown as CSVLogger);
+        await publisher.replay_streams();
+    }
+
+    test('should publish the merged observations in merge order to their topics', async () => {
+        await replay();
+        const subjects = published.map(p => /^<([^>]+)>/.exec(p.data)?.[1]);
+        expect(subjects).toEqual(['urn:a:obs0', 'urn:b:obs0', 'urn:a:obs1', 'urn:b:obs1', 'urn:a:obs2', 'urn:b:obs2']);
+        expect(published.map(p => p.topic)).toEqual(
+            ['smartphoneX', 'wearableX', 'smartphoneX', 'wearableX', 'smartphoneX', 'wearableX']);
+    });
+
+    test('should strip the stream graph and stamp the publish time', async () => {
+        const before = Date.now();
+        await replay();
+        for (const { data } of published) {
+            expect(data).not.toContain('urn:stream:');
+            const stamped = Date.parse(/hasTimestamp> "([^"]+)"/.exec(data)?.[1] ?? '');
+            expect(stamped).toBeGreaterThanOrEqual(before);
+            expect(stamped).toBeLessThanOrEqual(Date.now());
+        }
+    });
+
+    test('should log every publish with its topic and timestamp', async () => {
+        await replay();
+        const messages = publish_logger.log.mock.calls.map(call => call[0]);
+        expect(messages).toHaveLength(6);
+        expect(messages[1]).toMatch(/^Published observation to wearableX with timestamp \d{4}-\d\d-\d\dT/);
+    });
+
+    test('should pace the merged stream at the frequency of every stream together', async () => {
+        const timeout = jest.spyOn(global, 'setTimeout');
+        await replay(40);
+        const delays = timeout.mock.calls.map(call => call[1]);
+        timeout.mockRestore();
+        expect(delays.slice(0, 6)).toEqual(Array(6).fill(1000 / (40 * 2)));
+    });
+
+    test('should write one summary row per topic to the replayer log', async () => {
+        await replay();
+        const rows = fs.readFileSync(path.join(dir, 'replayer-log.csv'), 'utf8').trim().split('\n');
+        expect(rows[0]).toBe('timestamp,intended,successful,failed');
+        expect(rows.slice(1).map(row => row.split(',').slice(1).join(','))).toEqual(['3,3,0', '3,3,0']);
+    });
+});
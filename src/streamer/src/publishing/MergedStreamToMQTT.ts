@@ -0,0 +1,125 @@
+import * as fs from 'fs';
+import * as mqtt from 'mqtt';
+import * as path from 'path';
+import * as readline from 'readline';
+import { CSVLogger, resolveLogPath } from '../../../util/logger/CSVLogger';
+
+const STREAMS_DIRECTIVE = '#streams ';
+const STREAM_GRAPH = /<urn:stream:([^>]+)>/;
+const GRAPH = /\s<urn:stream:[^>]+>\s\.\s*/g;
+const TIMESTAMP = /(<https:\/\/saref\.etsi\.org\/core\/hasTimestamp> ")[^"]*(")/g;
+
+/**
+ * Replays a time-ordered merge of several streams (written by tools/analysis-py/nt_merge.py).
+ *
+ * Every line of the merged N-Quads file is one observation whose graph names the stream it
+ * came from; it is published to that stream's topic in file order, so the interleaving of the
+ * streams is the same on every run. The file is read line by line and nothing is sorted, so
+ * replay starts as soon as the first line is read.
+ */
+export class MergedStreamToMQTT {
+
+    private mqtt_client: mqtt.MqttClient;
+    private file_location: string;
+    private frequency: number;
+    private topics: Record<string, string>;
+    private intended: Record<string, number> = {};
+    private successful: Record<string, number> = {};
+    private failed: Record<string, number> = {};
+    private publish_logger?: CSVLogger;
+
+    /**
+     *
+     * @param mqtt_broker
+     * @param frequency Publish frequency (Hz) of each merged stream
+     * @param file_location
+     * @param topics Topic per stream name; streams not listed publish to their own name
+     * @param mqttOptions
+     * @param publish_logger Logs every publish with the topic and event timestamp, like StreamToMQTT
+     */
+    constructor(mqtt_broker: string, frequency: number, file_location: string, topics: Record<string, string> = {}, mqttOptions?: mqtt.IClientOptions, publish_logger?: CSVLogger) {
+        this.file_location = file_location;
+        this.frequency = frequency;
+        this.topics = topics;
+        this.publish_logger = publish_logger;
+        this.mqtt_client = mqtt.connect(mqtt_broker, mqttOptions ?? { clean: false });
+    }
+
+    /**
+     *
+     */
+    async replay_streams(): Promise<void> {
+        console.log(`Loading merged file: ${path.basename(this.file_location)}`);
+        const lines = readline.createInterface({ input: fs.createReadStream(this.file_location), crlfDelay: Infinity });
+
+        // Streams are paced together so each one keeps the publish frequency of its own replayer
+        let delay = 1000 / this.frequency;
+        for await (const line of lines) {
+            if (line.startsWith(STREAMS_DIRECTIVE)) {
+                const streams = line.slice(STREAMS_DIRECTIVE.length).trim().split(/\s+/).length;
+                delay = 1000 / (this.frequency * Math.max(streams, 1));
+                continue;
+            }
+            if (line.trim() === '' || line.startsWith('#')) continue;
+            this.publish_one_observation(line);
+            await this.sleep(delay);
+        }
+
+        // Wait a moment for all async publishes to complete
+        await this.sleep(500);
+        console.log('All observations published.');
+        this.write_summaries();
+    }
+
+    /**
+     *
+     * @param line
+     */
+    private publish_one_observation(line: string): void {
+        const stream = STREAM_GRAPH.exec(line)?.[1];
+        if (stream === undefined) {
+            console.error(`Skipping merged line without a stream graph: ${line.slice(0, 80)}`);
+            return;
+        }
+        const topic = this.topics[stream] ?? stream;
+        const now = new Date().toISOString();
+        const data = line.replace(GRAPH, ' .\n').replace(TIMESTAMP, `$1${now}$2`);
+
+        this.intended[topic] = (this.intended[topic] ?? 0) + 1;
+        this.mqtt_client.publish(topic, data, { qos: 2 }, (err: any) => {
+            if (err) {
+                this.failed[topic] = (this.failed[topic] ?? 0) + 1;
+                console.error('Error publishing observation with QoS 2:', err);
+            } else {
+                this.successful[topic] = (this.successful[topic] ?? 0) + 1;
+            }
+        });
+        this.publish_logger?.log(`Published observation to ${topic} with timestamp ${now}`);
+    }
+
+    /**
+     * One `intended,successful,failed` row per topic in replayer-log.csv, like StreamToMQTT writes per stream.
+     */
+    private write_summaries(): void {
+        try {
+            const logPath = resolveLogPath('replayer-log.csv');
+            const writeHeader = !fs.existsSync(logPath);
+            const rows = Object.keys(this.intended).map(topic => {
+                const summary = `${this.intended[topic]},${this.successful[topic] ?? 0},${this.failed[topic] ?? 0}`;
+                console.log(`Summary for ${topic}: Intended, Successful, Failed: ${summary}`);
+                return `${Date.now()},${summary}\n`;
+            });
+            fs.appendFileSync(logPath, (writeHeader ? 'timestamp,intended,successful,failed\n' : '') + rows.join(''));
+        } catch (err) {
+            console.error('Error writing summary to replayer-log.csv:', err);
+        }
+    }
+
+    /**
+     *
+     * @param ms
+     */
+    private sleep(ms: number): Promise<void> {
+        return new Promise(resolve => setTimeout(resolve, ms));
+    }
+}
@@ -0,0 +1,103 @@
+import * as fs from 'fs';
+import * as mqtt from 'mqtt';
+import * as os from 'os';
+import * as path from 'path';
+import { StreamToMQTT } from './StreamToMQTT';
+
+jest.mock('mqtt', () => ({ connect: jest.fn() }));
+
+/**
+ * The three triples of one observation, as the generators in tools/analysis-py write them.
+ * @param i
+ * @param timestamp
+ */
+function observation(i: number, timestamp: string): string {
+    const subject = `<https://dahcc.idlab.ugent.be/Protego/_participant1/obs${i}>`;
+    return `${subject} <https://saref.etsi.org/core/measurementMadeBy> <https://dahcc.idlab.ugent.be/Homelab/SensorsAndActuators/E4.A03846.Accelerometer> .\n`
+        + `${subject} <https://saref.etsi.org/core/hasTimestamp> "${timestamp}"^^<http://www.w3.org/2001/XMLSchema#dateTime> .\n`
+        + `${subject} <https://saref.etsi.org/core/hasValue> "${i}"^^<http://www.w3.org/2001/XMLSchema#float> .\n`;
+}
+
+// Disordered file: obs2 is displaced ahead of obs1 and lands 200 ms late
+const DISORDERED = observation(0, '2025-01-01T00:00:00.000Z')
+    + observation(2, '2025-01-01T00:00:00.300Z')
+    + observation(1, '2025-01-01T00:00:00.100Z')
+    + observation(3, '2025-01-01T00:00:00.750Z');
+
+describe('StreamToMQTT', () => {
+    let dir: string;
+    let file: string;
+    let published: string[];
+    const log_path = process.env.LOG_PATH;
+
+    beforeEach(() => {
+        dir = fs.mkdtempSync(path.join(os.tmpdir(), 'replay-'));
+        file = path.join(dir, 'data.nt');
+        fs.writeFileSync(file, DISORDERED);
+        process.env.LOG_PATH = dir;
+        published = [];
+        (mqtt.connect as jest.Mock).mockReturnValue({
+            publish: jest.fn((topic: string, data: string, options: any, callback: (err?: any) => void) => {
+                published.push(data);
+                callback();
+            })
+        });
+    });
+
+    afterEach(() => {
+        if (log_path === undefined) delete process.env.LOG_PATH;
+        else process.env.LOG_PATH = log_path;
+        fs.rmSync(dir, { recursive: true, force: true });
+    });
+
+    /**
+     * Observation number and published timestamp (epoch ms) of every publish, in publish order.
+     */
+    function publishes(): { obs: number, timestamp: number }[] {
+        return published.map(data => ({
+            obs: Number(/_participant1\/obs(\d+)>/.exec(data)?.[1]),
+            timestamp: Date.parse(/hasTimestamp> "([^"]+)"/.exec(data)?.[1] ?? ''),
+        }));
+    }
+
+    test('should replay in timestamp order stamped with the publish time', async () => {
+        const before = Date.now();
+        await new StreamToMQTT('mqtt://localhost:1883', 200, file, 'accelerationX').replay_streams();
+        const replayed = publishes();
+        expect(replayed.map(p => p.obs)).toEqual([0, 1, 2, 3]);
+        for (let i = 0; i < replayed.length; i++) {
+            expect(replayed[i].timestamp).toBeGreaterThanOrEqual(i === 0 ? before : replayed[i - 1].timestamp);
+            expect(replayed[i].timestamp).toBeLessThanOrEqual(Date.now());
+        }
+    });
+
+    test('should replay in file order with the event timestamps shifted to the replay clock', async () => {
+        const before = Date.now();
+        await new StreamToMQTT('mqtt://localhost:1883', 200, file, 'accelerationX', undefined, 'file').replay_streams();
+        const replayed = publishes();
+        expect(replayed.map(p => p.obs)).toEqual([0, 2, 1, 3]);
+        expect(replayed[0].timestamp).toBeGreaterThanOrEqual(before);
+        expect(replayed.map(p => p.timestamp - replayed[0].timestamp)).toEqual([0, 300, 100, 750]);
+    });
+
+    test('should schedule event pacing on the gaps between the event timestamps', async () => {
+        const publisher = new StreamToMQTT('mqtt://localhost:1883', 200, file, 'accelerationX', undefined, 'time', 'event');
+        await publisher.initialize();
+        expect(publisher['event_schedule']()).toEqual([0, 100, 300, 750]);
+    });
+
+    test('should publish late observations right after the one before under event pacing', async () => {
+        const publisher = new StreamToMQTT('mqtt://localhost:1883', 200, file, 'accelerationX', undefined, 'file', 'event');
+        await publisher.initialize();
+        expect(publisher['event_schedule']()).toEqual([0, 300, 300, 750]);
+    });
+
+    test('should log every publish with its topic and timestamp', async () => {
+        const publish_logger = { log: jest.fn() };
+        await new StreamToMQTT('mqtt://localhost:1883', 200, file, 'accelerationX', undefined, 'file', 'fixed',
+            publish_logger as any).replay_streams();
+        const messages = publish_logger.log.mock.calls.map(call => call[0]);
+        expect(messages).toEqual(publishes().map(p =>
+            `Published observation to accelerationX with timestamp ${new Date(p.timestamp).toISOString()}`));
+    });
+});
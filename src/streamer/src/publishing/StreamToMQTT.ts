@@ -2,7 +2,8 @@ import { StreamConsumer } from "./StreamConsumer";
 import * as fs from 'fs';
 import * as mqtt from 'mqtt';
 import * as path from 'path';
-import { CSVLogger } from "../../../util/logger/CSVLogger";
+import { CSVLogger, resolveLogPath } from "../../../util/logger/CSVLogger";
+import { COMPACT_EXTENSION, CompactNTriplesExpander } from "./CompactNTriples";
 const N3 = require('n3');
 const { DataFactory } = N3;
 const { namedNode, literal } = DataFactory;
@@ -26,6 +27,12 @@ export class StreamToMQTT {
     private frequency: number;
     private successfulPublishes: number = 0;
     private failedPublishes: number = 0;
+    private replay_order: 'time' | 'file';
+    private file_order_subjects: string[] = [];
+    private first_event_ms: number = 0;
+    private replay_start_ms: number | null = null;
+    private pacing: 'fixed' | 'event';
+    private publish_logger?: CSVLogger;
 
     /**
      *
@@ -33,13 +40,23 @@ export class StreamToMQTT {
      * @param frequency
      * @param file_location
      * @param topic_to_publish
+     * @param mqttOptions
+     * @param replay_order 'time' replays in timestamp order stamped with the publish time; 'file' keeps the
+     * order of the file and the event timestamps, shifted to the replay clock, so generated disorder reaches the operators
+     * @param pacing 'fixed' publishes at frequency; 'event' publishes on the gaps between the event timestamps, so
+     * bursts of an arrival process reach the broker as bursts
+     * @param publish_logger Logs every publish with the topic and event timestamp, so end-to-end latency is
+     * measured from the actual publish times
      */
-    constructor(mqtt_broker: string, frequency: number, file_location: string, topic_to_publish: string, mqttOptions?: mqtt.IClientOptions) {
+    constructor(mqtt_broker: string, frequency: number, file_location: string, topic_to_publish: string, mqttOptions?: mqtt.IClientOptions, replay_order: 'time' | 'file' = 'time', pacing: 'fixed' | 'event' = 'fixed', publish_logger?: CSVLogger) {
         this.store = new N3.Store();
         this.stream_consumer = new StreamConsumer(this.store);
         this.file_location = file_location;
         this.frequency = frequency;
         this.topic_to_publish = topic_to_publish;
+        this.replay_order = replay_order;
+        this.pacing = pacing;
+        this.publish_logger = publish_logger;
         // Set clean:false for persistent session, allow custom clientId
         if (mqttOptions) {
             this.mqtt_client = mqtt.connect(mqtt_broker, mqttOptions);
@@ -67,6 +84,13 @@ export class StreamToMQTT {
      * @param store
      */
     async sort_observations(store: any): Promise<string[]> {
+        if (this.replay_order === 'file') {
+            const timestamps = this.file_order_subjects.map(subject => this.event_time(subject)).filter(t => !isNaN(t));
+            this.first_event_ms = timestamps.reduce((min, t) => Math.min(min, t), Infinity);
+            this.sort_subject_length = this.file_order_subjects.length;
+            return this.file_order_subjects;
+        }
+
         const temp: string[] = [];
 
         for (const quad of store.match(null, 'https://saref.etsi.org/core/measurementMadeBy', null)) {
@@ -103,8 +127,9 @@ export class StreamToMQTT {
         let i = 0, j = 0;
 
         while (i < left.length && j < right.length) {
-            const t1 = store.getObjects(namedNode(left[i]).id, namedNode('https://saref.etsi.org/core/hasTimestamp'));
-            const t2 = store.getObjects(namedNode(right[j]).id, namedNode('https://saref.etsi.org/core/hasTimestamp'));
+            // Compare the parsed event times; the timestamp terms themselves do not order
+            const t1 = this.event_time(left[i]);
+            const t2 = this.event_time(right[j]);
 
             if (t1 > t2) merged.push(left[i++]);
             else merged.push(right[j++]);
@@ -126,11 +151,25 @@ export class StreamToMQTT {
             const stream = fs.createReadStream(file_location);
             const writer = this.stream_consumer.get_writer();
 
-            parser.on('data', (quad: any) => writer.write(quad));
-            parser.on('end', () => resolve(this.store));
+            // Observations in the order the file lists them, for replay_order 'file'
+            const subjects = new Set<string>();
+            parser.on('data', (quad: any) => {
+                writer.write(quad);
+                if (this.replay_order === 'file' && quad.predicate.value === 'https://saref.etsi.org/core/measurementMadeBy') {
+                    subjects.add(quad.subject.id);
+                }
+            });
+            parser.on('end', () => {
+                this.file_order_subjects = Array.from(subjects);
+                resolve(this.store);
+            });
             parser.on('error', reject);
 
-            stream.pipe(parser);
+            if (file_location.endsWith(COMPACT_EXTENSION)) {
+                stream.pipe(new CompactNTriplesExpander()).pipe(parser);
+            } else {
+                stream.pipe(parser);
+            }
         });
     }
 
@@ -146,10 +185,18 @@ export class StreamToMQTT {
         }
 
         const delay = 1000 / this.frequency;
+        // Both pacings follow a schedule from the first publish, so sleep overshoot does not accumulate
+        const schedule = this.pacing === 'event' ? this.event_schedule() : null;
+        const pacing_start = Date.now();
 
         for (let i = 0; i < this.sorted_observation_subjects.length; i++) {
             await this.publish_one_observation();
-            await this.sleep(delay);
+            const offset = schedule && i + 1 < schedule.length ? schedule[i + 1] : (i + 1) * delay;
+            const wait = pacing_start + offset - Date.now();
+            // Timers do not sleep below a millisecond, so observations that are already due only yield to
+            // pending I/O; otherwise the timer resolution would cap every stream near 1 kHz
+            if (wait >= 1) await this.sleep(wait);
+            else await new Promise(resolve => setImmediate(resolve));
         }
 
         // Wait a moment for all async publishes to complete
@@ -159,15 +206,13 @@ export class StreamToMQTT {
         console.log(summary);
         // Write summary to replayer-log.csv
         try {
-            const logPath = path.resolve(process.cwd(), 'replayer-log.csv');
+            const logPath = resolveLogPath('replayer-log.csv');
             const header = 'timestamp,intended,successful,failed\n';
             const line = `${Date.now()},${this.sort_subject_length},${this.successfulPublishes},${this.failedPublishes}\n`;
             let writeHeader = false;
             if (!fs.existsSync(logPath)) writeHeader = true;
-            const logStream = fs.createWriteStream(logPath, { flags: 'a' });
-            if (writeHeader) logStream.write(header);
-            logStream.write(line);
-            logStream.end();
+            // Written synchronously so the summary is on disk when replay_streams resolves
+            fs.appendFileSync(logPath, (writeHeader ? header : '') + line);
         } catch (err) {
             console.error('Error writing summary to replayer-log.csv:', err);
         }
@@ -194,12 +239,13 @@ export class StreamToMQTT {
             const id = this.sorted_observation_subjects[this.observation_pointer];
             const node = namedNode(id);
 
-            // Remove old timestamp
             const old = this.store.getQuads(node, namedNode('https://saref.etsi.org/core/hasTimestamp'), null, null);
+            const now = this.replay_timestamp(old);
+
+            // Remove old timestamp
             this.store.removeQuads(old);
 
             // Add new timestamp
-            const now = new Date().toISOString();
             this.store.addQuad(node, namedNode('https://saref.etsi.org/core/hasTimestamp'), literal(now));
 
             // Extract quads for this observation
@@ -217,6 +263,7 @@ export class StreamToMQTT {
                         console.log(`Published observation: ${id} at ${this.file_location} with QoS 2`);
                     }
                 });
+                this.publish_logger?.log(`Published observation to ${this.topic_to_publish} with timestamp ${now}`);
                 this.number_of_publish++;
                 this.observation_pointer++;
             }
@@ -226,6 +273,43 @@ export class StreamToMQTT {
         }
     }
 
+    /**
+     * Event time (epoch ms) of an observation in the loaded file.
+     * @param subject
+     */
+    private event_time(subject: string): number {
+        const timestamps = this.store.getObjects(namedNode(subject), namedNode('https://saref.etsi.org/core/hasTimestamp'), null);
+        return timestamps.length > 0 ? Date.parse(timestamps[0].value) : NaN;
+    }
+
+    /**
+     * Offset (ms) of each observation's publish from the first one, following its event timestamps.
+     * Observations without a timestamp, or earlier than the one before, are published right after it.
+     */
+    private event_schedule(): number[] {
+        const times = this.sorted_observation_subjects.map(subject => this.event_time(subject));
+        const schedule: number[] = [];
+        let last = 0;
+        for (const t of times) {
+            const offset = isNaN(t) || isNaN(times[0]) ? last : t - times[0];
+            last = Math.max(last, offset);
+            schedule.push(last);
+        }
+        return schedule;
+    }
+
+    /**
+     * Timestamp an observation is published with: the publish time, or in file order its event time
+     * shifted so the first event of the file lands on the start of the replay.
+     * @param old Timestamp quads of the observation in the file
+     */
+    private replay_timestamp(old: any[]): string {
+        const now = Date.now();
+        if (this.replay_order !== 'file' || old.length === 0) return new Date(now).toISOString();
+        if (this.replay_start_ms === null) this.replay_start_ms = now;
+        return new Date(this.replay_start_ms + Date.parse(old[0].object.value) - this.first_event_ms).toISOString();
+    }
+
     /**
      *
      * @param store
@@ -1,4 +1,14 @@
 import fs from 'fs';
+import path from 'path';
+
+/**
+ * Resolves a log file name in LOG_PATH, or in the working directory when it is unset, so runners
+ * can give every run its own log directory.
+ * @param fileName
+ */
+export function resolveLogPath(fileName: string): string {
+    return path.resolve(process.env.LOG_PATH || process.cwd(), fileName);
+}
 
 /**
  *
@@ -12,7 +22,7 @@ export class CSVLogger {
      * @param filePath
      */
     constructor(filePath: string) {
-        this.stream = fs.createWriteStream(filePath, { flags: 'a' });
+        this.stream = fs.createWriteStream(resolveLogPath(filePath), { flags: 'a' });
         this.stream.write('timestamp,message\n'); // Write header
     }
 
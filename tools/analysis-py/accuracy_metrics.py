@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+
+import argparse
+import warnings
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+METRICS = ['mae', 'rmse', 'mape', 'smape', 'max_error', 'percentage_accuracy']
+
+
+def _align(y_true, y_pred):
+    """
+    Broadcast ground truth against predictions and mask unusable pairs.
+
+    ``y_true`` may be a scalar, one value per window, or any shape that
+    broadcasts against ``y_pred``. Pairs where either side is NaN are masked.
+    """
+    y_true = np.asarray(y_true, dtype=float)
+    y_pred = np.asarray(y_pred, dtype=float)
+    y_true, y_pred = np.broadcast_arrays(y_true, y_pred)
+    valid = np.isfinite(y_true) & np.isfinite(y_pred)
+    return np.where(valid, y_true, np.nan), np.where(valid, y_pred, np.nan)
+
+
+def absolute_errors(y_true, y_pred) -> np.ndarray:
+    """Per-window absolute error |truth - prediction|."""
+    y_true, y_pred = _align(y_true, y_pred)
+    return np.abs(y_true - y_pred)
+
+
+def relative_errors(y_true, y_pred) -> np.ndarray:
+    """Per-window relative error |truth - prediction| / |truth|; NaN where the truth is zero."""
+    y_true, y_pred = _align(y_true, y_pred)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(y_true != 0, np.abs(y_true - y_pred) / np.abs(y_true), np.nan)
+
+
+def percentage_accuracy_per_window(y_true, y_pred) -> np.ndarray:
+    """Per-window accuracy 100 * (1 - relative error); NaN where the truth is zero."""
+    return (1 - relative_errors(y_true, y_pred)) * 100
+
+
+def mae(y_true, y_pred, axis: Optional[int] = -1) -> np.ndarray:
+    """Mean absolute error, ignoring NaN windows."""
+    return np.nanmean(absolute_errors(y_true, y_pred), axis=axis)
+
+
+def rmse(y_true, y_pred, axis: Optional[int] = -1) -> np.ndarray:
+    """Root mean squared error, ignoring NaN windows."""
+    return np.sqrt(np.nanmean(absolute_errors(y_true, y_pred) ** 2, axis=axis))
+
+
+def mape(y_true, y_pred, axis: Optional[int] = -1) -> np.ndarray:
+    """Mean absolute percentage error; windows with zero ground truth are excluded."""
+    return np.nanmean(relative_errors(y_true, y_pred), axis=axis) * 100
+
+
+def smape(y_true, y_pred, axis: Optional[int] = -1) -> np.ndarray:
+    """Symmetric MAPE in [0, 200]; windows where truth and prediction are both zero count as exact."""
+    y_true, y_pred = _align(y_true, y_pred)
+    denominator = (np.abs(y_true) + np.abs(y_pred)) / 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(denominator > 0, np.abs(y_true - y_pred) / denominator, 0.0)
+    ratio = np.where(np.isnan(y_true), np.nan, ratio)
+    return np.nanmean(ratio, axis=axis) * 100
+
+
+def max_error(y_true, y_pred, axis: Optional[int] = -1) -> np.ndarray:
+    """Largest absolute error over the windows; NaN when there are none, like the other metrics."""
+    errors = absolute_errors(y_true, y_pred)
+    if errors.size == 0 and (axis is None or errors.shape[axis] == 0):
+        # nanmax has no identity to reduce an empty axis to; nanmean gives NaN of the reduced shape
+        return np.nanmean(errors, axis=axis)
+    return np.nanmax(errors, axis=axis)
+
+
+def percentage_accuracy(y_true, y_pred, axis: Optional[int] = -1) -> np.ndarray:
+    """Mean per-window percentage accuracy; equals 100 - MAPE."""
+    return np.nanmean(percentage_accuracy_per_window(y_true, y_pred), axis=axis)
+
+
+def score(y_true, y_pred, axis: Optional[int] = -1) -> Dict[str, np.ndarray]:
+    """
+    Compute every metric at once.
+
+    Args:
+        y_true: Ground truth, broadcast against ``y_pred``
+        y_pred: Approach results, windows along ``axis``
+        axis: Window axis to reduce; None reduces over everything
+
+    Returns:
+        Dict of metric name to value (or array of values per leading index)
+    """
+    # All-NaN rows reduce to NaN; silence the "mean of empty slice" warnings
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        return {
+            'mae': mae(y_true, y_pred, axis),
+            'rmse': rmse(y_true, y_pred, axis),
+            'mape': mape(y_true, y_pred, axis),
+            'smape': smape(y_true, y_pred, axis),
+            'max_error': max_error(y_true, y_pred, axis),
+            'percentage_accuracy': percentage_accuracy(y_true, y_pred, axis),
+        }
+
+
+def score_frame(frame: 'pd.DataFrame', truth_column: str, prediction_column: str,
+                by: Optional[List[str]] = None) -> 'pd.DataFrame':
+    """
+    Score whole result columns, optionally per group.
+
+    Per-window errors are computed once over the full columns; the groupby
+    only reduces them, so a million windows are scored in a few vectorized passes.
+    """
+    import pandas as pd
+
+    y_true = frame[truth_column].to_numpy(dtype=float)
+    y_pred = frame[prediction_column].to_numpy(dtype=float)
+    absolute = absolute_errors(y_true, y_pred)
+    relative = relative_errors(y_true, y_pred)
+    denominator = (np.abs(y_true) + np.abs(y_pred)) / 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        symmetric = np.where(denominator > 0, absolute / denominator, np.where(np.isnan(absolute), np.nan, 0.0))
+    errors = pd.DataFrame({
+        'abs': absolute,
+        'sq': absolute ** 2,
+        'rel': relative * 100,
+        'sym': symmetric * 100,
+        'acc': (1 - relative) * 100,
+    }, index=frame.index)
+
+    if by:
+        grouped = errors.groupby([frame[column] for column in by])
+    else:
+        grouped = errors.groupby(np.zeros(len(errors), dtype=int))
+    result = pd.DataFrame({
+        'windows': grouped['abs'].count(),
+        'mae': grouped['abs'].mean(),
+        'rmse': np.sqrt(grouped['sq'].mean()),
+        'mape': grouped['rel'].mean(),
+        'smape': grouped['sym'].mean(),
+        'max_error': grouped['abs'].max(),
+        'percentage_accuracy': grouped['acc'].mean(),
+    })
+    return result.reset_index() if by else result.reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score approach results against ground truth")
+    parser.add_argument("results", help="CSV with one row per window")
+    parser.add_argument("--truth-column", default="reference", help="Ground truth column")
+    parser.add_argument("--prediction-column", default="value", help="Approach result column")
+    parser.add_argument("--by", nargs='*', default=[], help="Columns to group the scores by")
+    parser.add_argument("--output", help="Optional CSV output path")
+    args = parser.parse_args()
+
+    import pandas as pd
+    frame = pd.read_csv(args.results)
+    scores = score_frame(frame, args.truth_column, args.prediction_column, args.by)
+    print(scores.to_string(index=False))
+    if args.output:
+        scores.to_csv(args.output, index=False)
+        print(f"\nScores saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
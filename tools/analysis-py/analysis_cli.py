@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+import argparse
+import importlib
+import os
+import sys
+from typing import List
+
+# Subcommand -> (module whose main() implements it, help). Modules are only
+# imported when their subcommand runs, so numpy/pandas/matplotlib are never
+# loaded for commands that do not need them.
+COMMANDS = {
+    'latency': ('latency_engine', 'Per-window end-to-end latency percentiles'),
+    'accuracy': ('accuracy_metrics', 'Score a per-window results CSV against ground truth'),
+    'matrix': ('evaluate_accuracy_matrix', 'Evaluate accuracy over the whole experiment matrix'),
+    'reference': ('reference_windows', 'Exact RANGE/STEP sliding-window ground truth'),
+    'bootstrap': ('bootstrap_comparison', 'Bootstrap confidence intervals between approaches'),
+    'store': ('window_results_store', 'Long-format per-window results store'),
+    'downsample': ('downsampling', 'Shape-preserving downsampling of resource series'),
+    'render': ('render_figures', 'Render all report figures headless'),
+    'report': ('build_report', 'Build the static HTML experiment report'),
+    'spectral': ('spectral_analysis', 'FFT/Welch aliasing analysis of generated and received streams'),
+    'heap-growth': ('heap_growth', 'Flag sustained heap growth from post-GC heap minima'),
+    'gc': ('gc_activity', 'Infer GC frequency, reclaimed memory and allocation rate'),
+    'capacity': ('capacity_sweep', 'Sweep replay rates until each approach saturates'),
+    'catalog': ('dataset_catalog', 'Index every data.nt stream with its shape and hash'),
+    'warehouse': ('results_warehouse', 'Load runs and summaries into an indexed SQLite warehouse and query it'),
+    'compact': ('nt_compact', 'Compact observation-only encoding of data.nt streams'),
+    'merge': ('nt_merge', 'K-way time-ordered merge of several data.nt streams'),
+    'workload': ('workload_generator', 'Generate disordered and bursty replay workloads'),
+    'chunks': ('chunk_aggregates', 'Per-chunk aggregate sidecars for instant window ground truth'),
+    'truth': ('analytic_truth', 'Closed-form window ground truth of generated synthetic streams'),
+    'approx-sim': ('approximation_simulator', 'Offline Monte-Carlo simulation of the rate-based approximation operator'),
+    'chunk-sim': ('chunk_simulator', 'Offline chunk-size what-if simulation of the chunked aggregator operator'),
+}
+
+STARTUP_HISTORY = 'startup_benchmark.csv'
+STARTUP_REPEATS = 5
+
+
+def run_errors(argv: List[str]):
+    """Error metrics of a few predictions against one ground truth, without pandas."""
+    parser = argparse.ArgumentParser(prog='analysis_cli.py errors',
+                                     description="MAPE and percentage accuracy of predictions against a ground truth")
+    parser.add_argument("--truth", type=float, required=True, help="Ground truth value")
+    parser.add_argument("--predictions", type=float, nargs='+', required=True, help="Approach results")
+    args = parser.parse_args(argv)
+
+    from accuracy_metrics import score
+    for name, value in score([args.truth], args.predictions).items():
+        print(f"{name}: {float(value)}")
+
+
+def _time_command(argv: List[str], repeats: int) -> float:
+    """Median wall time (ms) of running a command to completion."""
+    import statistics
+    import subprocess
+    import time
+
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run_bench_startup(argv: List[str]):
+    """Time the startup of every subcommand (``<command> --help``) and append it to a history CSV."""
+    import csv
+    from datetime import datetime
+
+    parser = argparse.ArgumentParser(prog='analysis_cli.py bench-startup',
+                                     description="Track startup time of every analysis subcommand")
+    parser.add_argument("--repeats", type=int, default=STARTUP_REPEATS, help="Runs per command (median is kept)")
+    parser.add_argument("--commands", nargs='*', help="Only these subcommands")
+    parser.add_argument("--history", default=STARTUP_HISTORY, help="CSV the measurements are appended to")
+    args = parser.parse_args(argv)
+
+    cli = os.path.abspath(__file__)
+    targets = {'python': [sys.executable, '-c', 'pass'], 'cli': [sys.executable, cli, '--help']}
+    for name in args.commands or list(COMMANDS) + ['errors']:
+        targets[name] = [sys.executable, cli, name, '--help']
+
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    rows = []
+    for name, command in targets.items():
+        median_ms = _time_command(command, args.repeats)
+        rows.append({'timestamp': timestamp, 'command': name, 'median_ms': round(median_ms, 1),
+                     'repeats': args.repeats})
+        print(f"  {name:<12} {median_ms:8.1f} ms")
+
+    new_file = not os.path.exists(args.history)
+    with open(args.history, 'a', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['timestamp', 'command', 'median_ms', 'repeats'])
+        if new_file:
+            writer.writeheader()
+        writer.writerows(rows)
+    print(f"\nStartup times appended to: {args.history}")
+
+
+LOCAL_COMMANDS = {
+    'errors': (run_errors, 'MAPE/accuracy of predictions against one ground truth value'),
+    'bench-startup': (run_bench_startup, 'Track startup time of every subcommand'),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Unified analysis CLI; heavy libraries are loaded only by the subcommand that needs them",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="commands:\n" + "\n".join(f"  {name:<14}{help_text}" for name, (_, help_text)
+                                         in {**COMMANDS, **LOCAL_COMMANDS}.items()))
+    parser.add_argument("command", choices=list(COMMANDS) + list(LOCAL_COMMANDS), metavar="command")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="Arguments passed to the command")
+    args = parser.parse_args()
+
+    if args.command in LOCAL_COMMANDS:
+        LOCAL_COMMANDS[args.command][0](args.args)
+        return
+
+    module_name, _ = COMMANDS[args.command]
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    module = importlib.import_module(module_name)
+    sys.argv = [f"{os.path.basename(sys.argv[0])} {args.command}"] + args.args
+    module.main()
+
+
+if __name__ == "__main__":
+    main()
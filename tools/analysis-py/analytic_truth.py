@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import math
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from nt_stream import find_streams, read_stream
+from reference_windows import AGGREGATIONS, compute_reference, window_bounds
+
+# Written by the synthetic generators next to the stream directories of a dataset
+GROUND_TRUTH_FILE = 'ground_truth.json'
+# g(x) of every term kind; a term contributes scale * g(x0 + i * dx) to sample i
+TERM_FUNCTIONS = {
+    'constant': np.ones_like,
+    'linear': lambda x: x,
+    'quadratic': np.square,
+    'exponential': np.exp,
+    'sine': np.sin,
+    'logarithmic': np.log,
+}
+# Term kinds whose sum over a sample range is a polynomial in the sample index
+POLYNOMIAL_KINDS = {'constant', 'linear', 'quadratic'}
+# Values are written with %.6f, so each data.nt value is off by at most this much
+VALUE_TOLERANCE = 5e-7
+
+_lgamma = np.vectorize(math.lgamma, otypes=[float])
+
+
+def _term(term: Dict) -> Tuple[str, float, float, float]:
+    kind = term['kind']
+    if kind not in TERM_FUNCTIONS:
+        raise ValueError(f"Unsupported term kind: {kind}")
+    return kind, float(term.get('scale', 1.0)), float(term.get('x0', 0.0)), float(term.get('dx', 0.0))
+
+
+def sample_values(spec: Dict, indices: Optional[np.ndarray] = None) -> np.ndarray:
+    """Values of the samples at ``indices`` (all samples by default) as the generator computed them."""
+    if indices is None:
+        indices = np.arange(spec['observations'])
+    indices = np.asarray(indices, dtype=float)
+    values = np.zeros(indices.shape)
+    for term in spec['terms']:
+        kind, scale, x0, dx = _term(term)
+        values += scale * TERM_FUNCTIONS[kind](x0 + indices * dx)
+    return values
+
+
+def sample_range(spec: Dict, starts: np.ndarray, ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Index range ``[lo, hi)`` of the samples inside every ``[start, end)`` window.
+
+    Sample i is at ``start_ms + i * interval_ms``, so the range is two integer
+    divisions per window instead of a search over the timestamps.
+    """
+    first, interval, count = int(spec['start_ms']), int(spec['interval_ms']), int(spec['observations'])
+    lo = np.clip(-((first - np.asarray(starts, dtype=np.int64)) // interval), 0, count)
+    hi = np.clip(-((first - np.asarray(ends, dtype=np.int64)) // interval), 0, count)
+    return lo, np.maximum(hi, lo)
+
+
+def _index_sums(lo: np.ndarray, hi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Sums of i and of i^2 over ``[lo, hi)``."""
+    lo, hi = lo.astype(float), hi.astype(float)
+    squares = lambda m: m * (m + 1) * (2 * m + 1) / 6
+    return (hi * (hi - 1) - lo * (lo - 1)) / 2, squares(hi - 1) - squares(lo - 1)
+
+
+def term_sums(term: Dict, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """
+    Sum of one term over the samples ``[lo, hi)`` of every window, in closed form.
+
+    Polynomial terms use the sums of i and i^2, exponentials a geometric
+    series, sines the Dirichlet kernel and logarithms the log-gamma function.
+    """
+    kind, scale, x0, dx = _term(term)
+    n = (hi - lo).astype(float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if kind == 'constant':
+            total = n
+        elif kind in ('linear', 'quadratic'):
+            first, second = _index_sums(lo, hi)
+            total = n * x0 + dx * first if kind == 'linear' else n * x0 ** 2 + 2 * x0 * dx * first + dx ** 2 * second
+        elif kind == 'exponential':
+            ratio = np.expm1(n * dx) / math.expm1(dx) if dx != 0 else n
+            total = np.exp(x0 + lo * dx) * ratio
+        elif kind == 'sine':
+            half = math.sin(dx / 2)
+            middle = x0 + dx * (lo + (n - 1) / 2)
+            total = np.sin(n * dx / 2) / half * np.sin(middle) if abs(half) > 1e-12 else n * np.sin(x0 + lo * dx)
+        elif dx > 0:
+            # log(x0 + i*dx) = log(dx) + log(x0/dx + i), and the log of a rising product is a log-gamma difference
+            total = n * math.log(dx) + _lgamma(x0 / dx + hi) - _lgamma(x0 / dx + lo)
+        elif dx < 0:
+            offset = x0 / -dx + 1
+            total = n * math.log(-dx) + _lgamma(offset - lo) - _lgamma(offset - hi)
+        else:
+            total = n * math.log(x0)
+    return scale * np.where(n > 0, total, 0.0)
+
+
+def _extreme_candidates(spec: Dict, lo: np.ndarray, hi: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Sample indices that contain the MAX and MIN of every non-empty window, or
+    None when the terms have no closed-form extremes.
+
+    The extremes of a quadratic are at the ends or next to its vertex, those
+    of a monotone term at the ends, and those of a sine at the ends or next
+    to one of its crests and troughs inside the window.
+
+    Returns:
+        Tuple of (window of each candidate, sample index of each candidate)
+    """
+    last = hi - 1
+    windows = np.arange(len(lo))
+    ends = (np.concatenate((windows, windows)), np.concatenate((lo, last)))
+    varying = [_term(term) for term in spec['terms'] if term['kind'] != 'constant']
+    if not varying:
+        return ends
+    if all(kind in POLYNOMIAL_KINDS for kind, _, _, _ in varying):
+        # p(i) = c1 * i + c2 * i^2 + const
+        c1 = sum(scale * dx * (1 if kind == 'linear' else 2 * x0) for kind, scale, x0, dx in varying)
+        c2 = sum(scale * dx ** 2 for kind, scale, x0, dx in varying if kind == 'quadratic')
+        if c2 == 0:
+            return ends
+        vertex = -c1 / (2 * c2)
+        near = np.clip(np.array([math.floor(vertex), math.ceil(vertex)])[:, None], lo, last)
+        return np.concatenate((ends[0], windows, windows)), np.concatenate((ends[1], near[0], near[1]))
+    if len(varying) > 1:
+        return None
+    kind, scale, x0, dx = varying[0]
+    if kind in ('exponential', 'logarithmic') or dx == 0:
+        return ends
+    # Crests and troughs of sin(x0 + i*dx) are at x = pi/2 + k*pi
+    bounds = np.sort(np.stack(((x0 + lo * dx - math.pi / 2) / math.pi, (x0 + last * dx - math.pi / 2) / math.pi)), axis=0)
+    first_k = np.ceil(bounds[0]).astype(np.int64)
+    crests = np.maximum(np.floor(bounds[1]).astype(np.int64) - first_k + 1, 0)
+    owner = np.repeat(windows, crests)
+    k = first_k[owner] + np.arange(crests.sum()) - np.repeat(np.cumsum(crests) - crests, crests)
+    at = (math.pi / 2 + k * math.pi - x0) / dx
+    near_lo, near_hi = np.clip(np.floor(at), lo[owner], last[owner]), np.clip(np.ceil(at), lo[owner], last[owner])
+    return (np.concatenate((ends[0], owner, owner)),
+            np.concatenate((ends[1], near_lo.astype(np.int64), near_hi.astype(np.int64))))
+
+
+def window_extremes(spec: Dict, lo: np.ndarray, hi: np.ndarray, largest: bool = True) -> np.ndarray:
+    """MAX (or MIN) over the samples ``[lo, hi)`` of every window; NaN if empty or without a closed form."""
+    result = np.full(len(lo), np.nan)
+    filled = hi > lo
+    candidates = _extreme_candidates(spec, lo[filled], hi[filled])
+    if candidates is None or not filled.any():
+        return result
+    owner, index = candidates
+    values = sample_values(spec, index)
+    extremes = np.full(int(filled.sum()), -np.inf if largest else np.inf)
+    (np.maximum if largest else np.minimum).at(extremes, owner, values)
+    result[filled] = extremes
+    return result
+
+
+def closed_form_windows(spec: Dict, starts: np.ndarray, ends: np.ndarray,
+                        aggregations: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Exact aggregates of a generated stream over half-open ``[start, end)``
+    windows, derived from the generator parameters alone.
+
+    Costs O(windows) whatever the number of samples (plus the crests inside
+    each window for sines). MAX/MIN are NaN when the terms do not admit a
+    closed form (e.g. several sines of different frequencies).
+
+    Returns:
+        DataFrame laid out like ``reference_windows.aggregate_windows``
+    """
+    aggregations = [a.upper() for a in (aggregations or AGGREGATIONS)]
+    lo, hi = sample_range(spec, starts, ends)
+    counts = hi - lo
+    sums = sum((term_sums(term, lo, hi) for term in spec['terms']), np.zeros(len(lo)))
+
+    result = {'window_start': np.asarray(starts), 'window_end': np.asarray(ends)}
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for aggregation in aggregations:
+            if aggregation == 'COUNT':
+                result['count'] = counts
+            elif aggregation == 'SUM':
+                result['sum'] = sums
+            elif aggregation == 'AVG':
+                result['avg'] = np.where(counts > 0, sums / counts, np.nan)
+            elif aggregation == 'MAX':
+                result['max'] = window_extremes(spec, lo, hi, largest=True)
+            elif aggregation == 'MIN':
+                result['min'] = window_extremes(spec, lo, hi, largest=False)
+            else:
+                raise ValueError(f"Unsupported aggregation: {aggregation}")
+    return pd.DataFrame(result)
+
+
+def closed_form_reference(spec: Dict, range_ms: int, step_ms: int, aggregations: Optional[List[str]] = None,
+                          align: bool = False, complete_only: bool = False) -> pd.DataFrame:
+    """Every RANGE/STEP window of a generated stream, enumerated like ``compute_reference``."""
+    first = int(spec['start_ms'])
+    last = first + (int(spec['observations']) - 1) * int(spec['interval_ms'])
+    starts, ends = window_bounds(first, last, range_ms, step_ms, align, complete_only)
+    return closed_form_windows(spec, starts, ends, aggregations)
+
+
+def load_ground_truth(dataset_dir: str) -> Dict[str, Optional[Dict]]:
+    """
+    Ground-truth specs of a dataset's streams, keyed by stream directory.
+
+    Streams the generator could not describe in closed form (noisy or random
+    ones) map to None.
+    """
+    with open(Path(dataset_dir) / GROUND_TRUTH_FILE) as f:
+        return json.load(f)['streams']
+
+
+def verify_dataset(dataset_dir: str, range_ms: int, step_ms: int, align: bool = False) -> List[Dict]:
+    """
+    Cross-check the closed-form windows of every described stream of a dataset
+    against ``compute_reference`` over its data file.
+
+    Values in the file are rounded to 6 decimals, so a window matches when
+    every aggregate is within that rounding (times the count for SUM).
+
+    Returns:
+        List of dicts, one per described stream, with the largest error per aggregation
+    """
+    files = {path.parent.name: path for path in find_streams(dataset_dir)}
+    checks = []
+    for stream, spec in load_ground_truth(dataset_dir).items():
+        if spec is None or stream not in files:
+            continue
+        timestamps, values = read_stream(str(files[stream]))
+        raw = compute_reference(timestamps, values, range_ms, step_ms, align=align)
+        derived = closed_form_windows(spec, raw['window_start'].to_numpy(), raw['window_end'].to_numpy())
+        check = {'dataset': Path(dataset_dir).name, 'stream': stream, 'windows': len(raw), 'matches': True}
+        for column in ['avg', 'max', 'min', 'sum', 'count']:
+            expected, actual = raw[column].to_numpy(dtype=float), derived[column].to_numpy(dtype=float)
+            # NaN closed forms are empty windows or extremes without a closed form
+            described = ~np.isnan(actual)
+            error = np.abs(expected - actual)[described]
+            tolerance = VALUE_TOLERANCE * (raw['count'].to_numpy() if column == 'sum' else 1) + 1e-9 * np.abs(actual)
+            check[f'{column}_error'] = float(error.max()) if len(error) else 0.0
+            check['matches'] &= bool((error <= tolerance[described]).all())
+        checks.append(check)
+    return checks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Closed-form window ground truth of generated synthetic streams")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    windows = subparsers.add_parser("windows", help="RANGE/STEP windows of one stream from its generator parameters")
+    windows.add_argument("dataset", help=f"Dataset directory holding {GROUND_TRUTH_FILE}")
+    windows.add_argument("--stream", default="smartphone.acceleration.x", help="Stream directory name")
+    windows.add_argument("--range", type=int, default=120000, help="Window RANGE in ms")
+    windows.add_argument("--step", type=int, default=60000, help="Window STEP in ms")
+    windows.add_argument("--aggregations", nargs='+', default=AGGREGATIONS, help="Aggregations to compute")
+    windows.add_argument("--align", action='store_true', help="Align window starts to multiples of STEP")
+    windows.add_argument("--complete-only", action='store_true', help="Skip windows that end after the data")
+    windows.add_argument("--output", help="Optional CSV output path")
+
+    verify = subparsers.add_parser("verify", help="Cross-check the closed forms against the data files")
+    verify.add_argument("roots", nargs='+', help=f"Dataset directories, or directories searched for {GROUND_TRUTH_FILE}")
+    verify.add_argument("--range", type=int, default=120000, help="Window RANGE in ms")
+    verify.add_argument("--step", type=int, default=60000, help="Window STEP in ms")
+    verify.add_argument("--align", action='store_true', help="Align window starts to multiples of STEP")
+    args = parser.parse_args()
+
+    if args.command == "windows":
+        spec = load_ground_truth(args.dataset).get(args.stream)
+        if spec is None:
+            parser.error(f"{args.stream} has no closed-form ground truth in {args.dataset}")
+        started = time.perf_counter()
+        result = closed_form_reference(spec, args.range, args.step, args.aggregations, args.align, args.complete_only)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(result.to_string(index=False))
+        print(f"\n{len(result)} windows over {spec['observations']} samples in {elapsed_ms:.1f} ms")
+        if args.output:
+            result.to_csv(args.output, index=False)
+            print(f"Closed-form windows saved to: {args.output}")
+        return
+
+    datasets = sorted({path.parent for root in args.roots for path in Path(root).rglob(GROUND_TRUTH_FILE)})
+    checks = pd.DataFrame([check for dataset in datasets
+                           for check in verify_dataset(str(dataset), args.range, args.step, args.align)])
+    if checks.empty:
+        print(f"No {GROUND_TRUTH_FILE} found under {', '.join(args.roots)}")
+        return
+    print(checks.to_string(index=False))
+    print(f"\n{int(checks['matches'].sum())}/{len(checks)} streams match their closed-form ground truth")
+
+
+if __name__ == "__main__":
+    main()
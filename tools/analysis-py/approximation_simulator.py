@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+
+import argparse
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from accuracy_metrics import METRICS, score
+from chunk_aggregates import range_extreme
+from nt_stream import find_streams, read_stream
+from workload_generator import PATTERNS
+
+# Sub-queries and output query of StreamingQueryApproximationApproachOrchestrator
+DEFAULT_SUB_RANGE_MS = 60000
+DEFAULT_SUB_STEP_MS = 30000
+DEFAULT_RANGE_MS = 120000
+DEFAULT_STEP_MS = 60000
+# Synthetic series: 10 minutes at the 4 Hz replay rate, one clean and one noisy stream (the operator
+# only publishes over the first MAX_STREAM_DURATION_MS of it)
+DEFAULT_OBSERVATIONS = 2400
+DEFAULT_INTERVAL_MS = 250
+DEFAULT_STREAMS = 2
+DEFAULT_NOISE_LEVELS = [0.0, 0.02, 0.1]
+# Extra time the operator waits for every topic before triggering anyway (bufferTimeMs)
+TOPIC_WAIT_MS = 3000
+# The operator stops publishing once this long has passed since it connected (MAX_STREAM_DURATION)
+MAX_STREAM_DURATION_MS = 150000
+SWEEP_COLUMNS = ['pattern', 'noise', 'seed', 'aggregation', 'sub_range_ms', 'sub_step_ms', 'range_ms', 'step_ms',
+                 'latency_ms', 'windows'] + METRICS
+
+
+def window_values(timestamps: np.ndarray, values: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                  aggregation: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Exact ``aggregation`` and count of a time-ordered series over ``[start, end)`` windows.
+
+    Same results as ``aggregate_windows`` without building a frame, with
+    MAX/MIN from a sparse table, since the simulator calls it per configuration.
+    """
+    lo = np.searchsorted(timestamps, starts, side='left')
+    hi = np.searchsorted(timestamps, ends, side='left')
+    counts = hi - lo
+    if aggregation in ('MAX', 'MIN'):
+        result = range_extreme(values, lo, hi, largest=aggregation == 'MAX')
+    elif aggregation == 'COUNT':
+        result = counts.astype(float)
+    else:
+        prefix = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+        result = prefix[hi] - prefix[lo]
+        if aggregation == 'AVG':
+            result = result / np.maximum(counts, 1)
+    if aggregation in ('SUM', 'COUNT'):
+        return result, counts
+    return np.where(counts > 0, result, np.nan), counts
+
+
+def sub_query_results(timestamps: np.ndarray, values: np.ndarray, range_ms: int, step_ms: int,
+                      aggregation: str, latency_ms: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Results one sub-query emits over a time-ordered stream, as rsp-js windows them.
+
+    Windows are ``[close - range, close)`` with ``close`` on multiples of the
+    step; each non-empty window is emitted by the first event at or after its
+    close, and reaches the operator ``latency_ms`` later.
+
+    Returns:
+        Tuple of the arrival time and the value of every emitted result, in emission order
+    """
+    if len(timestamps) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    closes = (timestamps[0] // step_ms + 1 + np.arange((timestamps[-1] - timestamps[0]) // step_ms + 1)) * step_ms
+    closes = closes[closes <= timestamps[-1]]
+    results, counts = window_values(timestamps, values, closes - range_ms, closes, aggregation)
+    emitted = counts > 0
+    trigger = timestamps[np.searchsorted(timestamps, closes[emitted], side='left')]
+    return trigger + latency_ms, results[emitted]
+
+
+def combine(latest: np.ndarray, aggregation: str) -> np.ndarray:
+    """
+    The operator's cross-sensor result over the latest value of each topic.
+
+    Args:
+        latest: Topics x windows matrix of latest values, NaN where a topic has sent nothing yet
+    """
+    with np.errstate(invalid='ignore'):
+        present = ~np.isnan(latest)
+        if aggregation == 'COUNT':
+            return present.sum(axis=0).astype(float)
+        if aggregation == 'SUM':
+            return np.nansum(latest, axis=0)
+        filled = np.where(present, latest, {'MAX': -np.inf, 'MIN': np.inf}.get(aggregation, 0.0))
+        if aggregation == 'MAX':
+            return filled.max(axis=0)
+        if aggregation == 'MIN':
+            return filled.min(axis=0)
+        return filled.sum(axis=0) / present.sum(axis=0)
+
+
+def merge_sub_results(starts: np.ndarray, ends: np.ndarray, values: np.ndarray, target_start: int, target_end: int,
+                      aggregation: str) -> float:
+    """
+    ``mergeMultipleSlidingWindowResults`` over the buffered results of one topic.
+
+    AVG weighs every overlapping result by its overlap with the target, SUM
+    spreads each result uniformly over its window, and COUNT adds the results
+    covering every piece of the target between window boundaries.
+    """
+    overlapping = (ends > target_start) & (starts < target_end)
+    starts, ends, values = starts[overlapping], ends[overlapping], values[overlapping]
+    if len(values) == 0:
+        return 0.0
+    if aggregation in ('MIN', 'MAX'):
+        return float(values.min() if aggregation == 'MIN' else values.max())
+    overlap = np.minimum(ends, target_end) - np.maximum(starts, target_start)
+    if aggregation == 'AVG':
+        return float((values * overlap).sum() / overlap.sum()) if overlap.sum() > 0 else 0.0
+    if aggregation == 'SUM':
+        durations = ends - starts
+        return float((values / np.where(durations > 0, durations, np.inf) * overlap).sum())
+    inner = np.concatenate((starts, ends))
+    bounds = np.unique(np.concatenate(([target_start, target_end], inner[(inner > target_start) & (inner < target_end)])))
+    pieces = (starts[:, None] <= bounds[None, :-1]) & (ends[:, None] >= bounds[None, 1:])
+    return float((pieces * values[:, None]).sum())
+
+
+def trigger_points(arrivals: np.ndarray, topics: np.ndarray, topic_count: int, start_ms: int,
+                   range_ms: int, step_ms: int, max_duration_ms: Optional[int] = MAX_STREAM_DURATION_MS) -> List[int]:
+    """
+    Positions in the arrival sequence at which the operator publishes a result.
+
+    A message triggers once a STEP has passed since the last trigger, unless
+    some topic has no result inside the output window and the operator can
+    still wait up to ``TOPIC_WAIT_MS`` for it. The first trigger is measured
+    from ``start_ms`` (when the operator connected), and nothing triggers
+    once more than ``max_duration_ms`` has passed since then (None: no cap).
+
+    Returns:
+        Indices into ``arrivals`` (sorted by time) of every trigger
+    """
+    positions = [np.flatnonzero(topics == topic) for topic in range(topic_count)]
+    triggers, last = [], start_ms
+    i = int(np.searchsorted(arrivals, last + step_ms, side='left'))
+    while i < len(arrivals):
+        now = arrivals[i]
+        if max_duration_ms is not None and now - start_ms > max_duration_ms:
+            break
+        received = [p[:np.searchsorted(p, i, side='right')] for p in positions]
+        complete = sum(len(r) > 0 and arrivals[r[-1]] >= now - range_ms for r in received) == topic_count
+        if complete or now - last >= step_ms + TOPIC_WAIT_MS:
+            triggers.append(i)
+            last = now
+            i = int(np.searchsorted(arrivals, last + step_ms, side='left'))
+        else:
+            i += 1
+    return triggers
+
+
+def simulate(streams: Sequence[Tuple[np.ndarray, np.ndarray]], aggregation: str = 'AVG',
+             sub_range_ms: int = DEFAULT_SUB_RANGE_MS, sub_step_ms: int = DEFAULT_SUB_STEP_MS,
+             range_ms: int = DEFAULT_RANGE_MS, step_ms: int = DEFAULT_STEP_MS, latency_ms: int = 0,
+             max_duration_ms: Optional[int] = MAX_STREAM_DURATION_MS) -> pd.DataFrame:
+    """
+    Replay the estimation of ``RateBasedApproximationApproachOperator`` offline.
+
+    Every stream feeds one sub-query (``aggregation`` over
+    ``[RANGE sub_range STEP sub_step]``); the operator publishes at the
+    triggers of ``trigger_points`` the ``aggregation`` of the latest result of
+    each topic (or the merged buffered results when fewer than two topics
+    have sent any). Estimates are scored against the exact aggregate of the
+    union of the streams over the published window ``[now - range, now]``.
+    Publishing stops after ``max_duration_ms`` like the live operator's 150 s
+    cap (None replays the whole series); the inactivity stop is not simulated.
+
+    Returns:
+        DataFrame with window_start, window_end, estimate and reference per published window
+    """
+    aggregation = aggregation.upper()
+    results = [sub_query_results(t, v, sub_range_ms, sub_step_ms, aggregation, latency_ms) for t, v in streams]
+    arrivals = np.concatenate([arrival for arrival, _ in results])
+    values = np.concatenate([value for _, value in results])
+    topics = np.concatenate([np.full(len(arrival), k) for k, (arrival, _) in enumerate(results)])
+    order = np.lexsort((topics, arrivals))
+    arrivals, values, topics = arrivals[order], values[order], topics[order]
+    columns = ['window_start', 'window_end', 'estimate', 'reference']
+    if len(arrivals) == 0:
+        return pd.DataFrame(columns=columns)
+
+    start_ms = min(int(t[0]) for t, _ in streams if len(t))
+    triggers = trigger_points(arrivals, topics, len(streams), start_ms, range_ms, step_ms, max_duration_ms)
+    triggers = np.asarray(triggers, dtype=np.int64)
+    latest = np.full((len(streams), len(triggers)), np.nan)
+    for topic in range(len(streams)):
+        positions = np.flatnonzero(topics == topic)
+        last = np.searchsorted(positions, triggers, side='right') - 1
+        latest[topic, last >= 0] = values[positions[last[last >= 0]]]
+    estimates = combine(latest, aggregation)
+
+    # With fewer than two topics the estimate merges the buffered results still inside the window
+    for w in np.flatnonzero((~np.isnan(latest)).sum(axis=0) < 2):
+        i = triggers[w]
+        now, buffered = arrivals[i], topics[:i + 1] == topics[i]
+        ends, buffered_values = arrivals[:i + 1][buffered], values[:i + 1][buffered]
+        keep = ends >= now - range_ms
+        merged = merge_sub_results(ends[keep] - sub_range_ms, ends[keep], buffered_values[keep], now - range_ms, now,
+                                   aggregation)
+        estimates[w] = combine(np.array([[merged]]), aggregation)[0] if keep.any() else np.nan
+
+    timestamps = np.concatenate([t for t, _ in streams])
+    union = np.concatenate([v for _, v in streams])
+    by_time = np.argsort(timestamps, kind='stable')
+    ends = arrivals[triggers]
+    # The published window includes its end, as evaluate_accuracy_matrix scores it
+    reference, _ = window_values(timestamps[by_time], union[by_time], ends - range_ms, ends + 1, aggregation)
+    windows = pd.DataFrame({'window_start': ends - range_ms, 'window_end': ends, 'estimate': estimates,
+                            'reference': reference})
+    return windows.dropna(subset=['estimate']).reset_index(drop=True)
+
+
+def replay_clock(streams: Sequence[Tuple[np.ndarray, np.ndarray]], interval_ms: float = DEFAULT_INTERVAL_MS,
+                 start_ms: int = 0) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Streams re-timed to the replay clock of publish.ts.
+
+    The replayer starts every stream together, publishes in timestamp order
+    one observation every ``1000 / REPLAY_FREQUENCY`` ms and stamps each with
+    its publish time, so the operator windows the i-th observation at
+    ``start + i * interval`` whatever the file's own timestamps are.
+    """
+    return [(start_ms + np.round(np.arange(len(v)) * interval_ms).astype(np.int64), v[np.argsort(t, kind='stable')])
+            for t, v in streams]
+
+
+def synthetic_streams(pattern: str, noise: float, seed: int, observations: int = DEFAULT_OBSERVATIONS,
+                      interval_ms: int = DEFAULT_INTERVAL_MS, streams: int = DEFAULT_STREAMS,
+                      start_ms: int = 0) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Streams sharing one pattern, like the synthetic generators write them.
+
+    ``pattern`` is a ``workload_generator.PATTERNS`` name or a dataset
+    directory (whose first stream is the base series, re-timed to the
+    replay clock). The first stream is the clean pattern; every other one
+    adds Gaussian noise of ``noise`` times the absolute value.
+    """
+    rng = np.random.default_rng(seed)
+    if pattern in PATTERNS:
+        timestamps = start_ms + np.arange(observations, dtype=np.int64) * interval_ms
+        base = PATTERNS[pattern]((timestamps - start_ms) / 1000.0, rng)
+    else:
+        [(timestamps, base)] = replay_clock([read_stream(str(find_streams(pattern)[0]))], interval_ms, start_ms)
+    return [(timestamps, base if k == 0 else base + rng.normal(0, 1, len(base)) * noise * np.abs(base))
+            for k in range(streams)]
+
+
+def simulate_configuration(job: Dict) -> Dict:
+    """Simulate one Monte-Carlo configuration and score it (process pool worker)."""
+    streams = synthetic_streams(job['pattern'], job['noise'], job['seed'], job['observations'], job['interval_ms'],
+                                job['streams'])
+    windows = simulate(streams, job['aggregation'], job['sub_range_ms'], job['sub_step_ms'], job['range_ms'],
+                       job['step_ms'], job['latency_ms'], job['max_duration_ms'])
+    metrics = score(windows['reference'].to_numpy(), windows['estimate'].to_numpy(), axis=None)
+    row = {column: job[column] for column in SWEEP_COLUMNS[:9]}
+    return {**row, 'windows': len(windows), **{name: float(value) for name, value in metrics.items()}}
+
+
+def monte_carlo(patterns: List[str], noise_levels: List[float], seeds: int, aggregations: List[str],
+                sub_ranges: List[int], sub_steps: List[int], range_ms: int = DEFAULT_RANGE_MS,
+                step_ms: int = DEFAULT_STEP_MS, latency_ms: int = 0, observations: int = DEFAULT_OBSERVATIONS,
+                interval_ms: int = DEFAULT_INTERVAL_MS, streams: int = DEFAULT_STREAMS,
+                max_duration_ms: Optional[int] = MAX_STREAM_DURATION_MS, workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    Accuracy of the approximation over every combination of pattern, noise
+    level, seed, aggregation and sub-query window, simulated in parallel.
+
+    Returns:
+        DataFrame with one row of ``SWEEP_COLUMNS`` per configuration
+    """
+    jobs = [{'pattern': pattern, 'noise': noise, 'seed': seed, 'aggregation': aggregation.upper(),
+             'sub_range_ms': sub_range, 'sub_step_ms': sub_step, 'range_ms': range_ms, 'step_ms': step_ms,
+             'latency_ms': latency_ms, 'observations': observations, 'interval_ms': interval_ms, 'streams': streams,
+             'max_duration_ms': max_duration_ms}
+            for pattern, noise, seed, aggregation, sub_range, sub_step
+            in itertools.product(patterns, noise_levels, range(seeds), aggregations, sub_ranges, sub_steps)
+            if sub_step <= sub_range]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        return pd.DataFrame(executor.map(simulate_configuration, jobs, chunksize=4), columns=SWEEP_COLUMNS)
+
+
+def summarize(sweep: pd.DataFrame) -> pd.DataFrame:
+    """Mean and spread of the metrics across seeds for every configuration."""
+    keys = [column for column in SWEEP_COLUMNS[:9] if column != 'seed']
+    summary = sweep.groupby(keys, sort=False).agg(seeds=('seed', 'nunique'), windows=('windows', 'mean'),
+                                                   mae=('mae', 'mean'), mae_std=('mae', 'std'), mape=('mape', 'mean'),
+                                                   max_error=('max_error', 'max'))
+    return summary.reset_index()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline simulation of the rate-based approximation operator")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    windows = argparse.ArgumentParser(add_help=False)
+    windows.add_argument("--sub-range", type=int, nargs='+', default=[DEFAULT_SUB_RANGE_MS], help="Sub-query RANGE(s) in ms")
+    windows.add_argument("--sub-step", type=int, nargs='+', default=[DEFAULT_SUB_STEP_MS], help="Sub-query STEP(s) in ms")
+    windows.add_argument("--range", type=int, default=DEFAULT_RANGE_MS, help="Output query RANGE in ms")
+    windows.add_argument("--step", type=int, default=DEFAULT_STEP_MS, help="Output query STEP in ms")
+    windows.add_argument("--latency-ms", type=int, default=0, help="Delay of sub-query results reaching the operator")
+    windows.add_argument("--max-duration-ms", type=int, default=MAX_STREAM_DURATION_MS,
+                         help="Stop publishing this long after the first event, like the live operator (0: no cap)")
+    windows.add_argument("--interval-ms", type=int, default=DEFAULT_INTERVAL_MS,
+                         help="Replay interval (1000 / REPLAY_FREQUENCY) of synthetic and dataset streams")
+    windows.add_argument("--output", help="Optional CSV output path")
+
+    dataset = subparsers.add_parser("dataset", parents=[windows], help="Simulate the operator over a dataset's streams")
+    dataset.add_argument("dataset", help="Dataset directory; each stream feeds one sub-query")
+    dataset.add_argument("--aggregation", type=str.upper, default='AVG', help="Aggregation of all queries")
+
+    sweep = subparsers.add_parser("sweep", parents=[windows], help="Monte-Carlo accuracy over noise, seeds and patterns")
+    sweep.add_argument("--patterns", nargs='+', default=list(PATTERNS),
+                       help=f"Pattern names ({', '.join(PATTERNS)}) or dataset directories")
+    sweep.add_argument("--noise", type=float, nargs='+', default=DEFAULT_NOISE_LEVELS,
+                       help="Relative noise of the noisy streams")
+    sweep.add_argument("--seeds", type=int, default=10, help="Seeds per configuration")
+    sweep.add_argument("--aggregations", nargs='+', type=str.upper, default=['AVG', 'MAX'], help="Aggregations")
+    sweep.add_argument("--observations", type=int, default=DEFAULT_OBSERVATIONS, help="Samples per synthetic stream")
+    sweep.add_argument("--streams", type=int, default=DEFAULT_STREAMS, help="Streams (sub-queries) per configuration")
+    sweep.add_argument("--workers", type=int, help="Process pool size")
+    args = parser.parse_args()
+
+    if args.command == "dataset":
+        streams = replay_clock([read_stream(str(path)) for path in find_streams(args.dataset)], args.interval_ms)
+        result = simulate(streams, args.aggregation, args.sub_range[0], args.sub_step[0], args.range, args.step,
+                          args.latency_ms, args.max_duration_ms or None)
+        print(result.to_string(index=False))
+        metrics = score(result['reference'].to_numpy(), result['estimate'].to_numpy(), axis=None)
+        print(f"\n{len(result)} windows from {len(streams)} streams: "
+              + ', '.join(f"{name}={float(value):.4f}" for name, value in metrics.items()))
+        if args.output:
+            result.to_csv(args.output, index=False)
+            print(f"Simulated windows saved to: {args.output}")
+        return
+
+    unknown = [pattern for pattern in args.patterns if pattern not in PATTERNS and not find_streams(pattern)]
+    if unknown:
+        parser.error(f"not a pattern or a dataset directory with streams: {', '.join(unknown)}")
+    started = time.perf_counter()
+    results = monte_carlo(args.patterns, args.noise, args.seeds, args.aggregations, args.sub_range, args.sub_step,
+                          args.range, args.step, args.latency_ms, args.observations, args.interval_ms, args.streams,
+                          args.max_duration_ms or None, args.workers)
+    elapsed = time.perf_counter() - started
+    print(summarize(results).to_string(index=False))
+    print(f"\nSimulated {len(results)} configurations in {elapsed:.1f} s")
+    if args.max_duration_ms:
+        print(f"Windows are those published in the first {args.max_duration_ms / 1000:g} s, as the live operator "
+              f"stops there (--max-duration-ms 0 scores the whole series)")
+    if args.output:
+        results.to_csv(args.output, index=False)
+        print(f"Per-seed results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+
+import argparse
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from experiment_logs import RUN_KEYS, discover_runs, read_resource_log, run_log_paths
+from latency_engine import load_latencies
+
+DEFAULT_RESAMPLES = 10000
+DEFAULT_CONFIDENCE = 0.95
+RESAMPLES_PER_TASK = 2000
+
+
+def resource_metrics(resources: pd.DataFrame) -> dict:
+    """Summarize one resource log into CPU% and heap metrics."""
+    elapsed_ms = resources['timestamp'].iloc[-1] - resources['timestamp'].iloc[0]
+    # cpu_user/cpu_system are cumulative milliseconds from process.cpuUsage()
+    cpu_ms = (resources['cpu_user'].iloc[-1] - resources['cpu_user'].iloc[0]
+              + resources['cpu_system'].iloc[-1] - resources['cpu_system'].iloc[0])
+    return {
+        'cpu_percent': cpu_ms / elapsed_ms * 100 if elapsed_ms > 0 else np.nan,
+        'heap_used_mb': resources['heapUsedMB'].mean(),
+        'heap_peak_mb': resources['heapUsedMB'].max(),
+    }
+
+
+def collect_run_metrics(log_root: str) -> pd.DataFrame:
+    """
+    Build one sample per run and metric from an experiment log tree.
+
+    Returns:
+        Long DataFrame with the run keys plus ``metric`` and ``value``
+    """
+    rows = []
+    for _, run in discover_runs(log_root).iterrows():
+        paths = run_log_paths(Path(run['path']), run['approach'])
+        if paths['resources'].exists():
+            resources = read_resource_log(paths['resources'])
+            if len(resources) > 1:
+                for metric, value in resource_metrics(resources).items():
+                    rows.append({**run[RUN_KEYS].to_dict(), 'metric': metric, 'value': value})
+
+    latencies = load_latencies(log_root)
+    if not latencies.empty:
+        per_run = latencies.groupby(RUN_KEYS)['latency_ms'].agg(
+            latency_mean_ms='mean', latency_p99_ms=lambda x: x.quantile(0.99))
+        per_run = per_run.reset_index().melt(id_vars=RUN_KEYS, var_name='metric', value_name='value')
+        rows.extend(per_run.to_dict('records'))
+
+    return pd.DataFrame(rows, columns=RUN_KEYS + ['metric', 'value']).dropna(subset=['value'])
+
+
+def _bootstrap_task(args: Tuple[np.ndarray, np.ndarray, int, np.random.SeedSequence]) -> Tuple[np.ndarray, np.ndarray]:
+    """Draw one block of resamples and return mean differences and Hedges' g."""
+    a, b, n_resamples, seed = args
+    rng = np.random.default_rng(seed)
+    resampled_a = a[rng.integers(0, len(a), size=(n_resamples, len(a)))]
+    resampled_b = b[rng.integers(0, len(b), size=(n_resamples, len(b)))]
+    return (resampled_a.mean(axis=1) - resampled_b.mean(axis=1),
+            hedges_g(resampled_a, resampled_b, axis=1))
+
+
+def hedges_g(a: np.ndarray, b: np.ndarray, axis: Optional[int] = None) -> np.ndarray:
+    """Bias-corrected standardized mean difference between two samples."""
+    n_a, n_b = a.shape[-1], b.shape[-1]
+    dof = n_a + n_b - 2
+    if dof <= 0:
+        return np.full(np.shape(a.mean(axis=axis)), np.nan)
+    var_a = a.var(axis=axis, ddof=1) if n_a > 1 else 0.0
+    var_b = b.var(axis=axis, ddof=1) if n_b > 1 else 0.0
+    pooled_sd = np.sqrt(((n_a - 1) * var_a + (n_b - 1) * var_b) / dof)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d = (a.mean(axis=axis) - b.mean(axis=axis)) / pooled_sd
+    return d * (1 - 3 / (4 * dof - 1))
+
+
+def bootstrap_difference(a: np.ndarray, b: np.ndarray, n_resamples: int = DEFAULT_RESAMPLES,
+                         seed: int = 0, executor: Optional[ProcessPoolExecutor] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Bootstrap the mean difference ``a - b`` and its effect size.
+
+    Resamples are drawn in independent blocks, each with its own child seed,
+    so results are reproducible whether or not an executor is used.
+    """
+    block_sizes = [RESAMPLES_PER_TASK] * (n_resamples // RESAMPLES_PER_TASK)
+    if n_resamples % RESAMPLES_PER_TASK:
+        block_sizes.append(n_resamples % RESAMPLES_PER_TASK)
+    seeds = np.random.SeedSequence(seed).spawn(len(block_sizes))
+    tasks = [(a, b, size, block_seed) for size, block_seed in zip(block_sizes, seeds)]
+    results = list(executor.map(_bootstrap_task, tasks)) if executor else [_bootstrap_task(task) for task in tasks]
+    return np.concatenate([r[0] for r in results]), np.concatenate([r[1] for r in results])
+
+
+def compare_approaches(samples: pd.DataFrame, confidence: float = DEFAULT_CONFIDENCE,
+                       n_resamples: int = DEFAULT_RESAMPLES, seed: int = 0,
+                       group_by: Optional[List[str]] = None, workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    Compare every pair of approaches for every metric.
+
+    Args:
+        samples: Long table with approach, metric and value columns
+        confidence: Two-sided confidence level of the intervals
+        n_resamples: Bootstrap resamples per comparison
+        seed: Base seed for the resampling
+        group_by: Extra columns (e.g. ``dataset``) to compare within
+        workers: Process pool size, defaults to the CPU count
+
+    Returns:
+        One row per (group, metric, approach pair) with the mean difference,
+        Hedges' g, their confidence intervals and a verdict
+    """
+    alpha = (1 - confidence) / 2
+    keys = (group_by or []) + ['metric']
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        for group, frame in samples.groupby(keys):
+            group = group if isinstance(group, tuple) else (group,)
+            by_approach = {name: g['value'].to_numpy(dtype=float) for name, g in frame.groupby('approach')}
+            for name_a, name_b in itertools.combinations(sorted(by_approach), 2):
+                a, b = by_approach[name_a], by_approach[name_b]
+                diffs, effects = bootstrap_difference(a, b, n_resamples, seed, executor)
+                ci_low, ci_high = np.quantile(diffs, [alpha, 1 - alpha])
+                g_low, g_high = np.nanquantile(effects, [alpha, 1 - alpha]) if np.isfinite(effects).any() else (np.nan, np.nan)
+                if ci_high < 0:
+                    verdict = f'{name_a} lower than {name_b}'
+                elif ci_low > 0:
+                    verdict = f'{name_a} higher than {name_b}'
+                else:
+                    verdict = 'inconclusive'
+                rows.append({
+                    **dict(zip(keys, group)),
+                    'approach_a': name_a, 'approach_b': name_b,
+                    'n_a': len(a), 'n_b': len(b),
+                    'mean_a': a.mean(), 'mean_b': b.mean(),
+                    'difference': a.mean() - b.mean(),
+                    'ci_low': ci_low, 'ci_high': ci_high,
+                    'hedges_g': float(hedges_g(a, b)),
+                    'g_ci_low': g_low, 'g_ci_high': g_high,
+                    'confidence': confidence,
+                    'verdict': verdict,
+                })
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bootstrap confidence intervals and effect sizes for approach comparisons")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--log-root", help="Experiment log tree to collect per-run samples from")
+    source.add_argument("--samples", help="CSV with approach, metric and value columns")
+    parser.add_argument("--confidence", type=float, default=DEFAULT_CONFIDENCE, help="Confidence level")
+    parser.add_argument("--resamples", type=int, default=DEFAULT_RESAMPLES, help="Bootstrap resamples")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--by", nargs='*', default=[], help="Extra columns to compare within, e.g. dataset")
+    parser.add_argument("--workers", type=int, help="Process pool size")
+    parser.add_argument("--output", default="approach_comparison.csv", help="Output CSV path")
+    args = parser.parse_args()
+
+    samples = collect_run_metrics(args.log_root) if args.log_root else pd.read_csv(args.samples)
+    if samples.empty:
+        print("No samples to compare")
+        return
+
+    table = compare_approaches(samples, args.confidence, args.resamples, args.seed, args.by, args.workers)
+    if table.empty:
+        print("Need samples from at least two approaches per metric to compare")
+        return
+    table.to_csv(args.output, index=False)
+    print(table[args.by + ['metric', 'approach_a', 'approach_b', 'difference', 'ci_low', 'ci_high',
+                           'hedges_g', 'verdict']].to_string(index=False))
+    print(f"\nComparison table saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
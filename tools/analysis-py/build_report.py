@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+
+import argparse
+import html
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from bootstrap_comparison import resource_metrics
+from downsampling import minmax_indices
+from experiment_logs import RUN_KEYS, discover_runs, read_message_log, read_resource_log, run_log_paths
+from latency_engine import load_run_latencies, replay_counts, summarize_latencies
+
+# Points embedded per trend line; the browser re-buckets these to the chart width on every zoom
+DEFAULT_REPORT_POINTS = 2000
+
+
+def _run_label(run: Dict) -> str:
+    return f"{run['approach']} / {run['dataset']} / it{run['iteration']}"
+
+
+def _clean(value):
+    """Make a value JSON safe (numpy scalars and NaN)."""
+    if isinstance(value, (np.integer,)):
+        return int(value)
+    if isinstance(value, (np.floating, float)):
+        return None if math.isnan(value) else round(float(value), 4)
+    return value
+
+
+def _series(relative_s: np.ndarray, values: np.ndarray, points: int) -> Dict:
+    kept = minmax_indices(relative_s, values, points)
+    return {'x': np.round(relative_s[kept], 2).tolist(), 'y': np.round(values[kept], 3).tolist()}
+
+
+def summarize_run(job: Dict) -> Dict:
+    """Everything the report needs from one run directory, computed in one pass over its logs."""
+    run, points = job['run'], job['points']
+    paths = run_log_paths(Path(run['path']), run['approach'])
+    summary = {key: run[key] for key in RUN_KEYS}
+    trends = {}
+
+    if paths['resources'].exists():
+        resources = read_resource_log(paths['resources'])
+        if len(resources) > 1:
+            summary.update(resource_metrics(resources))
+            timestamps = resources['timestamp'].to_numpy(dtype=np.float64)
+            relative_s = (timestamps - timestamps[0]) / 1000
+            cpu_ms = (resources['cpu_user'] + resources['cpu_system']).to_numpy(dtype=np.float64)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                cpu_percent = np.diff(cpu_ms) / np.diff(timestamps) * 100
+            trends['heap'] = _series(relative_s, resources['heapUsedMB'].to_numpy(dtype=np.float64), points)
+            trends['cpu'] = _series(relative_s[1:], cpu_percent, points)
+
+    if paths['replayer'].exists():
+        counts = replay_counts(read_message_log(paths['replayer']))
+        summary.update(counts)
+        if counts['intended']:
+            summary['loss_percent'] = (counts['intended'] - counts['successful']) / counts['intended'] * 100
+
+    latencies = load_run_latencies(pd.Series(run))
+    if not latencies.empty:
+        latency_summary = summarize_latencies(latencies).iloc[0]
+        summary.update({k: latency_summary[k] for k in ['windows', 'mean', 'p50', 'p95', 'p99', 'max']})
+
+    return {'summary': {k: _clean(v) for k, v in summary.items()}, 'trends': trends}
+
+
+def accuracy_by_pattern(data_root: Optional[str], log_root: str, store: Optional[str],
+                        workers: Optional[int]) -> pd.DataFrame:
+    """Per-pattern accuracy, read from a results store or evaluated over the experiment matrix."""
+    from accuracy_metrics import score_frame
+
+    if store and Path(store).exists():
+        from window_results_store import load_store
+        windows = load_store(store)
+        windows['pattern'] = windows['pattern'].astype(str)
+        windows['approach'] = windows['approach'].astype(str)
+    elif data_root and Path(data_root).is_dir():
+        from evaluate_accuracy_matrix import evaluate_matrix
+        _, windows = evaluate_matrix(data_root, log_root, workers=workers)
+        if windows.empty:
+            return pd.DataFrame()
+        windows['pattern'] = windows['family'] + '/' + windows['dataset']
+    else:
+        return pd.DataFrame()
+    if windows.empty:
+        return pd.DataFrame()
+    return score_frame(windows, 'reference', 'value', ['pattern', 'approach'])
+
+
+def collect_report_data(log_root: str, data_root: Optional[str] = None, store: Optional[str] = None,
+                        points: int = DEFAULT_REPORT_POINTS, workers: Optional[int] = None) -> Dict:
+    """
+    Compute every aggregate shown in the report once.
+
+    Runs are summarized on a process pool; accuracy comes from the
+    per-window results store when given, otherwise from the experiment matrix.
+    """
+    runs = discover_runs(log_root) if Path(log_root).is_dir() else pd.DataFrame(columns=RUN_KEYS + ['path'])
+    jobs = [{'run': run, 'points': points} for run in runs.to_dict('records')]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        results = list(executor.map(summarize_run, jobs, chunksize=4))
+
+    trends = {'heap': [], 'cpu': []}
+    for result in results:
+        label = _run_label(result['summary'])
+        for name, series in result['trends'].items():
+            trends[name].append({'label': label, 'approach': result['summary']['approach'], **series})
+
+    accuracy = accuracy_by_pattern(data_root, log_root, store, workers)
+    accuracy_rows = [{k: _clean(v) for k, v in row.items()} for row in accuracy.to_dict('records')]
+    return {
+        'generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'log_root': str(log_root),
+        'runs': [result['summary'] for result in results],
+        'trends': trends,
+        'accuracy': accuracy_rows,
+    }
+
+
+def render_html(data: Dict, title: str = 'Streaming Query Hive Experiment Report') -> str:
+    """Embed the report data and the chart code into one self-contained HTML page."""
+    payload = json.dumps(data, separators=(',', ':')).replace('</', '<\\/')
+    return (_TEMPLATE.replace('__TITLE__', html.escape(title))
+            .replace('__REPORT_DATA__', payload))
+
+
+def build_report(log_root: str, output: str, data_root: Optional[str] = None, store: Optional[str] = None,
+                 points: int = DEFAULT_REPORT_POINTS, workers: Optional[int] = None) -> Dict:
+    data = collect_report_data(log_root, data_root, store, points, workers)
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    Path(output).write_text(render_html(data), encoding='utf-8')
+    return data
+
+
+_TEMPLATE = r"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>__TITLE__</title>
+<style>
+  body { font-family: -apple-system, "Segoe UI", Helvetica, Arial, sans-serif; margin: 24px auto; max-width: 1200px; color: #222; }
+  h1 { font-size: 22px; } h2 { font-size: 18px; margin-top: 36px; border-bottom: 1px solid #ddd; padding-bottom: 4px; }
+  .meta { color: #777; font-size: 13px; }
+  .chart { position: relative; } .chart svg { width: 100%; height: auto; user-select: none; }
+  .legend span { display: inline-block; margin: 2px 10px 2px 0; cursor: pointer; font-size: 12px; }
+  .legend span.off { opacity: 0.35; } .legend i { display: inline-block; width: 10px; height: 10px; margin-right: 4px; }
+  .tooltip { position: absolute; pointer-events: none; background: rgba(255,255,255,0.95); border: 1px solid #bbb;
+             padding: 4px 6px; font-size: 12px; display: none; white-space: nowrap; }
+  .hint { color: #888; font-size: 12px; }
+  table { border-collapse: collapse; font-size: 12px; margin-top: 8px; }
+  th, td { border: 1px solid #ddd; padding: 3px 8px; text-align: right; } th { background: #f4f4f4; cursor: pointer; }
+  td:first-child, th:first-child { text-align: left; }
+  .empty { color: #999; font-style: italic; }
+</style>
+</head>
+<body>
+<h1>__TITLE__</h1>
+<div class="meta" id="meta"></div>
+
+<h2>Accuracy per pattern</h2>
+<div id="accuracy-chart"></div><div id="accuracy-table"></div>
+
+<h2>End-to-end latency percentiles</h2>
+<div id="latency-chart"></div>
+
+<h2>CPU usage over time</h2>
+<p class="hint">Drag to zoom, double-click to reset, click a legend entry to hide a run.</p>
+<div id="cpu-chart"></div>
+
+<h2>Heap usage over time</h2>
+<div id="heap-chart"></div>
+
+<h2>Replayer loss</h2>
+<div id="loss-chart"></div>
+
+<h2>Runs</h2>
+<div id="runs-table"></div>
+
+<script id="report-data" type="application/json">__REPORT_DATA__</script>
+<script>
+const DATA = JSON.parse(document.getElementById('report-data').textContent);
+const COLORS = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#F39C12', '#8E44AD', '#2C3E50', '#E67E22', '#16A085', '#C0392B'];
+const SVGNS = 'http://www.w3.org/2000/svg';
+const W = 1100, H = 340, M = {top: 12, right: 16, bottom: 40, left: 64};
+
+function svgEl(tag, attrs, parent) {
+  const node = document.createElementNS(SVGNS, tag);
+  for (const k in attrs) node.setAttribute(k, attrs[k]);
+  if (parent) parent.appendChild(node);
+  return node;
+}
+function fmt(v) { return v == null ? '' : (Math.abs(v) >= 100 ? v.toFixed(0) : Math.abs(v) >= 1 ? v.toFixed(2) : v.toPrecision(3)); }
+function ticks(lo, hi, n) {
+  const step = Math.pow(10, Math.floor(Math.log10((hi - lo) / n || 1)));
+  const err = (hi - lo) / n / step, mult = err >= 5 ? 10 : err >= 2 ? 5 : err >= 1 ? 2 : 1;
+  const s = step * mult, out = [];
+  for (let t = Math.ceil(lo / s) * s; t <= hi + 1e-9; t += s) out.push(t);
+  return out;
+}
+function empty(id, text) { document.getElementById(id).innerHTML = '<p class="empty">' + text + '</p>'; }
+
+// Min/max per pixel column of the visible range, so zooming never hides a spike
+function bucket(xs, ys, x0, x1, width) {
+  const outX = [], outY = [];
+  let current = -1, minI = -1, maxI = -1, firstI = -1, lastI = -1;
+  const flush = () => {
+    if (current < 0) return;
+    [...new Set([firstI, minI, maxI, lastI])].sort((a, b) => a - b).forEach(i => { outX.push(xs[i]); outY.push(ys[i]); });
+  };
+  for (let i = 0; i < xs.length; i++) {
+    if (xs[i] < x0 || xs[i] > x1 || ys[i] == null) continue;
+    const b = Math.floor((xs[i] - x0) / (x1 - x0 || 1) * width);
+    if (b !== current) { flush(); current = b; minI = maxI = firstI = i; }
+    if (ys[i] < ys[minI]) minI = i;
+    if (ys[i] > ys[maxI]) maxI = i;
+    lastI = i;
+  }
+  flush();
+  return [outX, outY];
+}
+
+function axes(svg, x0, x1, y0, y1, xLabel, yLabel) {
+  const sx = v => M.left + (v - x0) / (x1 - x0 || 1) * (W - M.left - M.right);
+  const sy = v => H - M.bottom - (v - y0) / (y1 - y0 || 1) * (H - M.top - M.bottom);
+  ticks(y0, y1, 6).forEach(t => {
+    svgEl('line', {x1: M.left, x2: W - M.right, y1: sy(t), y2: sy(t), stroke: '#eee'}, svg);
+    svgEl('text', {x: M.left - 6, y: sy(t) + 4, 'text-anchor': 'end', 'font-size': 11}, svg).textContent = fmt(t);
+  });
+  if (xLabel !== null) ticks(x0, x1, 10).forEach(t => {
+    svgEl('text', {x: sx(t), y: H - M.bottom + 16, 'text-anchor': 'middle', 'font-size': 11}, svg).textContent = fmt(t);
+  });
+  svgEl('line', {x1: M.left, x2: W - M.right, y1: H - M.bottom, y2: H - M.bottom, stroke: '#888'}, svg);
+  svgEl('line', {x1: M.left, x2: M.left, y1: M.top, y2: H - M.bottom, stroke: '#888'}, svg);
+  if (xLabel) svgEl('text', {x: (W + M.left) / 2, y: H - 4, 'text-anchor': 'middle', 'font-size': 12}, svg).textContent = xLabel;
+  svgEl('text', {x: 14, y: H / 2, 'text-anchor': 'middle', 'font-size': 12, transform: 'rotate(-90 14 ' + H / 2 + ')'}, svg).textContent = yLabel;
+  return [sx, sy];
+}
+
+function legend(container, labels, hidden, onToggle) {
+  const div = document.createElement('div');
+  div.className = 'legend';
+  labels.forEach((label, i) => {
+    const span = document.createElement('span');
+    span.innerHTML = '<i style="background:' + COLORS[i % COLORS.length] + '"></i>' + label;
+    if (hidden.has(i)) span.className = 'off';
+    span.onclick = () => { hidden.has(i) ? hidden.delete(i) : hidden.add(i); onToggle(); };
+    div.appendChild(span);
+  });
+  container.appendChild(div);
+}
+
+function lineChart(id, series, xLabel, yLabel) {
+  const container = document.getElementById(id);
+  if (!series.length) return empty(id, 'No data');
+  const allX = series.flatMap(s => [s.x[0], s.x[s.x.length - 1]]);
+  const full = [Math.min(...allX), Math.max(...allX)];
+  let view = full.slice();
+  const hidden = new Set();
+
+  function draw() {
+    container.innerHTML = '';
+    container.className = 'chart';
+    const svg = svgEl('svg', {viewBox: '0 0 ' + W + ' ' + H}, container);
+    const tip = document.createElement('div');
+    tip.className = 'tooltip';
+    container.appendChild(tip);
+    const plotWidth = W - M.left - M.right;
+    const visible = series.map((s, i) => hidden.has(i) ? null : bucket(s.x, s.y, view[0], view[1], plotWidth));
+    const ys = visible.filter(v => v).flatMap(v => v[1]);
+    const y0 = ys.length ? Math.min(0, ...ys) : 0, y1 = ys.length ? Math.max(...ys) * 1.05 || 1 : 1;
+    const [sx, sy] = axes(svg, view[0], view[1], y0, y1, xLabel, yLabel);
+    visible.forEach((v, i) => {
+      if (!v || !v[0].length) return;
+      const d = v[0].map((x, j) => (j ? 'L' : 'M') + sx(x).toFixed(1) + ' ' + sy(v[1][j]).toFixed(1)).join('');
+      svgEl('path', {d: d, fill: 'none', stroke: COLORS[i % COLORS.length], 'stroke-width': 1.2}, svg);
+    });
+    const sel = svgEl('rect', {y: M.top, height: H - M.top - M.bottom, fill: 'rgba(0,0,0,0.08)', width: 0}, svg);
+    const toData = e => {
+      const r = svg.getBoundingClientRect();
+      const px = (e.clientX - r.left) * W / r.width;
+      return [px, view[0] + (px - M.left) / plotWidth * (view[1] - view[0])];
+    };
+    let dragStart = null;
+    svg.onmousedown = e => { dragStart = toData(e); };
+    svg.onmousemove = e => {
+      const [px, x] = toData(e);
+      if (dragStart) {
+        sel.setAttribute('x', Math.min(dragStart[0], px));
+        sel.setAttribute('width', Math.abs(px - dragStart[0]));
+      }
+      const rows = visible.map((v, i) => {
+        if (!v || !v[0].length) return null;
+        let j = v[0].findIndex(vx => vx >= x);
+        j = j < 0 ? v[0].length - 1 : j;
+        return '<b style="color:' + COLORS[i % COLORS.length] + '">' + series[i].label + '</b>: ' + fmt(v[1][j]);
+      }).filter(r => r);
+      tip.innerHTML = xLabel + ' ' + fmt(x) + '<br>' + rows.join('<br>');
+      tip.style.display = 'block';
+      tip.style.left = (e.offsetX + 14) + 'px';
+      tip.style.top = (e.offsetY + 8) + 'px';
+    };
+    svg.onmouseleave = () => { tip.style.display = 'none'; dragStart = null; sel.setAttribute('width', 0); };
+    svg.onmouseup = e => {
+      const end = toData(e);
+      if (dragStart && Math.abs(end[0] - dragStart[0]) > 4) view = [Math.min(dragStart[1], end[1]), Math.max(dragStart[1], end[1])];
+      dragStart = null;
+      draw();
+    };
+    svg.ondblclick = () => { view = full.slice(); draw(); };
+    legend(container, series.map(s => s.label), hidden, draw);
+  }
+  draw();
+}
+
+function barChart(id, categories, groups, yLabel) {
+  const container = document.getElementById(id);
+  if (!categories.length) return empty(id, 'No data');
+  const hidden = new Set();
+  function draw() {
+    container.innerHTML = '';
+    container.className = 'chart';
+    const svg = svgEl('svg', {viewBox: '0 0 ' + W + ' ' + (H + 60)}, container);
+    const values = groups.filter((g, i) => !hidden.has(i)).flatMap(g => g.values).filter(v => v != null);
+    const y1 = values.length ? Math.max(...values) * 1.1 || 1 : 1;
+    const [, sy] = axes(svg, 0, 1, 0, y1, null, yLabel);
+    const band = (W - M.left - M.right) / categories.length;
+    const shown = groups.map((g, i) => i).filter(i => !hidden.has(i));
+    const barWidth = band * 0.8 / Math.max(shown.length, 1);
+    categories.forEach((c, ci) => {
+      const x = M.left + ci * band;
+      shown.forEach((gi, k) => {
+        const v = groups[gi].values[ci];
+        if (v == null) return;
+        const rect = svgEl('rect', {x: x + band * 0.1 + k * barWidth, y: sy(v), width: barWidth - 1,
+                                    height: sy(0) - sy(v), fill: COLORS[gi % COLORS.length]}, svg);
+        svgEl('title', {}, rect).textContent = c + ' / ' + groups[gi].label + ': ' + fmt(v);
+      });
+      const lx = x + band / 2, ly = H - M.bottom + 12;
+      svgEl('text', {x: lx, y: ly, 'font-size': 10, 'text-anchor': 'end',
+                     transform: 'rotate(-35 ' + lx + ' ' + ly + ')'}, svg).textContent = c;
+    });
+    legend(container, groups.map(g => g.label), hidden, draw);
+  }
+  draw();
+}
+
+function table(id, rows, columns) {
+  const container = document.getElementById(id);
+  if (!rows.length) return empty(id, 'No data');
+  let sortKey = null, ascending = true;
+  function draw() {
+    const sorted = sortKey === null ? rows : rows.slice().sort((a, b) => {
+      const av = a[sortKey], bv = b[sortKey];
+      return (av > bv ? 1 : av < bv ? -1 : 0) * (ascending ? 1 : -1);
+    });
+    const head = '<tr>' + columns.map(c => '<th data-key="' + c + '">' + c + '</th>').join('') + '</tr>';
+    const body = sorted.map(r => '<tr>' + columns.map(c => '<td>' + (typeof r[c] === 'number' ? fmt(r[c]) : (r[c] ?? '')) + '</td>').join('') + '</tr>').join('');
+    container.innerHTML = '<table>' + head + body + '</table>';
+    container.querySelectorAll('th').forEach(th => th.onclick = () => {
+      ascending = sortKey === th.dataset.key ? !ascending : true;
+      sortKey = th.dataset.key;
+      draw();
+    });
+  }
+  draw();
+}
+
+function pivot(rows, categoryKey, groupKey, valueKey) {
+  const categories = [...new Set(rows.map(r => r[categoryKey]))];
+  const groupNames = [...new Set(rows.map(r => r[groupKey]))];
+  const groups = groupNames.map(g => ({label: g, values: categories.map(c => {
+    const hits = rows.filter(r => r[categoryKey] === c && r[groupKey] === g && r[valueKey] != null);
+    return hits.length ? hits.reduce((s, r) => s + r[valueKey], 0) / hits.length : null;
+  })}));
+  return [categories, groups];
+}
+
+document.getElementById('meta').textContent = 'Generated ' + DATA.generated + ' from ' + DATA.log_root + ' (' + DATA.runs.length + ' runs)';
+
+const [patterns, accuracyGroups] = pivot(DATA.accuracy, 'pattern', 'approach', 'percentage_accuracy');
+barChart('accuracy-chart', patterns, accuracyGroups, 'Accuracy (%)');
+table('accuracy-table', DATA.accuracy, ['pattern', 'approach', 'windows', 'percentage_accuracy', 'mae', 'rmse', 'mape', 'max_error']);
+
+const latencyRuns = DATA.runs.filter(r => r.p50 != null);
+const latencyLabels = latencyRuns.map(r => r.approach + ' / ' + r.dataset + ' / it' + r.iteration);
+barChart('latency-chart', latencyLabels, ['p50', 'p95', 'p99'].map(p => ({label: p, values: latencyRuns.map(r => r[p])})), 'Latency (ms)');
+
+lineChart('cpu-chart', DATA.trends.cpu, 'Time (s)', 'CPU (%)');
+lineChart('heap-chart', DATA.trends.heap, 'Time (s)', 'Heap used (MB)');
+
+const lossRuns = DATA.runs.filter(r => r.intended != null);
+barChart('loss-chart', lossRuns.map(r => r.approach + ' / ' + r.dataset + ' / it' + r.iteration),
+         [{label: 'loss %', values: lossRuns.map(r => r.loss_percent)}], 'Lost publishes (%)');
+
+table('runs-table', DATA.runs, ['experiment', 'dataset', 'approach', 'iteration', 'cpu_percent', 'heap_used_mb',
+                                'heap_peak_mb', 'windows', 'p50', 'p95', 'p99', 'intended', 'successful', 'failed', 'loss_percent']);
+</script>
+</body>
+</html>
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a single self-contained HTML report of an experiment tree")
+    parser.add_argument("--log-root", default="logs", help="Root of the experiment log tree")
+    parser.add_argument("--data-root", default="src/streamer/data", help="Dataset root used to evaluate accuracy")
+    parser.add_argument("--store", help="Per-window results store to read accuracy from instead")
+    parser.add_argument("--points", type=int, default=DEFAULT_REPORT_POINTS, help="Points embedded per trend line")
+    parser.add_argument("--workers", type=int, help="Process pool size")
+    parser.add_argument("--output", default="experiment_report.html", help="Report output path")
+    args = parser.parse_args()
+
+    data = build_report(args.log_root, args.output, args.data_root, args.store,
+                        args.points, args.workers)
+    size_kb = Path(args.output).stat().st_size / 1024
+    print(f"Summarized {len(data['runs'])} runs and {len(data['accuracy'])} accuracy rows")
+    print(f"Report saved to: {args.output} ({size_kb:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import re
+import subprocess
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from bootstrap_comparison import resource_metrics
+from experiment_logs import (APPROACH_LOG_FILES, REPLAYER_LOG_FILE, RESOURCE_LOG_FILES, discover_runs,
+                             read_message_log, read_resource_log, run_log_paths)
+from heap_growth import BYTES_PER_MB
+from latency_engine import (CONTENT_STEP_MS, PERCENTILES, compute_window_latencies, extract_outputs, read_publishes,
+                            replay_counts)
+from workload_generator import STREAMS, write_stream
+
+# Offered replay rates (Hz per stream), from the default 4 Hz of publish.ts up to 10 kHz
+DEFAULT_RATES = [4, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+# Replay length of every step; the dataset size grows with the rate. Long enough for the three
+# 30 s content windows the processed rate is measured between
+DEFAULT_DURATION_S = 120
+# Time the approach gets to drain its backlog after the replayer exits
+DEFAULT_DRAIN_S = 10
+
+APPROACH_SCRIPTS = {
+    'approximation': 'dist/approaches/StreamingQueryApproximationApproachOrchestrator.js',
+    'fetching': 'dist/approaches/StreamingQueryFetchingClientSideApproachOrchestrator.js',
+    'chunked': 'dist/approaches/StreamingQueryChunkedApproachOrchestrator.js',
+}
+PUBLISH_SCRIPT = 'dist/streamer/src/publish.js'
+SWEEP_FAMILY = 'capacity_sweep'
+
+APPROACH_STARTUP_S = 2  # Same head start as the tools/experiments runners
+# A step is killed after this many times its nominal duration plus the margin
+TIMEOUT_FACTOR = 3
+TIMEOUT_MARGIN_S = 60
+
+# Saturation: the approach processes less than this share of the rate the replayer achieved (or the
+# replayer achieves less than this share of the offered rate, which ends the sweep as replayer-bound) ...
+DEFAULT_MIN_RATE_RATIO = 0.9
+# ... or p95 end-to-end latency, joined on the publish times the replayer logs, exceeds this bound ...
+DEFAULT_MAX_P95_LATENCY_MS = 5000
+# ... or more than this share of publishes fail
+DEFAULT_MAX_FAILED_FRACTION = 0.01
+
+CURVE_COLUMNS = ['approach', 'offered_hz', 'samples', 'achieved_hz', 'processed_hz', 'rate_ratio', 'intended',
+                 'successful', 'failed', 'failed_fraction', 'results', 'results_per_s', 'latency_p50_ms',
+                 'latency_p95_ms', 'latency_p99_ms', 'cpu_percent', 'heap_used_mb', 'heap_peak_mb', 'rss_peak_mb',
+                 'timed_out', 'saturation']
+
+_RATE_PATTERN = re.compile(r'rate_(\d+(?:\.\d+)?)$')
+
+
+def _rate_label(rate: float) -> str:
+    return f"rate_{rate:g}"
+
+
+def generate_sweep_dataset(rate: float, duration_s: float, data_root: str, seed: int = 0) -> Path:
+    """
+    Generate the dataset of one sweep step under ``<data_root>/capacity_sweep/rate_<hz>``.
+
+    Both streams carry ``rate * duration_s`` observations spaced ``1/rate``
+    apart: a 1 Hz sine, with 2% noise on the wearable stream.
+
+    Returns:
+        Dataset directory
+    """
+    n = max(int(round(rate * duration_s)), 1)
+    start = int(time.time() * 1000)
+    timestamps = start + np.round(np.arange(n) * 1000.0 / rate).astype(np.int64)
+    values = np.sin(2 * np.pi * (timestamps - start) / 1000.0)
+    noisy = values + np.random.default_rng(seed).normal(0, 0.02, n)
+    dataset_dir = Path(data_root) / SWEEP_FAMILY / _rate_label(rate)
+    for (stream, device_name), stream_values in zip(STREAMS.items(), [values, noisy]):
+        write_stream(dataset_dir / stream / 'data.nt', timestamps, stream_values, device_name)
+    return dataset_dir
+
+
+def _step_log_files(approach: str) -> List[str]:
+    return [APPROACH_LOG_FILES[approach], RESOURCE_LOG_FILES[approach], REPLAYER_LOG_FILE]
+
+
+def run_step(approach: str, rate: float, duration_s: float, run_dir: Path, drain_s: float = DEFAULT_DRAIN_S) -> Dict:
+    """
+    Replay one sweep dataset through an approach, like the tools/experiments runners.
+
+    Must run from the repository root with the project built (``npm run build``)
+    and an MQTT broker on localhost:1883. The approach starts first, the
+    replayer follows at ``rate`` Hz per stream and the approach gets ``drain_s``
+    after the replayer exits before it is stopped. Both write their logs
+    straight into ``run_dir`` through LOG_PATH.
+
+    Returns:
+        Dict with whether the step hit the timeout and the replayer exit code
+    """
+    run_dir.mkdir(parents=True, exist_ok=True)
+    # CSVLogger appends, so stale logs of an interrupted step would be merged into this one
+    for name in _step_log_files(approach):
+        (run_dir / name).unlink(missing_ok=True)
+    env = {**os.environ, 'DATA_PATH': f"{SWEEP_FAMILY}/{_rate_label(rate)}",
+           'LOG_PATH': str(run_dir.resolve()), 'REPLAY_FREQUENCY': f"{rate:g}"}
+    timeout_s = duration_s * TIMEOUT_FACTOR + TIMEOUT_MARGIN_S
+
+    # Both processes log every message to stdout, which alone would slow down high-rate steps
+    approach_process = subprocess.Popen(['node', APPROACH_SCRIPTS[approach]], env=env,
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(APPROACH_STARTUP_S)
+    publisher = subprocess.Popen(['node', PUBLISH_SCRIPT], env=env,
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    timed_out = False
+    try:
+        publisher.wait(timeout=timeout_s)
+        time.sleep(drain_s)
+    except subprocess.TimeoutExpired:
+        timed_out = True
+        publisher.kill()
+        publisher.wait()
+    approach_process.terminate()
+    try:
+        approach_process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        approach_process.kill()
+        approach_process.wait()
+    return {'timed_out': timed_out, 'exit_code': publisher.returncode}
+
+
+def processed_rate(latencies: pd.DataFrame, publishes: pd.DataFrame) -> float:
+    """
+    Observations per second and stream the approach consumed, from its emitted windows.
+
+    Between the first and the last window the approach emitted, it consumed
+    every observation whose event time lies between their closes, in the
+    time between the two emits. An approach that keeps up emits them as far
+    apart as the replayer published that content; one that falls behind
+    takes longer. NaN with fewer than two distinct windows.
+    """
+    if latencies.empty:
+        return np.nan
+    emitted = latencies.groupby('content_end')['emitted_at'].min().sort_index()
+    if len(emitted) < 2 or emitted.iloc[-1] <= emitted.iloc[0]:
+        return np.nan
+    event_ms = publishes['event_ms'].to_numpy()
+    consumed = np.count_nonzero((event_ms >= emitted.index[0]) & (event_ms < emitted.index[-1])) / len(STREAMS)
+    return consumed / ((emitted.iloc[-1] - emitted.iloc[0]) / 1000)
+
+
+def measure_step(run_dir: Path, approach: str, rate: float) -> Dict:
+    """
+    Throughput, latency and resource metrics of one sweep step.
+
+    The achieved rate is the replayer's logged publishes per stream over
+    the publish interval (first to last publish, so the dataset load is
+    excluded); the processed rate is the approach's own consumption
+    (``processed_rate``), and ``rate_ratio`` compares the two. Latency is
+    joined on the publish times the replayer logged.
+    """
+    paths = run_log_paths(Path(run_dir), approach)
+    metrics = {column: np.nan for column in CURVE_COLUMNS}
+    metrics.update({'approach': approach, 'offered_hz': rate, 'intended': 0, 'successful': 0, 'failed': 0,
+                    'results': 0, 'timed_out': False, 'saturation': ''})
+    replay = pd.DataFrame()
+    if paths['replayer'].exists():
+        replayer = read_message_log(paths['replayer'])
+        counts = replay_counts(replayer)
+        metrics.update(counts)
+        metrics['samples'] = counts['intended'] // len(STREAMS)
+        if counts['intended']:
+            metrics['failed_fraction'] = counts['failed'] / counts['intended']
+        replay = read_publishes(replayer)
+        if len(replay) > 1:
+            span_s = (replay['published_at'].max() - replay['published_at'].min()) / 1000
+            if span_s > 0:
+                metrics['achieved_hz'] = (len(replay) / len(STREAMS) - 1) / span_s
+
+    if paths['messages'].exists():
+        outputs = extract_outputs(read_message_log(paths['messages']), approach)
+        metrics['results'] = len(outputs)
+        if len(outputs) > 1:
+            span_s = (outputs['emitted_at'].max() - outputs['emitted_at'].min()) / 1000
+            metrics['results_per_s'] = (len(outputs) - 1) / span_s if span_s > 0 else np.nan
+        if not outputs.empty and not replay.empty:
+            latencies = compute_window_latencies(outputs, replay, CONTENT_STEP_MS[approach])
+            metrics['processed_hz'] = processed_rate(latencies, replay)
+            metrics['rate_ratio'] = metrics['processed_hz'] / metrics['achieved_hz']
+            if len(latencies):
+                for q, value in zip(PERCENTILES, np.quantile(latencies['latency_ms'], PERCENTILES)):
+                    metrics[f'latency_p{int(q * 100)}_ms'] = value
+
+    if paths['resources'].exists():
+        resources = read_resource_log(paths['resources'])
+        if len(resources) > 1:
+            metrics.update(resource_metrics(resources))
+            metrics['rss_peak_mb'] = resources['rss'].max() / BYTES_PER_MB
+    return metrics
+
+
+def saturation_reason(metrics: Dict, min_rate_ratio: float = DEFAULT_MIN_RATE_RATIO,
+                      max_p95_latency_ms: float = DEFAULT_MAX_P95_LATENCY_MS,
+                      max_failed_fraction: float = DEFAULT_MAX_FAILED_FRACTION) -> str:
+    """
+    Why a step counts as saturated ('' when it kept up with the offered rate).
+
+    'throughput' is the approach falling behind the publishes (or emitting
+    nothing); 'replayer' is the replayer itself missing the offered rate,
+    past which the sweep cannot load the approaches any further.
+    """
+    reasons = []
+    if metrics['timed_out']:
+        reasons.append('timeout')
+    if metrics['results'] == 0 or (np.isfinite(metrics['rate_ratio']) and metrics['rate_ratio'] < min_rate_ratio):
+        reasons.append('throughput')
+    if not np.isfinite(metrics['achieved_hz']) or metrics['achieved_hz'] < min_rate_ratio * metrics['offered_hz']:
+        reasons.append('replayer')
+    if np.isfinite(metrics['latency_p95_ms']) and metrics['latency_p95_ms'] > max_p95_latency_ms:
+        reasons.append('latency')
+    if np.isfinite(metrics['failed_fraction']) and metrics['failed_fraction'] > max_failed_fraction:
+        reasons.append('failures')
+    return '+'.join(reasons)
+
+
+def sweep_approach(approach: str, rates: List[float], duration_s: float, data_root: str, log_root: str,
+                   drain_s: float = DEFAULT_DRAIN_S, **limits) -> pd.DataFrame:
+    """
+    Run the sweep of one approach, stopping at the first saturated step.
+
+    Returns:
+        Capacity curve with one row per executed step
+    """
+    rows = []
+    for rate in sorted(rates):
+        print(f"\n[{approach}] {rate:g} Hz x {duration_s:g} s ({int(round(rate * duration_s))} observations per stream)")
+        generate_sweep_dataset(rate, duration_s, data_root)
+        run_dir = Path(log_root) / approach / _rate_label(rate) / 'iteration1'
+        step = run_step(approach, rate, duration_s, run_dir, drain_s)
+        metrics = measure_step(run_dir, approach, rate)
+        metrics['timed_out'] = step['timed_out']
+        metrics['saturation'] = saturation_reason(metrics, **limits)
+        rows.append(metrics)
+        print(f"  replayed {metrics['achieved_hz']:.1f} Hz, processed {metrics['processed_hz']:.1f} Hz "
+              f"(ratio {metrics['rate_ratio']:.2f}), "
+              f"p95 latency {metrics['latency_p95_ms']:.0f} ms, CPU {metrics['cpu_percent']:.0f}%")
+        if metrics['saturation']:
+            print(f"  Saturated ({metrics['saturation']}), stopping the {approach} sweep")
+            break
+    return pd.DataFrame(rows, columns=CURVE_COLUMNS)
+
+
+def collect_sweep(log_root: str, **limits) -> pd.DataFrame:
+    """Rebuild the capacity curves from the logs of earlier sweeps (``<approach>/rate_<hz>/iteration<N>``)."""
+    rows = []
+    for run in discover_runs(log_root).itertuples():
+        match = _RATE_PATTERN.search(run.dataset)
+        if not match:
+            continue
+        metrics = measure_step(Path(run.path), run.approach, float(match.group(1)))
+        metrics['saturation'] = saturation_reason(metrics, **limits)
+        rows.append(metrics)
+    curve = pd.DataFrame(rows, columns=CURVE_COLUMNS)
+    return curve.sort_values(['approach', 'offered_hz'], ignore_index=True)
+
+
+def capacity_points(curve: pd.DataFrame) -> pd.DataFrame:
+    """Highest offered rate every approach sustained below its first saturated step."""
+    rows = []
+    for approach, steps in curve.groupby('approach'):
+        steps = steps.sort_values('offered_hz')
+        saturated = steps['saturation'].astype(bool).to_numpy()
+        first = int(np.argmax(saturated)) if saturated.any() else len(steps)
+        sustained = steps.iloc[:first]
+        best = sustained.iloc[-1] if len(sustained) else None
+        rows.append({
+            'approach': approach,
+            'capacity_hz': best['offered_hz'] if best is not None else np.nan,
+            'achieved_hz': best['achieved_hz'] if best is not None else np.nan,
+            'processed_hz': best['processed_hz'] if best is not None else np.nan,
+            'latency_p95_ms': best['latency_p95_ms'] if best is not None else np.nan,
+            'saturated_at_hz': steps['offered_hz'].iloc[first] if saturated.any() else np.nan,
+            'saturation': steps['saturation'].iloc[first] if saturated.any() else '',
+        })
+    return pd.DataFrame(rows)
+
+
+def plot_capacity_curve(curve: pd.DataFrame, output_path: str):
+    """Processed vs offered rate and p95 latency per approach, log-log."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig, (ax_rate, ax_latency) = plt.subplots(1, 2, figsize=(12, 5))
+    for approach, steps in curve.groupby('approach'):
+        steps = steps.sort_values('offered_hz')
+        line, = ax_rate.plot(steps['offered_hz'], steps['processed_hz'], marker='o', label=approach)
+        ax_latency.plot(steps['offered_hz'], steps['latency_p95_ms'], marker='o', color=line.get_color(), label=approach)
+        saturated = steps[steps['saturation'].astype(bool)]
+        ax_rate.scatter(saturated['offered_hz'], saturated['processed_hz'], marker='x', s=80, color='red', zorder=3)
+    limits = [curve['offered_hz'].min(), curve['offered_hz'].max()]
+    ax_rate.plot(limits, limits, linestyle='--', color='gray', label='offered')
+    for ax in (ax_rate, ax_latency):
+        ax.set_xscale('log')
+        ax.set_yscale('log')
+        ax.set_xlabel('Offered rate per stream (Hz)')
+        ax.grid(True, which='both', alpha=0.3)
+        ax.legend()
+    ax_rate.set_ylabel('Processed rate per stream (Hz)')
+    ax_rate.set_title('Throughput (x = saturated)')
+    ax_latency.set_ylabel('p95 end-to-end latency (ms)')
+    ax_latency.set_title('Latency')
+    plt.tight_layout()
+    plt.savefig(output_path, dpi=150)
+    plt.close(fig)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep replay rates until each approach saturates")
+    parser.add_argument("--approaches", nargs='+', default=list(APPROACH_SCRIPTS), choices=list(APPROACH_SCRIPTS),
+                        help="Approaches to sweep")
+    parser.add_argument("--rates", type=float, nargs='+', default=DEFAULT_RATES, help="Offered rates (Hz per stream)")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION_S, help="Replay length of every step (s)")
+    parser.add_argument("--drain", type=float, default=DEFAULT_DRAIN_S, help="Seconds the approach may drain after the replay")
+    parser.add_argument("--min-rate-ratio", type=float, default=DEFAULT_MIN_RATE_RATIO,
+                        help="Saturated below this processed/replayed (or replayed/offered) rate ratio")
+    parser.add_argument("--max-p95", type=float, default=DEFAULT_MAX_P95_LATENCY_MS,
+                        help="Saturated above this p95 latency (ms)")
+    parser.add_argument("--max-failed", type=float, default=DEFAULT_MAX_FAILED_FRACTION,
+                        help="Saturated above this share of failed publishes")
+    parser.add_argument("--data-root", default="src/streamer/data", help="Root the sweep datasets are written under")
+    parser.add_argument("--log-root", default="logs/capacity-sweep", help="Root the sweep logs are written under")
+    parser.add_argument("--from-logs", action='store_true', help="Only rebuild the curves from existing sweep logs")
+    parser.add_argument("--output", default="capacity_curve.csv", help="Capacity curve CSV")
+    parser.add_argument("--plot", default="capacity_curve.png", help="Capacity curve figure")
+    args = parser.parse_args()
+
+    limits = {'min_rate_ratio': args.min_rate_ratio, 'max_p95_latency_ms': args.max_p95,
+              'max_failed_fraction': args.max_failed}
+    if args.from_logs:
+        curve = collect_sweep(args.log_root, **limits)
+    else:
+        missing = [script for script in [PUBLISH_SCRIPT] + [APPROACH_SCRIPTS[a] for a in args.approaches]
+                   if not Path(script).exists()]
+        if missing:
+            print(f"Missing {', '.join(missing)}; run from the repository root after `npm run build`")
+            return
+        curve = pd.concat([sweep_approach(approach, args.rates, args.duration, args.data_root, args.log_root,
+                                          args.drain, **limits) for approach in args.approaches], ignore_index=True)
+    if curve.empty:
+        print(f"No sweep steps found under {args.log_root}")
+        return
+
+    pd.set_option('display.width', 200)
+    columns = ['approach', 'offered_hz', 'achieved_hz', 'processed_hz', 'rate_ratio', 'latency_p50_ms',
+               'latency_p95_ms', 'cpu_percent', 'heap_peak_mb', 'saturation']
+    print("\nCapacity curve:")
+    print(curve[columns].to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+    print("\nCapacity per approach:")
+    print(capacity_points(curve).to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+    curve.to_csv(args.output, index=False)
+    print(f"\nCapacity curve saved to: {args.output}")
+    plot_capacity_curve(curve, args.plot)
+    print(f"Capacity curve figure saved to: {args.plot}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from nt_stream import find_all_streams, read_stream
+from reference_windows import AGGREGATIONS, compute_reference, window_bounds
+
+# Base chunk granularity; every RANGE/STEP in whole seconds is made of whole chunks
+DEFAULT_CHUNK_MS = 1000
+SIDECAR_VERSION = 1
+SIDECAR_PATTERN = 'chunks_{chunk_ms}ms.npz'
+# Per-chunk aggregates; empty chunks have count 0, min +inf and max -inf
+CHUNK_FIELDS = ['count', 'sum', 'sumsq', 'min', 'max']
+# Aggregations answered from chunks: the reference ones plus the standard deviation from the sum of squares
+CHUNK_AGGREGATIONS = AGGREGATIONS + ['STDDEV']
+
+
+def sidecar_path(stream_file: Path, chunk_ms: int = DEFAULT_CHUNK_MS) -> Path:
+    """Sidecar of a stream, next to its ``data.nt``."""
+    return Path(stream_file).parent / SIDECAR_PATTERN.format(chunk_ms=chunk_ms)
+
+
+def build_chunks(timestamps: np.ndarray, values: np.ndarray, chunk_ms: int = DEFAULT_CHUNK_MS) -> Dict[str, np.ndarray]:
+    """
+    Aggregate a series into epoch-aligned ``[k * chunk_ms, (k + 1) * chunk_ms)`` chunks.
+
+    Chunks are dense from the first to the last observed one, so chunk ``i``
+    starts at ``(first_chunk + i) * chunk_ms`` and chunks of different streams
+    line up by index.
+
+    Returns:
+        Dict with first_chunk, first/last timestamp, chunk_ms and one array per ``CHUNK_FIELDS``
+    """
+    order = np.argsort(timestamps, kind='stable')
+    timestamps, values = np.asarray(timestamps)[order], np.asarray(values, dtype=np.float64)[order]
+    keep = np.isfinite(values)
+    timestamps, values = timestamps[keep], values[keep]
+    if len(timestamps) == 0:
+        return {'chunk_ms': chunk_ms, 'first_chunk': 0, 'first_timestamp': 0, 'last_timestamp': -1,
+                **{field: np.empty(0) for field in CHUNK_FIELDS}}
+
+    chunk_ids = timestamps // chunk_ms
+    first_chunk = int(chunk_ids[0])
+    slots = chunk_ids - first_chunk
+    size = int(slots[-1]) + 1
+    boundaries = np.flatnonzero(np.diff(slots, prepend=-1))
+    occupied = slots[boundaries]
+    chunks = {
+        'count': np.zeros(size), 'sum': np.zeros(size), 'sumsq': np.zeros(size),
+        'min': np.full(size, np.inf), 'max': np.full(size, -np.inf),
+    }
+    chunks['count'][occupied] = np.diff(np.append(boundaries, len(values)))
+    chunks['sum'][occupied] = np.add.reduceat(values, boundaries)
+    chunks['sumsq'][occupied] = np.add.reduceat(values * values, boundaries)
+    chunks['min'][occupied] = np.minimum.reduceat(values, boundaries)
+    chunks['max'][occupied] = np.maximum.reduceat(values, boundaries)
+    return {'chunk_ms': chunk_ms, 'first_chunk': first_chunk, 'first_timestamp': int(timestamps[0]),
+            'last_timestamp': int(timestamps[-1]), **chunks}
+
+
+def combine_chunks(parts: List[Dict]) -> Dict[str, np.ndarray]:
+    """Chunks of the union of several streams (same chunk_ms), as in a UNION query."""
+    parts = [part for part in parts if len(part['count'])]
+    if not parts:
+        return build_chunks(np.empty(0, dtype=np.int64), np.empty(0), DEFAULT_CHUNK_MS)
+    first = min(part['first_chunk'] for part in parts)
+    size = max(part['first_chunk'] + len(part['count']) for part in parts) - first
+    combined = {'count': np.zeros(size), 'sum': np.zeros(size), 'sumsq': np.zeros(size),
+                'min': np.full(size, np.inf), 'max': np.full(size, -np.inf)}
+    for part in parts:
+        span = slice(part['first_chunk'] - first, part['first_chunk'] - first + len(part['count']))
+        for field in ['count', 'sum', 'sumsq']:
+            combined[field][span] += part[field]
+        combined['min'][span] = np.minimum(combined['min'][span], part['min'])
+        combined['max'][span] = np.maximum(combined['max'][span], part['max'])
+    return {'chunk_ms': parts[0]['chunk_ms'], 'first_chunk': first,
+            'first_timestamp': min(part['first_timestamp'] for part in parts),
+            'last_timestamp': max(part['last_timestamp'] for part in parts), **combined}
+
+
+def write_sidecar(stream_file: Path, chunk_ms: int = DEFAULT_CHUNK_MS) -> Dict:
+    """Precompute the chunks of one stream and store them with its size and mtime."""
+    stream_file = Path(stream_file)
+    stat = stream_file.stat()
+    chunks = build_chunks(*read_stream(str(stream_file), sort=False), chunk_ms)
+    np.savez(sidecar_path(stream_file, chunk_ms), version=SIDECAR_VERSION, source_size=stat.st_size,
+             source_mtime_ns=stat.st_mtime_ns, **chunks)
+    return chunks
+
+
+def load_chunks(stream_file: Path, chunk_ms: int = DEFAULT_CHUNK_MS, build: bool = True) -> Optional[Dict]:
+    """
+    Chunks of one stream from its sidecar, rebuilt when the stream changed
+    since (or returned as None when ``build`` is off).
+    """
+    stream_file = Path(stream_file)
+    path = sidecar_path(stream_file, chunk_ms)
+    if path.exists():
+        with np.load(path) as sidecar:
+            stat = stream_file.stat()
+            if (int(sidecar['version']) == SIDECAR_VERSION and int(sidecar['source_size']) == stat.st_size
+                    and int(sidecar['source_mtime_ns']) == stat.st_mtime_ns):
+                return {'chunk_ms': int(sidecar['chunk_ms']), 'first_chunk': int(sidecar['first_chunk']),
+                        'first_timestamp': int(sidecar['first_timestamp']),
+                        'last_timestamp': int(sidecar['last_timestamp']),
+                        **{field: sidecar[field] for field in CHUNK_FIELDS}}
+    return write_sidecar(stream_file, chunk_ms) if build else None
+
+
+def range_extreme(values: np.ndarray, lo: np.ndarray, hi: np.ndarray, largest: bool = True) -> np.ndarray:
+    """
+    MAX (or MIN) of ``values[lo[w]:hi[w]]`` for every window from a sparse table.
+
+    Level ``k`` holds the extreme of every run of ``2**k`` chunks, built only
+    up to the widest window, so each window is two lookups into one level.
+    Empty ranges give -inf (MAX) or +inf (MIN).
+    """
+    reduce = np.maximum if largest else np.minimum
+    lengths = hi - lo
+    result = np.full(len(lo), -np.inf if largest else np.inf)
+    if not (lengths > 0).any():
+        return result
+    levels = [values]
+    while 2 ** len(levels) <= lengths.max():
+        half = 2 ** (len(levels) - 1)
+        levels.append(reduce(levels[-1][:-half], levels[-1][half:]))
+    nonempty = np.flatnonzero(lengths > 0)
+    level = np.floor(np.log2(lengths[nonempty])).astype(np.int64)
+    for k in np.unique(level):
+        windows = nonempty[level == k]
+        table = levels[k]
+        result[windows] = reduce(table[lo[windows]], table[hi[windows] - 2 ** k])
+    return result
+
+
+def chunk_windows(chunks: Dict, starts: np.ndarray, ends: np.ndarray,
+                  aggregations: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Aggregates of half-open ``[start, end)`` windows made of whole chunks,
+    without touching the raw values.
+
+    COUNT, SUM, AVG and STDDEV come from prefix sums over the chunks and MIN
+    and MAX from a sparse table over the chunk extremes, so after an
+    O(chunks log window) build every window costs O(1); never more than the
+    O(window / chunk) of combining its chunks one by one.
+
+    Returns:
+        DataFrame like ``reference_windows.aggregate_windows``
+    """
+    chunk_ms = chunks['chunk_ms']
+    starts, ends = np.asarray(starts, dtype=np.int64), np.asarray(ends, dtype=np.int64)
+    if (starts % chunk_ms).any() or (ends % chunk_ms).any():
+        raise ValueError(f"Window bounds must be multiples of the {chunk_ms} ms chunk")
+    aggregations = [a.upper() for a in (aggregations or AGGREGATIONS)]
+    size = len(chunks['count'])
+    lo = np.clip(starts // chunk_ms - chunks['first_chunk'], 0, size)
+    hi = np.clip(ends // chunk_ms - chunks['first_chunk'], 0, size)
+
+    def prefix(field):
+        totals = np.concatenate(([0.0], np.cumsum(chunks[field])))
+        return totals[hi] - totals[lo]
+
+    counts = prefix('count').astype(np.int64)
+    sums = prefix('sum')
+    result = {'window_start': starts, 'window_end': ends}
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for aggregation in aggregations:
+            if aggregation == 'COUNT':
+                result['count'] = counts
+            elif aggregation == 'SUM':
+                result['sum'] = sums
+            elif aggregation == 'AVG':
+                result['avg'] = np.where(counts > 0, sums / counts, np.nan)
+            elif aggregation == 'STDDEV':
+                mean = sums / counts
+                result['stddev'] = np.where(counts > 0, np.sqrt(np.maximum(prefix('sumsq') / counts - mean ** 2, 0)),
+                                            np.nan)
+            elif aggregation in ('MAX', 'MIN'):
+                extreme = range_extreme(chunks[aggregation.lower()], lo, hi, largest=aggregation == 'MAX')
+                result[aggregation.lower()] = np.where(counts > 0, extreme, np.nan)
+            else:
+                raise ValueError(f"Unsupported aggregation: {aggregation}")
+    return pd.DataFrame(result)
+
+
+def reference_from_chunks(filepaths: List[str], range_ms: int, step_ms: int,
+                          aggregations: Optional[List[str]] = None, complete_only: bool = False,
+                          chunk_ms: int = DEFAULT_CHUNK_MS) -> pd.DataFrame:
+    """
+    Exact aligned RANGE/STEP windows over the union of streams, answered from
+    their sidecars; matches ``reference_windows.compute_reference(..., align=True)``.
+    """
+    chunks = combine_chunks([load_chunks(Path(path), chunk_ms) for path in filepaths])
+    if chunks['last_timestamp'] < chunks['first_timestamp']:
+        return pd.DataFrame(columns=['window_start', 'window_end'] + [a.lower() for a in aggregations or AGGREGATIONS])
+    starts, ends = window_bounds(chunks['first_timestamp'], chunks['last_timestamp'], range_ms, step_ms,
+                                 align=True, complete_only=complete_only)
+    return chunk_windows(chunks, starts, ends, aggregations)
+
+
+def _build_job(job: Dict) -> Dict:
+    chunks = write_sidecar(Path(job['path']), job['chunk_ms'])
+    return {'path': job['path'], 'chunks': len(chunks['count']), 'observations': int(chunks['count'].sum())}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-chunk aggregate sidecars for instant window ground truth")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build = subparsers.add_parser("build", help="Write the chunk sidecar of every stream")
+    build.add_argument("--data-root", default="src/streamer/data", help="Root of the dataset families")
+    build.add_argument("--chunk-ms", type=int, default=DEFAULT_CHUNK_MS, help="Base chunk size")
+    build.add_argument("--workers", type=int, help="Process pool size")
+
+    reference = subparsers.add_parser("reference", help="Aligned RANGE/STEP windows answered from the sidecars")
+    reference.add_argument("files", nargs='+', help="data.nt streams, combined as in a UNION query")
+    reference.add_argument("--range", type=int, default=120000, help="Window RANGE in ms")
+    reference.add_argument("--step", type=int, default=60000, help="Window STEP in ms")
+    reference.add_argument("--aggregations", nargs='+', type=str.upper, choices=CHUNK_AGGREGATIONS,
+                           default=AGGREGATIONS, help="Aggregations to compute")
+    reference.add_argument("--complete-only", action='store_true', help="Skip windows that end after the data")
+    reference.add_argument("--chunk-ms", type=int, default=DEFAULT_CHUNK_MS, help="Base chunk size")
+    reference.add_argument("--verify", action='store_true', help="Compare against the raw reference computation")
+    reference.add_argument("--output", help="Optional CSV output path")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        jobs = [{'path': str(path), 'chunk_ms': args.chunk_ms} for path in find_all_streams(args.data_root)]
+        with ProcessPoolExecutor(max_workers=args.workers or os.cpu_count()) as executor:
+            built = pd.DataFrame(executor.map(_build_job, jobs, chunksize=4))
+        print(f"Wrote {len(built)} sidecars ({args.chunk_ms} ms chunks): "
+              f"{int(built['observations'].sum())} observations in {int(built['chunks'].sum())} chunks")
+        return
+
+    started = time.perf_counter()
+    windows = reference_from_chunks(args.files, args.range, args.step, args.aggregations, args.complete_only,
+                                    args.chunk_ms)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(windows.to_string(index=False))
+    print(f"\n{len(windows)} windows from chunks in {elapsed_ms:.1f} ms")
+    if args.verify:
+        from nt_stream import read_streams
+        raw = compute_reference(*read_streams(args.files), args.range, args.step,
+                                [a for a in args.aggregations if a.upper() in AGGREGATIONS], align=True,
+                                complete_only=args.complete_only)
+        columns = [column for column in raw.columns if column in windows.columns]
+        matches = np.allclose(raw[columns].to_numpy(dtype=float), windows[columns].to_numpy(dtype=float),
+                              rtol=1e-9, atol=1e-9, equal_nan=True)
+        print(f"Raw reference {'matches' if matches else 'DIFFERS'} ({len(raw)} windows)")
+    if args.output:
+        windows.to_csv(args.output, index=False)
+        print(f"Reference windows saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+
+import argparse
+import itertools
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from accuracy_metrics import score
+from approximation_simulator import (DEFAULT_INTERVAL_MS, DEFAULT_RANGE_MS, DEFAULT_STEP_MS, DEFAULT_SUB_RANGE_MS,
+                                     DEFAULT_SUB_STEP_MS, replay_clock, synthetic_streams, window_values)
+from chunk_aggregates import range_extreme
+from nt_stream import find_streams, read_stream
+from workload_generator import PATTERNS
+
+# Chunk sizes swept by default; 30000 is the operator's own GCD for the chunked orchestrator queries
+DEFAULT_CHUNK_SIZES = [1000, 5000, 10000, 15000, 30000, 60000]
+# One chunk result as RSPQueryProcess publishes it: a JSON-quoted aggregation_event triple
+CHUNK_EVENT = ('"<https://rsp.js/aggregation_event/{uuid}> <https://saref.etsi.org/core/hasValue> '
+               '\\"{value}\\"^^<http://www.w3.org/2001/XMLSchema#float> ."')
+CHUNK_EVENT_BYTES = len(CHUNK_EVENT.format(uuid='0' * 36, value='0' * 18))
+# Results match when within floating-point noise of the exact aggregate
+EXACT_TOLERANCE = 1e-9
+# A chunk size is as accurate as the best one when its MAE is at most this much (relative) higher
+DEFAULT_MAE_SLACK = 0.05
+SWEEP_COLUMNS = ['pattern', 'aggregation', 'chunk_ms', 'gcd_chunk_ms', 'range_ms', 'step_ms', 'windows',
+                 'chunk_messages_per_s', 'buffered_mean', 'buffered_max', 'state_bytes_max', 'merged_mean',
+                 'merged_max', 'coverage_lag_ms', 'exact_fraction', 'mae', 'mape', 'max_error']
+
+
+def operator_chunk_ms(windows: Sequence[int]) -> int:
+    """The chunk size the operator picks: GCD of every sub-query and output query width and slide."""
+    return math.gcd(*[int(w) for w in windows])
+
+
+def chunk_results(timestamps: np.ndarray, values: np.ndarray, chunk_ms: int, aggregation: str,
+                  latency_ms: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Results of one sub-query rewritten to ``[RANGE chunk STEP chunk]``.
+
+    Every non-empty epoch-aligned chunk ``[close - chunk, close)`` is
+    aggregated and emitted by the first event at or after its close, arriving
+    ``latency_ms`` later.
+
+    Returns:
+        Tuple of (chunk close, arrival time, chunk aggregate) per emitted chunk
+    """
+    if len(timestamps) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0)
+    closes = (timestamps[0] // chunk_ms + 1 + np.arange((timestamps[-1] - timestamps[0]) // chunk_ms + 1)) * chunk_ms
+    closes = closes[closes <= timestamps[-1]]
+    results, counts = window_values(timestamps, values, closes - chunk_ms, closes, aggregation)
+    emitted = counts > 0
+    arrivals = timestamps[np.searchsorted(timestamps, closes[emitted], side='left')] + latency_ms
+    return closes[emitted], arrivals, results[emitted]
+
+
+def simulate_chunks(streams: Sequence[Tuple[np.ndarray, np.ndarray]], chunk_ms: int, aggregation: str = 'AVG',
+                    range_ms: int = DEFAULT_RANGE_MS, step_ms: int = DEFAULT_STEP_MS,
+                    latency_ms: int = 0) -> pd.DataFrame:
+    """
+    Replay the chunk-merge semantics of ``StreamingQueryChunkAggregatorOperator``.
+
+    Each stream feeds one chunked sub-query. Every ``step_ms`` after the
+    first event the operator keeps the chunk results that arrived in
+    ``[now - range, now]``, drops older ones, and applies ``aggregation`` to
+    all kept chunk values together: exact for SUM/MIN/MAX, an unweighted mean
+    of chunk means for AVG, and a count of chunks for COUNT. Every evaluation
+    is compared with the exact aggregate of the union of the streams over
+    the same window.
+
+    Returns:
+        DataFrame per evaluation with the window, buffered and merged chunk
+        counts, how far the newest merged chunk ends before ``now``, the
+        merged result and the exact reference
+    """
+    aggregation = aggregation.upper()
+    chunks = [chunk_results(t, v, chunk_ms, aggregation, latency_ms) for t, v in streams]
+    closes = np.concatenate([c for c, _, _ in chunks])
+    arrivals = np.concatenate([a for _, a, _ in chunks])
+    values = np.concatenate([v for _, _, v in chunks])
+    order = np.argsort(arrivals, kind='stable')
+    closes, arrivals, values = closes[order], arrivals[order], values[order]
+
+    timestamps = np.concatenate([t for t, _ in streams])
+    union = np.concatenate([v for _, v in streams])
+    by_time = np.argsort(timestamps, kind='stable')
+    timestamps, union = timestamps[by_time], union[by_time]
+    columns = ['window_start', 'window_end', 'buffered', 'merged', 'coverage_lag_ms', 'value', 'reference']
+    if len(timestamps) == 0:
+        return pd.DataFrame(columns=columns)
+
+    # setInterval ticks from the operator start until the data has been replayed
+    nows = timestamps[0] + step_ms * np.arange(1, (timestamps[-1] - timestamps[0]) // step_ms + 1)
+    lo = np.searchsorted(arrivals, nows - range_ms, side='left')
+    hi = np.searchsorted(arrivals, nows, side='right')
+    # Before a tick cleans up, the buffers still hold everything kept by the previous tick
+    kept_from = np.concatenate(([0], lo[:-1]))
+    merged = hi - lo
+
+    if aggregation in ('MAX', 'MIN'):
+        result = range_extreme(values, lo, hi, largest=aggregation == 'MAX')
+    elif aggregation == 'COUNT':
+        result = merged.astype(float)
+    else:
+        prefix = np.concatenate(([0.0], np.cumsum(values)))
+        result = prefix[hi] - prefix[lo]
+        if aggregation == 'AVG':
+            result = result / np.maximum(merged, 1)
+    newest = range_extreme(closes.astype(float), lo, hi, largest=True)
+    reference, _ = window_values(timestamps, union, nows - range_ms, nows + 1, aggregation)
+
+    windows = pd.DataFrame({'window_start': nows - range_ms, 'window_end': nows, 'buffered': hi - kept_from,
+                            'merged': merged, 'coverage_lag_ms': nows - newest, 'value': result,
+                            'reference': reference})
+    # The operator publishes nothing for a window without chunks
+    return windows[merged > 0].reset_index(drop=True)
+
+
+@lru_cache(maxsize=8)
+def _pattern_streams(pattern: str, noise: float, seed: int, streams: int,
+                     interval_ms: int) -> Tuple[Tuple[np.ndarray, np.ndarray], ...]:
+    if pattern in PATTERNS:
+        return tuple(synthetic_streams(pattern, noise, seed, interval_ms=interval_ms, streams=streams))
+    # Dataset streams are windowed on the publish times the replayer stamps them with
+    return tuple(replay_clock([read_stream(str(path)) for path in find_streams(pattern)], interval_ms))
+
+
+def simulate_configuration(job: Dict) -> Dict:
+    """Simulate one chunk size and window and summarize it (process pool worker)."""
+    streams = _pattern_streams(job['pattern'], job['noise'], job['seed'], job['streams'], job['interval_ms'])
+    windows = simulate_chunks(streams, job['chunk_ms'], job['aggregation'], job['range_ms'], job['step_ms'],
+                              job['latency_ms'])
+    truth, value = windows['reference'].to_numpy(dtype=float), windows['value'].to_numpy(dtype=float)
+    metrics = score(truth, value, axis=None) if len(windows) else dict.fromkeys(['mae', 'mape', 'max_error'], np.nan)
+    exact = np.abs(value - truth) <= EXACT_TOLERANCE * np.maximum(np.abs(truth), 1.0)
+    duration_s = max(max(int(t[-1] - t[0]) for t, _ in streams if len(t)), 1) / 1000
+    messages = sum(len(chunk_results(t, v, job['chunk_ms'], job['aggregation'])[0]) for t, v in streams)
+    return {
+        'pattern': job['pattern'],
+        'aggregation': job['aggregation'],
+        'chunk_ms': job['chunk_ms'],
+        'gcd_chunk_ms': job['gcd_chunk_ms'],
+        'range_ms': job['range_ms'],
+        'step_ms': job['step_ms'],
+        'windows': len(windows),
+        'chunk_messages_per_s': messages / duration_s,
+        'buffered_mean': float(windows['buffered'].mean()) if len(windows) else np.nan,
+        'buffered_max': int(windows['buffered'].max()) if len(windows) else 0,
+        'state_bytes_max': int(windows['buffered'].max()) * CHUNK_EVENT_BYTES if len(windows) else 0,
+        'merged_mean': float(windows['merged'].mean()) if len(windows) else np.nan,
+        'merged_max': int(windows['merged'].max()) if len(windows) else 0,
+        'coverage_lag_ms': float(windows['coverage_lag_ms'].mean()) if len(windows) else np.nan,
+        'exact_fraction': float(exact.mean()) if len(windows) else np.nan,
+        'mae': float(metrics['mae']),
+        'mape': float(metrics['mape']),
+        'max_error': float(metrics['max_error']),
+    }
+
+
+def sweep_chunks(patterns: List[str], chunk_sizes: List[int], ranges: List[int], steps: List[int],
+                 aggregations: List[str], sub_range_ms: int = DEFAULT_SUB_RANGE_MS,
+                 sub_step_ms: int = DEFAULT_SUB_STEP_MS, noise: float = 0.02, seed: int = 0, streams: int = 2,
+                 latency_ms: int = 0, interval_ms: int = DEFAULT_INTERVAL_MS,
+                 workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    State size, merge work and correctness of every chunk size for every
+    output window, pattern and aggregation, simulated in parallel.
+
+    Returns:
+        DataFrame with one row of ``SWEEP_COLUMNS`` per configuration
+    """
+    jobs = [{'pattern': pattern, 'noise': noise, 'seed': seed, 'streams': streams, 'aggregation': aggregation.upper(),
+             'chunk_ms': chunk_ms, 'range_ms': range_ms, 'step_ms': step_ms, 'latency_ms': latency_ms,
+             'interval_ms': interval_ms,
+             'gcd_chunk_ms': operator_chunk_ms([sub_range_ms, sub_step_ms, range_ms, step_ms])}
+            for pattern, aggregation, range_ms, step_ms, chunk_ms
+            in itertools.product(patterns, aggregations, ranges, steps, chunk_sizes)
+            if step_ms <= range_ms]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        return pd.DataFrame(executor.map(simulate_configuration, jobs, chunksize=4), columns=SWEEP_COLUMNS)
+
+
+def best_chunks(sweep: pd.DataFrame, mae_slack: float = DEFAULT_MAE_SLACK) -> pd.DataFrame:
+    """
+    Per pattern, aggregation and window: the largest chunk (least buffered
+    state and merge work) whose MAE is within ``mae_slack`` of the lowest MAE.
+    """
+    keys = ['pattern', 'aggregation', 'range_ms', 'step_ms']
+    lowest = sweep.groupby(keys)['mae'].transform('min')
+    close = sweep[sweep['mae'] <= lowest + mae_slack * lowest.abs() + EXACT_TOLERANCE]
+    best = close.sort_values('chunk_ms').groupby(keys, sort=False).tail(1).sort_values(keys)
+    return best[keys + ['chunk_ms', 'gcd_chunk_ms', 'mae', 'exact_fraction', 'buffered_max', 'merged_mean',
+                        'coverage_lag_ms']]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chunk-size what-if simulation of the chunked aggregator operator")
+    parser.add_argument("--patterns", nargs='+', default=list(PATTERNS),
+                        help=f"Pattern names ({', '.join(PATTERNS)}) or dataset directories")
+    parser.add_argument("--chunk-ms", type=int, nargs='+', default=DEFAULT_CHUNK_SIZES, help="Chunk sizes to try")
+    parser.add_argument("--range", type=int, nargs='+', default=[DEFAULT_RANGE_MS], help="Output query RANGE(s) in ms")
+    parser.add_argument("--step", type=int, nargs='+', default=[DEFAULT_STEP_MS], help="Output query STEP(s) in ms")
+    parser.add_argument("--sub-range", type=int, default=DEFAULT_SUB_RANGE_MS, help="Original sub-query RANGE in ms")
+    parser.add_argument("--sub-step", type=int, default=DEFAULT_SUB_STEP_MS, help="Original sub-query STEP in ms")
+    parser.add_argument("--aggregations", nargs='+', type=str.upper, default=['AVG', 'MAX', 'SUM', 'COUNT'],
+                        help="Aggregations")
+    parser.add_argument("--noise", type=float, default=0.02, help="Relative noise of the synthetic noisy streams")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic streams")
+    parser.add_argument("--streams", type=int, default=2, help="Synthetic streams (sub-queries)")
+    parser.add_argument("--latency-ms", type=int, default=0, help="Delay of chunk results reaching the operator")
+    parser.add_argument("--interval-ms", type=int, default=DEFAULT_INTERVAL_MS,
+                        help="Replay interval (1000 / REPLAY_FREQUENCY) of synthetic and dataset streams")
+    parser.add_argument("--mae-slack", type=float, default=DEFAULT_MAE_SLACK,
+                        help="Relative MAE above the best chunk size still counted as accurate")
+    parser.add_argument("--workers", type=int, help="Process pool size")
+    parser.add_argument("--output", help="Optional CSV output path")
+    args = parser.parse_args()
+
+    unknown = [pattern for pattern in args.patterns if pattern not in PATTERNS and not find_streams(pattern)]
+    if unknown:
+        parser.error(f"not a pattern or a dataset directory with streams: {', '.join(unknown)}")
+    started = time.perf_counter()
+    sweep = sweep_chunks(args.patterns, args.chunk_ms, args.range, args.step, args.aggregations, args.sub_range,
+                         args.sub_step, args.noise, args.seed, args.streams, args.latency_ms, args.interval_ms,
+                         args.workers)
+    elapsed = time.perf_counter() - started
+    print(sweep.to_string(index=False))
+    print(f"\nSimulated {len(sweep)} configurations in {elapsed:.1f} s")
+    best = best_chunks(sweep, args.mae_slack)
+    if not best.empty:
+        print(f"\nLargest chunk within {args.mae_slack:.0%} of the lowest MAE per window:")
+        print(best.to_string(index=False))
+    if args.output:
+        sweep.to_csv(args.output, index=False)
+        print(f"Sweep saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
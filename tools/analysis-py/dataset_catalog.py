@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+
+import argparse
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from nt_stream import find_all_streams, read_observations
+
+CATALOG_FILE = '.dataset_catalog.json'
+CATALOG_VERSION = 1
+# Family of the streams stored directly under the data root (the original recordings)
+ROOT_FAMILY = 'original'
+HASH_CHUNK_BYTES = 1 << 20
+
+# ``<name>_<number>`` parameters in dataset directory names, e.g. ``exponential_growth_rate_0.1``
+_PARAMETER_PATTERN = re.compile(r'(?:^|_)([a-z]+)_(-?\d+(?:\.\d+)?)(?=_|$)')
+
+STAT_FIELDS = ['rows', 'start_ms', 'end_ms', 'duration_s', 'interval_ms', 'value_min', 'value_max',
+               'value_mean', 'value_std', 'sorted', 'duplicate_timestamps']
+
+
+def parse_dataset_name(dataset: str) -> Tuple[str, Dict[str, float]]:
+    """
+    Split a dataset directory name into its pattern and numeric parameters.
+
+    ``exponential_growth_rate_0.1`` -> ('exponential_growth', {'rate': 0.1}),
+    ``noise_0.5`` -> ('', {'noise': 0.5}).
+    """
+    name = dataset.rsplit('/', 1)[-1]
+    parameters = {key: float(value) for key, value in _PARAMETER_PATTERN.findall(name)}
+    pattern = _PARAMETER_PATTERN.sub('', name).strip('_')
+    return pattern, parameters
+
+
+def _lookup_key(family: str, parameters: Dict[str, float], pattern: Optional[str] = None) -> Tuple:
+    key = (family, tuple(sorted((name, float(value)) for name, value in parameters.items())))
+    return key if pattern is None else key + (pattern,)
+
+
+def file_hash(filepath: Path) -> str:
+    """SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def stream_stats(filepath: str) -> Dict:
+    """
+    Shape of one ``data.nt`` stream: row count, time range, value statistics
+    and whether the observations are in timestamp order in the file.
+    """
+    observations = read_observations(filepath)
+    timestamps = observations['timestamp'].to_numpy()
+    values = observations['value'].to_numpy(dtype=np.float64)
+    if len(timestamps) == 0:
+        return {field: None for field in STAT_FIELDS} | {'rows': 0, 'sorted': True, 'duplicate_timestamps': 0}
+    steps = np.diff(timestamps)
+    ordered = np.sort(timestamps)
+    finite = values[np.isfinite(values)]
+    return {
+        'rows': int(len(timestamps)),
+        'start_ms': int(ordered[0]),
+        'end_ms': int(ordered[-1]),
+        'duration_s': float(ordered[-1] - ordered[0]) / 1000,
+        'interval_ms': float(np.median(np.diff(ordered))) if len(ordered) > 1 else None,
+        'value_min': float(finite.min()) if len(finite) else None,
+        'value_max': float(finite.max()) if len(finite) else None,
+        'value_mean': float(finite.mean()) if len(finite) else None,
+        'value_std': float(finite.std()) if len(finite) else None,
+        'sorted': bool((steps >= 0).all()),
+        'duplicate_timestamps': int(len(ordered) - len(np.unique(ordered))),
+    }
+
+
+def _scan_stream(job: Dict) -> Dict:
+    """Hash one stream and only re-parse it when its content changed."""
+    digest = file_hash(Path(job['path']))
+    previous = job.get('previous')
+    if previous and previous.get('sha256') == digest:
+        stats = {field: previous.get(field) for field in STAT_FIELDS}
+    else:
+        stats = stream_stats(job['path'])
+    return {**job['entry'], 'sha256': digest, **stats}
+
+
+class DatasetCatalog:
+    """
+    On-disk index of every ``data.nt`` (or compact ``data.ntc``) stream under a data root.
+
+    Entries are keyed by the stream path relative to the data root and hold
+    the family, dataset, parsed parameters, file size, mtime, hash and
+    ``STAT_FIELDS``. Lookups by family and parameters go through an in-memory
+    dict built on load.
+    """
+
+    def __init__(self, data_root: str = 'src/streamer/data', index_path: Optional[str] = None):
+        self.data_root = Path(data_root)
+        self.index_path = Path(index_path) if index_path else self.data_root / CATALOG_FILE
+        self.streams: Dict[str, Dict] = {}
+        self._by_parameters: Dict[Tuple, List[str]] = {}
+        self._by_family: Dict[str, List[str]] = {}
+        if self.index_path.exists():
+            index = json.loads(self.index_path.read_text())
+            if index.get('version') == CATALOG_VERSION:
+                self.streams = index['streams']
+        self._build_lookups()
+
+    def _build_lookups(self):
+        self._by_parameters, self._by_family = {}, {}
+        for key, entry in sorted(self.streams.items()):
+            for lookup in (_lookup_key(entry['family'], entry['parameters']),
+                           _lookup_key(entry['family'], entry['parameters'], entry['pattern'])):
+                self._by_parameters.setdefault(lookup, []).append(key)
+            self._by_family.setdefault(entry['family'], []).append(key)
+
+    def _describe(self, stream_file: Path) -> Dict:
+        dataset_dir = stream_file.parent.parent
+        relative = dataset_dir.relative_to(self.data_root).parts
+        family = relative[0] if relative else ROOT_FAMILY
+        dataset = '/'.join(relative[1:]) if relative else ''
+        pattern, parameters = parse_dataset_name(dataset)
+        stat = stream_file.stat()
+        return {
+            'family': family,
+            'dataset': dataset,
+            'pattern': pattern,
+            'parameters': parameters,
+            'stream': stream_file.parent.name,
+            # DATA_PATH value publish.ts takes to replay this dataset
+            'data_path': '/'.join(relative),
+            'path': stream_file.relative_to(self.data_root).as_posix(),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+        }
+
+    def scan(self, workers: Optional[int] = None, force: bool = False) -> Dict[str, int]:
+        """
+        Bring the index up to date with the data root.
+
+        Files whose size and mtime are unchanged are skipped; changed files are
+        hashed and only re-parsed when their hash differs. Deleted streams are
+        dropped.
+
+        Returns:
+            Counts of unchanged, rehashed (touched only), parsed and removed streams
+        """
+        jobs, current = [], {}
+        counts = {'unchanged': 0, 'rehashed': 0, 'parsed': 0, 'removed': 0}
+        for stream_file in find_all_streams(self.data_root):
+            entry = self._describe(stream_file)
+            key = entry['path']
+            previous = None if force else self.streams.get(key)
+            if previous and previous['size'] == entry['size'] and previous['mtime_ns'] == entry['mtime_ns']:
+                current[key] = {**previous, **entry}
+                counts['unchanged'] += 1
+            else:
+                jobs.append({'path': str(stream_file), 'entry': entry, 'previous': previous})
+
+        if jobs:
+            with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+                for job, result in zip(jobs, executor.map(_scan_stream, jobs, chunksize=4)):
+                    reused = job['previous'] and job['previous'].get('sha256') == result['sha256']
+                    counts['rehashed' if reused else 'parsed'] += 1
+                    current[result['path']] = result
+
+        counts['removed'] = len(set(self.streams) - set(current))
+        self.streams = dict(sorted(current.items()))
+        self._build_lookups()
+        self.save()
+        return counts
+
+    def save(self):
+        self.index_path.write_text(json.dumps({'version': CATALOG_VERSION, 'streams': self.streams}, indent=1))
+
+    def lookup(self, family: str, pattern: Optional[str] = None, stream: Optional[str] = None,
+               **parameters) -> List[Dict]:
+        """
+        Streams of the dataset with exactly these parameters, e.g.
+        ``lookup('rate_comparison', 'exponential_growth', rate=0.1)`` or
+        ``lookup('noisy_datasets', noise=0.5, stream='wearable.acceleration.x')``.
+        """
+        keys = self._by_parameters.get(_lookup_key(family, parameters, pattern), [])
+        return [self.streams[key] for key in keys if stream is None or self.streams[key]['stream'] == stream]
+
+    def family(self, family: str) -> List[Dict]:
+        """All streams of one dataset family."""
+        return [self.streams[key] for key in self._by_family.get(family, [])]
+
+    def families(self) -> List[str]:
+        return sorted(self._by_family)
+
+    def resolve(self, entry: Dict) -> Path:
+        """Path of a catalog entry's stream file on this machine."""
+        return self.data_root / entry['path']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index every data.nt stream under the data root")
+    parser.add_argument("--data-root", default="src/streamer/data", help="Root of the dataset families")
+    parser.add_argument("--index", help=f"Index file (default: <data-root>/{CATALOG_FILE})")
+    parser.add_argument("--force", action='store_true', help="Re-parse every stream")
+    parser.add_argument("--workers", type=int, help="Process pool size")
+    parser.add_argument("--family", help="Only list this family")
+    args = parser.parse_args()
+
+    catalog = DatasetCatalog(args.data_root, args.index)
+    counts = catalog.scan(args.workers, args.force)
+    print(f"Scanned {len(catalog.streams)} streams: " + ", ".join(f"{v} {k}" for k, v in counts.items()))
+
+    for family in [args.family] if args.family else catalog.families():
+        entries = catalog.family(family)
+        print(f"\n{family} ({len(entries)} streams)")
+        for entry in entries:
+            flags = '' if entry['sorted'] else '  [unsorted]'
+            duration = f"{entry['duration_s']:.1f}s" if entry['duration_s'] is not None else '-'
+            print(f"  {entry['data_path'] or '.':<50} {entry['stream']:<28} {entry['rows']:>7} rows  {duration:>9}{flags}")
+    print(f"\nCatalog saved to: {catalog.index_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+
+import argparse
+import time
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+# Points kept per plotted line; above the pixel width of any report figure
+DEFAULT_POINTS = 4000
+
+METHODS = ['minmax', 'lttb']
+
+
+def _finite(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    return np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+
+
+def minmax_indices(x: np.ndarray, y: np.ndarray, n_out: int = DEFAULT_POINTS) -> np.ndarray:
+    """
+    Indices of the first, last, minimum and maximum sample of each x bucket.
+
+    Buckets split the x range into ``n_out // 4`` equal spans (one per pixel
+    column), so every spike and every GC drop survives: a line through the
+    kept points rasterizes the same as one through all points.
+    """
+    valid = _finite(x, y)
+    if len(valid) <= n_out:
+        return valid
+    xs, ys = x[valid], y[valid]
+    n_buckets = max(n_out // 4, 1)
+    span = xs[-1] - xs[0]
+    if span <= 0:
+        buckets = np.minimum(np.arange(len(xs)) * n_buckets // len(xs), n_buckets - 1)
+    else:
+        buckets = np.minimum(((xs - xs[0]) / span * n_buckets).astype(np.int64), n_buckets - 1)
+
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(xs)] - 1
+    group = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(xs)]))
+    maxima = np.maximum.reduceat(ys, starts)
+    minima = np.minimum.reduceat(ys, starts)
+    # First position per bucket hitting the bucket maximum / minimum
+    extremes = [starts, ends]
+    for target in (maxima, minima):
+        hits = np.flatnonzero(ys == target[group])
+        _, first = np.unique(group[hits], return_index=True)
+        extremes.append(hits[first])
+
+    kept = np.unique(np.concatenate(extremes))
+    return valid[kept]
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int = DEFAULT_POINTS) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets selection of ``n_out`` samples.
+
+    Each bucket keeps the point forming the largest triangle with the point
+    kept from the previous bucket and the mean of the next bucket. The
+    triangle areas of a bucket are computed as one vector operation.
+    """
+    valid = _finite(x, y)
+    if len(valid) <= n_out or n_out < 3:
+        return valid
+    xs, ys = x[valid].astype(np.float64), y[valid].astype(np.float64)
+    edges = np.linspace(1, len(xs) - 1, n_out - 1).astype(np.int64)
+    prefix_x = np.concatenate(([0.0], np.cumsum(xs)))
+    prefix_y = np.concatenate(([0.0], np.cumsum(ys)))
+
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, len(xs) - 1
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        next_lo, next_hi = hi, edges[b + 2] if b + 2 < len(edges) else len(xs)
+        count = next_hi - next_lo
+        mean_x = (prefix_x[next_hi] - prefix_x[next_lo]) / count
+        mean_y = (prefix_y[next_hi] - prefix_y[next_lo]) / count
+        ax, ay = xs[kept[b]], ys[kept[b]]
+        areas = np.abs((ax - mean_x) * (ys[lo:hi] - ay) - (ax - xs[lo:hi]) * (mean_y - ay))
+        kept[b + 1] = lo + int(np.argmax(areas))
+    return valid[kept]
+
+
+def downsample(x, y, n_out: int = DEFAULT_POINTS, method: str = 'minmax'):
+    """
+    Reduce a time series to about ``n_out`` points before plotting.
+
+    Args:
+        x: Sample times (non-decreasing)
+        y: Sample values; NaNs are dropped
+        n_out: Maximum points to keep
+        method: ``minmax`` (keeps every extreme) or ``lttb`` (keeps the visual shape)
+
+    Returns:
+        Tuple of downsampled (x, y) arrays
+    """
+    x, y = np.asarray(x), np.asarray(y)
+    if method == 'minmax':
+        kept = minmax_indices(x, y, n_out)
+    elif method == 'lttb':
+        kept = lttb_indices(x, y, n_out)
+    else:
+        raise ValueError(f"Unknown downsampling method: {method}")
+    return x[kept], y[kept]
+
+
+def downsample_frame(frame: pd.DataFrame, x_column: str, y_columns: List[str],
+                     n_out: int = DEFAULT_POINTS, method: str = 'minmax') -> pd.DataFrame:
+    """Keep the rows selected for any of ``y_columns``, so each column keeps its own extremes."""
+    x = frame[x_column].to_numpy()
+    selector = minmax_indices if method == 'minmax' else lttb_indices
+    kept = np.unique(np.concatenate([selector(x, frame[column].to_numpy(dtype=np.float64), n_out)
+                                     for column in y_columns]))
+    return frame.iloc[kept]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shape-preserving downsampling of resource time series")
+    parser.add_argument("csv", help="Resource usage CSV")
+    parser.add_argument("--x-column", default="timestamp", help="Time column")
+    parser.add_argument("--columns", nargs='+', default=['heapUsedMB', 'rss', 'cpu_user'], help="Series to keep")
+    parser.add_argument("--points", type=int, default=DEFAULT_POINTS, help="Points kept per series")
+    parser.add_argument("--method", choices=METHODS, default='minmax', help="Downsampling method")
+    parser.add_argument("--output", help="Optional CSV output path")
+    args = parser.parse_args()
+
+    frame = pd.read_csv(args.csv)
+    start = time.time()
+    reduced = downsample_frame(frame, args.x_column, args.columns, args.points, args.method)
+    elapsed = (time.time() - start) * 1000
+    print(f"Downsampled {len(frame)} rows to {len(reduced)} ({args.method}) in {elapsed:.1f} ms")
+    for column in args.columns:
+        print(f"  {column}: max {frame[column].max()} -> {reduced[column].max()}, "
+              f"min {frame[column].min()} -> {reduced[column].min()}")
+    if args.output:
+        reduced.to_csv(args.output, index=False)
+        print(f"Downsampled series saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from accuracy_metrics import score_frame
+from experiment_logs import RUN_KEYS, discover_runs, read_message_log, run_log_paths
+from latency_engine import extract_outputs, read_publishes
+from nt_stream import find_all_streams, find_streams, read_stream
+from reference_windows import aggregate_windows
+from window_results_store import from_matrix_windows, write_store
+
+DATASET_FAMILIES = ['approximation_test', 'rate_comparison', 'frequency_comparison', 'noisy_datasets']
+
+# Registered query used by the orchestrators: [RANGE 120000 STEP 60000], with the aggregation each one registers
+DEFAULT_RANGE_MS = 120000
+APPROACH_AGGREGATIONS = {'approximation': 'MAX', 'fetching': 'MAX', 'chunked': 'AVG'}
+DEFAULT_AGGREGATION = 'MAX'  # Cells of unknown approaches (or without runs)
+
+WINDOW_COLUMNS = ['family', 'dataset', 'approach', 'iteration', 'window_index',
+                  'window_start', 'window_end', 'value', 'reference', 'error']
+
+
+def discover_datasets(data_root: str, families: List[str] = DATASET_FAMILIES) -> pd.DataFrame:
+    """
+    List every dataset directory (one holding ``<stream>/data.nt`` files) per family.
+
+    Returns:
+        DataFrame with family, dataset (path relative to the family) and path
+    """
+    rows = []
+    for family in families:
+        family_dir = Path(data_root) / family
+        if not family_dir.is_dir():
+            continue
+        dataset_dirs = sorted({stream.parent.parent for stream in find_all_streams(family_dir)})
+        for dataset_dir in dataset_dirs:
+            rows.append({
+                'family': family,
+                'dataset': dataset_dir.relative_to(family_dir).as_posix(),
+                'path': str(dataset_dir),
+            })
+    return pd.DataFrame(rows, columns=['family', 'dataset', 'path'])
+
+
+def dataset_aliases(dataset: str) -> List[str]:
+    """Names the experiment runners use for a dataset in their log directories."""
+    return [dataset, dataset.replace('/', '_'), dataset.rsplit('/', 1)[-1]]
+
+
+def match_runs(datasets: pd.DataFrame, runs: pd.DataFrame) -> pd.DataFrame:
+    """Pair every dataset with the log runs recorded for it (if any)."""
+    alias_rows = [{'family': row.family, 'dataset': row.dataset, 'alias': alias}
+                  for row in datasets.itertuples() for alias in dataset_aliases(row.dataset)]
+    aliases = pd.DataFrame(alias_rows, columns=['family', 'dataset', 'alias']).drop_duplicates()
+    runs = runs.rename(columns={'dataset': 'alias', 'path': 'run_path'})
+    matched = aliases.merge(runs, on='alias', how='inner').drop(columns='alias')
+    matched = matched.drop_duplicates(subset=['family', 'dataset', 'approach', 'iteration'])
+    return datasets.merge(matched, on=['family', 'dataset'], how='left')
+
+
+def approach_aggregation(approach: str, override: Optional[str] = None) -> str:
+    """Aggregation an approach's results are scored against: ``override`` or the one its orchestrator registers."""
+    return (override or APPROACH_AGGREGATIONS.get(approach, DEFAULT_AGGREGATION)).upper()
+
+
+def replay_series(dataset_path: str, replay: Optional[pd.DataFrame]):
+    """
+    Combine the dataset streams on the replay time axis.
+
+    The i-th logged publish of a replayer stream carries the i-th observation
+    of the stream in replay order: timestamp order by default, file order
+    under ``REPLAY_ORDER=file``. A file-order replay is recognised by its
+    logged timestamps being the file's event timestamps shifted by one
+    constant. Without replay information the original timestamps are used.
+    """
+    timestamps, values = [], []
+    for stream_file in find_streams(dataset_path):
+        file_timestamps, file_values = read_stream(stream_file, sort=False)
+        order = np.argsort(file_timestamps, kind='stable')
+        stream_timestamps, stream_values = file_timestamps[order], file_values[order]
+        device = stream_file.parent.name.split('.')[0].lower()
+        if replay is not None and not replay.empty:
+            published = replay[replay['stream'].str.lower().str.startswith(device)]['event_ms'].to_numpy()
+            if len(published):
+                count = min(len(published), len(stream_values))
+                shift = published[:count] - file_timestamps[:count]
+                in_file_order = (shift == shift[0]).all()
+                stream_timestamps = published[:count]
+                stream_values = file_values[:count] if in_file_order else stream_values[:count]
+        timestamps.append(stream_timestamps)
+        values.append(stream_values)
+    timestamps = np.concatenate(timestamps)
+    values = np.concatenate(values)
+    order = np.argsort(timestamps, kind='stable')
+    return timestamps[order], values[order]
+
+
+def evaluate_cell(cell: Dict) -> Dict:
+    """
+    Reference windows and per-window errors for one (dataset, approach, iteration) cell.
+
+    Every emitted window ``[end - range, end]`` is recomputed exactly over
+    the observations that had been published in it.
+    """
+    key = {k: cell[k] for k in ['family', 'dataset', 'approach', 'iteration']}
+    info = {**key, 'aggregation': cell['aggregation']}
+    if not isinstance(cell.get('run_path'), str):
+        return {**info, 'status': 'no logs', 'windows': pd.DataFrame(columns=WINDOW_COLUMNS)}
+
+    paths = run_log_paths(Path(cell['run_path']), cell['approach'])
+    if not paths['messages'].exists():
+        return {**info, 'status': 'no approach log', 'windows': pd.DataFrame(columns=WINDOW_COLUMNS)}
+    outputs = extract_outputs(read_message_log(paths['messages']), cell['approach'])
+    if outputs.empty:
+        return {**info, 'status': 'no results', 'windows': pd.DataFrame(columns=WINDOW_COLUMNS)}
+
+    # Results carry live emit times, so without the replayed timestamps no reference window lines up with them
+    if not paths['replayer'].exists():
+        return {**info, 'status': 'unscorable: no replay log', 'windows': pd.DataFrame(columns=WINDOW_COLUMNS)}
+    replay = read_publishes(read_message_log(paths['replayer']))
+    if replay.empty:
+        return {**info, 'status': 'unscorable: no publishes in replay log',
+                'windows': pd.DataFrame(columns=WINDOW_COLUMNS)}
+    timestamps, values = replay_series(cell['path'], replay)
+
+    outputs = outputs.sort_values('window_end').reset_index(drop=True)
+    ends = outputs['window_end'].to_numpy() + 1  # The operator window includes its end
+    starts = ends - 1 - cell['range_ms']
+    reference = aggregate_windows(timestamps, values, starts, ends, [cell['aggregation']])
+    windows = pd.DataFrame({
+        **key,
+        'window_index': np.arange(len(outputs)),
+        'window_start': starts,
+        'window_end': ends - 1,
+        'value': outputs['value'].to_numpy(),
+        'reference': reference[cell['aggregation'].lower()].to_numpy(),
+    })
+    windows['error'] = windows['value'] - windows['reference']
+    return {**info, 'status': 'ok', 'windows': windows}
+
+
+def evaluate_matrix(data_root: str, log_root: str, families: List[str] = DATASET_FAMILIES,
+                    range_ms: int = DEFAULT_RANGE_MS, aggregation: Optional[str] = None,
+                    workers: Optional[int] = None):
+    """
+    Evaluate every (dataset, approach, iteration) cell on a process pool.
+
+    Each approach is scored against the aggregation of the query its
+    orchestrator registers, unless ``aggregation`` overrides it for all.
+
+    Returns:
+        Tuple of (summary table with one row per cell, long per-window table)
+    """
+    datasets = discover_datasets(data_root, families)
+    runs = discover_runs(log_root) if Path(log_root).is_dir() else pd.DataFrame(columns=RUN_KEYS + ['path'])
+    cells = match_runs(datasets, runs)
+    cells['approach'] = cells['approach'].fillna('none')
+    cells['iteration'] = cells['iteration'].fillna(0).astype(int)
+    cells['range_ms'] = range_ms
+    cells['aggregation'] = [approach_aggregation(approach, aggregation) for approach in cells['approach']]
+    records = cells.to_dict('records')
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        results = list(executor.map(evaluate_cell, records, chunksize=4))
+
+    window_frames = [r.pop('windows') for r in results]
+    window_frames = [frame for frame in window_frames if not frame.empty]
+    windows = pd.concat(window_frames, ignore_index=True) if window_frames else pd.DataFrame(columns=WINDOW_COLUMNS)
+    status = pd.DataFrame(results)
+
+    cell_keys = ['family', 'dataset', 'approach', 'iteration']
+    if windows.empty:
+        return status, windows
+    scores = score_frame(windows, 'reference', 'value', cell_keys)
+    summary = status.merge(scores, on=cell_keys, how='left')
+    return summary, windows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate approach accuracy over the whole experiment matrix")
+    parser.add_argument("--data-root", default="src/streamer/data", help="Root of the dataset families")
+    parser.add_argument("--log-root", default="logs", help="Root of the experiment log tree")
+    parser.add_argument("--families", nargs='+', default=DATASET_FAMILIES, help="Dataset families to evaluate")
+    parser.add_argument("--range", type=int, default=DEFAULT_RANGE_MS, help="Registered query RANGE in ms")
+    parser.add_argument("--aggregation",
+                        help="Aggregation to score every approach against (default: the one each approach registers)")
+    parser.add_argument("--workers", type=int, help="Process pool size")
+    parser.add_argument("--output", default="accuracy_matrix.csv", help="Consolidated per-cell results CSV")
+    parser.add_argument("--windows-output", help="Optional per-window results CSV")
+    parser.add_argument("--store", help="Optional per-window results store (Parquet) to merge into")
+    args = parser.parse_args()
+
+    summary, windows = evaluate_matrix(args.data_root, args.log_root, args.families, args.range,
+                                       args.aggregation, args.workers)
+    summary.to_csv(args.output, index=False)
+    print(summary.to_string(index=False))
+    print(f"\nEvaluated {len(summary)} cells ({(summary['status'].str.startswith('ok')).sum()} with results)")
+    print(f"Consolidated results saved to: {args.output}")
+    if args.windows_output:
+        windows.to_csv(args.windows_output, index=False)
+        print(f"Per-window results saved to: {args.windows_output}")
+    if args.store and not windows.empty:
+        write_store(from_matrix_windows(windows), args.store, append=True)
+        print(f"Per-window results merged into: {args.store}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+
+import re
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# Log files written by each approach into its iteration directory
+APPROACH_LOG_FILES = {
+    'approximation': 'approximation_approach_log.csv',
+    'fetching': 'fetching_client_side_log.csv',
+    'chunked': 'streaming_query_chunk_aggregator_log.csv',
+}
+
+RESOURCE_LOG_FILES = {
+    'approximation': 'approximation_approach_resource_usage.csv',
+    'fetching': 'fetching_client_side_resource_usage.csv',
+    'chunked': 'streaming_query_hive_resource_log.csv',
+}
+
+REPLAYER_LOG_FILE = 'replayer-log.csv'
+
+RESOURCE_COLUMNS = ['timestamp', 'cpu_user', 'cpu_system', 'rss', 'heapTotal', 'heapUsed', 'heapUsedMB', 'external']
+
+RUN_KEYS = ['experiment', 'dataset', 'approach', 'iteration']
+
+_ITERATION_PATTERN = re.compile(r'iteration(\d+)$')
+
+
+def detect_approach(run_dir: Path) -> Optional[str]:
+    """Detect which approach produced a run directory from the log files it contains."""
+    for approach in APPROACH_LOG_FILES:
+        if (run_dir / APPROACH_LOG_FILES[approach]).exists() or (run_dir / RESOURCE_LOG_FILES[approach]).exists():
+            return approach
+    return None
+
+
+def discover_runs(root: str) -> pd.DataFrame:
+    """
+    Walk an experiment log tree and return one row per iteration directory.
+
+    The experiment runners write ``<experiment>/<dataset>/iteration<N>/`` (or
+    ``<experiment>/iteration<N>/`` for single-dataset experiments).
+
+    Args:
+        root: Log root, e.g. ``logs`` or ``tools/experiment-logs``
+
+    Returns:
+        DataFrame with columns experiment, dataset, approach, iteration, path
+    """
+    root_path = Path(root)
+    rows = []
+    for run_dir in sorted(root_path.rglob('iteration*')):
+        match = _ITERATION_PATTERN.match(run_dir.name)
+        if not run_dir.is_dir() or not match:
+            continue
+        approach = detect_approach(run_dir)
+        if approach is None:
+            continue
+        parts = run_dir.relative_to(root_path).parts
+        experiment = parts[0] if len(parts) > 1 else root_path.name
+        dataset = '/'.join(parts[1:-1]) or experiment
+        rows.append({
+            'experiment': experiment,
+            'dataset': dataset,
+            'approach': approach,
+            'iteration': int(match.group(1)),
+            'path': str(run_dir),
+        })
+    return pd.DataFrame(rows, columns=RUN_KEYS + ['path'])
+
+
+def read_message_log(filepath: Path) -> pd.DataFrame:
+    """
+    Read a ``timestamp,message`` log written by CSVLogger.
+
+    Messages are JSON-encoded strings that contain unescaped commas, so the
+    file is split on the first comma only instead of being parsed as CSV.
+
+    Returns:
+        DataFrame with int64 ``timestamp`` (epoch ms) and str ``message``
+    """
+    lines = pd.Series(Path(filepath).read_text().splitlines())
+    parts = lines.str.split(',', n=1, expand=True)
+    if parts.shape[1] < 2:
+        return pd.DataFrame({'timestamp': np.array([], dtype=np.int64), 'message': []})
+    timestamps = pd.to_numeric(parts[0], errors='coerce')
+    valid = timestamps.notna()
+    messages = parts.loc[valid, 1].fillna('')
+    # Undo the JSON string quoting applied by CSVLogger.log()
+    quoted = messages.str.startswith('"') & messages.str.endswith('"')
+    messages = messages.where(~quoted, messages.str.slice(1, -1).str.replace('\\"', '"', regex=False))
+    return pd.DataFrame({
+        'timestamp': timestamps[valid].astype(np.int64).to_numpy(),
+        'message': messages.to_numpy(),
+    })
+
+
+def read_resource_log(filepath: Path) -> pd.DataFrame:
+    """Read a resource usage CSV sampled by startResourceUsageLogging(); empty when the run logged nothing."""
+    try:
+        return pd.read_csv(filepath)
+    except pd.errors.EmptyDataError:
+        return pd.DataFrame(columns=RESOURCE_COLUMNS)
+
+
+def run_log_paths(run_dir: Path, approach: str) -> Dict[str, Path]:
+    """Return the expected log file paths of one run."""
+    run_dir = Path(run_dir)
+    return {
+        'messages': run_dir / APPROACH_LOG_FILES[approach],
+        'resources': run_dir / RESOURCE_LOG_FILES[approach],
+        'replayer': run_dir / REPLAYER_LOG_FILE,
+    }
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from experiment_logs import RUN_KEYS, discover_runs, read_message_log, read_resource_log, run_log_paths
+from heap_growth import BYTES_PER_MB, DEFAULT_MIN_DROP_BYTES, gc_drops
+from latency_engine import replay_bounds
+
+PHASES = ['startup', 'replay', 'drain']
+
+EVENT_COLUMNS = ['timestamp', 'phase', 'heap_before_mb', 'heap_after_mb', 'reclaimed_mb',
+                 'interval_s', 'allocated_mb', 'allocation_rate_mb_s']
+
+
+def assign_phases(timestamps: np.ndarray, replay_start: Optional[int], replay_end: Optional[int]) -> np.ndarray:
+    """
+    Label samples by run phase from the replayer log.
+
+    ``startup`` is before the first stream starts replaying, ``replay`` until
+    the last stream completes and ``drain`` afterwards. Runs without a
+    replayer log are a single ``replay`` phase.
+    """
+    phases = np.full(len(timestamps), 'replay', dtype=object)
+    if replay_start is not None:
+        phases[timestamps < replay_start] = 'startup'
+    if replay_end is not None:
+        phases[timestamps > replay_end] = 'drain'
+    return phases
+
+
+def gc_events(resources: pd.DataFrame, min_drop_bytes: float = DEFAULT_MIN_DROP_BYTES,
+              replay_start: Optional[int] = None, replay_end: Optional[int] = None) -> pd.DataFrame:
+    """
+    Infer GC events from the heapUsed sawtooth of one resource log.
+
+    Every heapUsed drop larger than ``min_drop_bytes`` is one collection.
+    Allocation between collections is the sum of heapUsed increases since the
+    previous one, so smaller collections in between do not hide allocation.
+
+    Returns:
+        DataFrame with one row per GC (see ``EVENT_COLUMNS``)
+    """
+    timestamps = resources['timestamp'].to_numpy(dtype=np.float64)
+    heap_used = resources['heapUsed'].to_numpy(dtype=np.float64)
+    after = gc_drops(heap_used, min_drop_bytes)
+    if len(after) == 0:
+        return pd.DataFrame(columns=EVENT_COLUMNS)
+    before = after - 1
+
+    # Cumulative bytes allocated up to each sample (increases of heapUsed only)
+    allocated = np.concatenate(([0.0], np.cumsum(np.clip(np.diff(heap_used), 0, None))))
+    previous = np.concatenate(([0], after[:-1]))
+    allocated_between = allocated[before] - allocated[previous]
+    interval_s = (timestamps[before] - timestamps[previous]) / 1000
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rate = np.where(interval_s > 0, allocated_between / interval_s, np.nan)
+    return pd.DataFrame({
+        'timestamp': timestamps[after].astype(np.int64),
+        'phase': assign_phases(timestamps[after], replay_start, replay_end),
+        'heap_before_mb': heap_used[before] / BYTES_PER_MB,
+        'heap_after_mb': heap_used[after] / BYTES_PER_MB,
+        'reclaimed_mb': (heap_used[before] - heap_used[after]) / BYTES_PER_MB,
+        'interval_s': interval_s,
+        'allocated_mb': allocated_between / BYTES_PER_MB,
+        'allocation_rate_mb_s': rate / BYTES_PER_MB,
+    })
+
+
+def phase_summary(resources: pd.DataFrame, events: pd.DataFrame,
+                  replay_start: Optional[int], replay_end: Optional[int]) -> pd.DataFrame:
+    """
+    GC frequency, reclaimed memory and allocation rate per phase of one run.
+
+    Allocation rate is all heapUsed growth in the phase over its duration,
+    so it also covers phases without a detected collection.
+    """
+    timestamps = resources['timestamp'].to_numpy(dtype=np.float64)
+    heap_used = resources['heapUsed'].to_numpy(dtype=np.float64)
+    phases = assign_phases(timestamps, replay_start, replay_end)
+    growth = np.concatenate(([0.0], np.clip(np.diff(heap_used), 0, None)))
+    samples = pd.DataFrame({'phase': phases, 'timestamp': timestamps, 'growth': growth})
+    per_phase = samples.groupby('phase').agg(start=('timestamp', 'min'), end=('timestamp', 'max'),
+                                             allocated=('growth', 'sum'))
+    per_phase['duration_s'] = (per_phase['end'] - per_phase['start']) / 1000
+
+    gcs = events.groupby('phase').agg(gc_count=('reclaimed_mb', 'size'),
+                                      reclaimed_median_mb=('reclaimed_mb', 'median'),
+                                      reclaimed_total_mb=('reclaimed_mb', 'sum'),
+                                      interval_median_s=('interval_s', 'median'))
+    summary = per_phase.join(gcs, how='left')
+    summary['gc_count'] = summary['gc_count'].fillna(0).astype(int)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        duration = summary['duration_s'].where(summary['duration_s'] > 0)
+        summary['gc_per_minute'] = summary['gc_count'] / duration * 60
+        summary['allocation_rate_mb_s'] = summary['allocated'] / BYTES_PER_MB / duration
+    summary = summary.drop(columns=['start', 'end', 'allocated']).reset_index()
+    summary['phase'] = pd.Categorical(summary['phase'], PHASES, ordered=True)
+    return summary.sort_values('phase')
+
+
+def analyze_run(job: Dict) -> Optional[Dict]:
+    run = job['run']
+    paths = run_log_paths(Path(run['path']), run['approach'])
+    if not paths['resources'].exists():
+        return None
+    resources = read_resource_log(paths['resources'])
+    if len(resources) < 2:
+        return None
+    replay_start = replay_end = None
+    if paths['replayer'].exists():
+        replay_start, replay_end = replay_bounds(read_message_log(paths['replayer']))
+    events = gc_events(resources, job['min_drop_bytes'], replay_start, replay_end)
+    summary = phase_summary(resources, events, replay_start, replay_end)
+    keys = {key: run[key] for key in RUN_KEYS}
+    return {'events': events.assign(**keys), 'summary': summary.assign(**keys)}
+
+
+def analyze_gc_activity(log_root: str, min_drop_bytes: float = DEFAULT_MIN_DROP_BYTES,
+                        workers: Optional[int] = None):
+    """
+    GC events and per-phase summaries of every run under a log root.
+
+    Returns:
+        Tuple of (events, per run and phase summary)
+    """
+    runs = discover_runs(log_root)
+    jobs = [{'run': run, 'min_drop_bytes': min_drop_bytes} for run in runs.to_dict('records')]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        results = [r for r in executor.map(analyze_run, jobs, chunksize=4) if r is not None]
+    if not results:
+        return pd.DataFrame(columns=RUN_KEYS + EVENT_COLUMNS), pd.DataFrame()
+    event_frames = [r['events'] for r in results if not r['events'].empty]
+    events = pd.concat(event_frames, ignore_index=True) if event_frames else pd.DataFrame(columns=RUN_KEYS + EVENT_COLUMNS)
+    events = events[RUN_KEYS + EVENT_COLUMNS]
+    summary = pd.concat([r['summary'] for r in results], ignore_index=True)
+    summary = summary[RUN_KEYS + [c for c in summary.columns if c not in RUN_KEYS]]
+    return events, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Infer GC activity and allocation rate from heapUsed samples")
+    parser.add_argument("--log-root", default="tools/experiment-logs", help="Root of the experiment log tree")
+    parser.add_argument("--min-drop", type=float, default=DEFAULT_MIN_DROP_BYTES / 1024,
+                        help="Smallest heapUsed drop (KB) counted as a GC")
+    parser.add_argument("--workers", type=int, help="Process pool size")
+    parser.add_argument("--output", default="gc_activity.csv", help="Per run and phase summary CSV")
+    parser.add_argument("--events-output", help="Optional CSV with every inferred GC event")
+    args = parser.parse_args()
+
+    events, summary = analyze_gc_activity(args.log_root, args.min_drop * 1024, args.workers)
+    if summary.empty:
+        print(f"No resource logs found under {args.log_root}")
+        return
+
+    per_approach = summary.groupby(['approach', 'phase'], observed=True).agg(
+        runs=('gc_count', 'size'),
+        gc_per_minute=('gc_per_minute', 'median'),
+        reclaimed_median_mb=('reclaimed_median_mb', 'median'),
+        allocation_rate_mb_s=('allocation_rate_mb_s', 'median'))
+    print("GC activity per approach and phase (median over runs):")
+    print(per_approach.to_string(float_format=lambda v: f"{v:.2f}"))
+    print(f"\n{len(events)} GC events inferred over {summary[RUN_KEYS].drop_duplicates().shape[0]} runs")
+
+    summary.to_csv(args.output, index=False)
+    print(f"Per run and phase summary saved to: {args.output}")
+    if args.events_output:
+        events.to_csv(args.events_output, index=False)
+        print(f"GC events saved to: {args.events_output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ import numpy as np
 import math
 import os
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import json
 
 class ExponentialRateComparisonGenerator:
@@ -37,6 +37,30 @@ class ExponentialRateComparisonGenerator:
         x = np.linspace(0, 1, self.data_points)
         return np.exp(-rate * x).tolist()
     
+    def written_start_ms(self, timestamps: list) -> int:
+        """Epoch ms of the first timestamp as write_nt_file writes it (local wall-clock time with a Z suffix)."""
+        dt = datetime.fromtimestamp(timestamps[0] / 1000.0).replace(tzinfo=timezone.utc)
+        return round(dt.timestamp() * 1000)
+
+    def write_ground_truth(self, output_dir: Path, rate: float, timestamps: list):
+        """
+        Write the generator parameters of a dataset as ground_truth.json (read by analytic_truth.py).
+
+        The smartphone stream is e^(rate * x) over x = linspace(0, 1) (rate is
+        negative for decay), so its
+        window aggregates have a closed form; the noisy wearable stream has none.
+        """
+        spec = {
+            "start_ms": self.written_start_ms(timestamps),
+            "interval_ms": self.timestamp_interval_ms,
+            "observations": self.data_points,
+            "terms": [{"kind": "exponential", "scale": 1.0, "x0": 0.0,
+                       "dx": rate / max(self.data_points - 1, 1)}]
+        }
+        ground_truth = {"streams": {"smartphone.acceleration.x": spec, "wearable.acceleration.x": None}}
+        with open(output_dir / "ground_truth.json", 'w') as f:
+            json.dump(ground_truth, f, indent=2)
+
     def write_nt_file(self, values: list, timestamps: list, filepath: Path, device_type: str = "smartphone"):
         """Write data in N-Triples format matching the existing data structure"""
         filepath.parent.mkdir(parents=True, exist_ok=True)
@@ -92,6 +116,7 @@ class ExponentialRateComparisonGenerator:
             growth_wearable_values = [v + np.random.normal(0, abs(v) * 0.02) for v in growth_values]  # Add 2% noise
             growth_wearable_file = growth_dir / "wearable.acceleration.x" / "data.nt"
             self.write_nt_file(growth_wearable_values, timestamps, growth_wearable_file, "wearable")
+            self.write_ground_truth(growth_dir, rate, timestamps)
             
             print(f"  Growth: {growth_values[0]:.3f} -> {growth_values[-1]:.3f} (change: {((growth_values[-1]/growth_values[0] - 1) * 100):.1f}%)")
             
@@ -107,6 +132,7 @@ class ExponentialRateComparisonGenerator:
             decay_wearable_values = [v + np.random.normal(0, abs(v) * 0.02) for v in decay_values]  # Add 2% noise
             decay_wearable_file = decay_dir / "wearable.acceleration.x" / "data.nt"
             self.write_nt_file(decay_wearable_values, timestamps, decay_wearable_file, "wearable")
+            self.write_ground_truth(decay_dir, -rate, timestamps)
             
             print(f"  Decay: {decay_values[0]:.3f} -> {decay_values[-1]:.3f} (change: {((decay_values[-1]/decay_values[0] - 1) * 100):.1f}%)")
         
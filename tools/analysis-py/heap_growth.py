@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from experiment_logs import RUN_KEYS, discover_runs, read_resource_log, run_log_paths
+
+# A heapUsed drop larger than this between two 100 ms samples is taken as a GC
+DEFAULT_MIN_DROP_BYTES = 512 * 1024
+# Post-GC minima per rolling slope window
+DEFAULT_WINDOW = 12
+# Sustained growth: robust slope above this rate ...
+DEFAULT_SLOPE_THRESHOLD_MB_PER_HOUR = 5.0
+# ... and rising in at least this share of the rolling windows
+DEFAULT_SUSTAINED_FRACTION = 0.75
+MIN_MINIMA = 6
+# Heap growth while caches and JIT warm up is not a leak
+DEFAULT_WARMUP_S = 60
+# Post-GC minima spanning less than this cannot separate a slow leak from a burst and are not flagged
+DEFAULT_MIN_DURATION_S = 600
+# Pairwise slopes are subsampled above this many minima to bound memory
+MAX_THEIL_SEN_POINTS = 2000
+
+BYTES_PER_MB = 1024 * 1024
+
+
+def gc_drops(heap_used: np.ndarray, min_drop_bytes: float = DEFAULT_MIN_DROP_BYTES) -> np.ndarray:
+    """Indices of the first sample after every heapUsed drop larger than ``min_drop_bytes``."""
+    return np.flatnonzero(np.diff(heap_used) < -min_drop_bytes) + 1
+
+
+def post_gc_minima(timestamps: np.ndarray, heap_used: np.ndarray,
+                   min_drop_bytes: float = DEFAULT_MIN_DROP_BYTES) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Heap level right after each GC, an estimate of the live set.
+
+    Between two collections heapUsed only grows with allocation, so the
+    trend of these minima (not of the sawtooth) shows retained memory.
+    """
+    drops = gc_drops(heap_used, min_drop_bytes)
+    return timestamps[drops], heap_used[drops]
+
+
+def theil_sen_slope(x: np.ndarray, y: np.ndarray) -> float:
+    """Median of all pairwise slopes, robust to the odd GC that collects less."""
+    if len(x) > MAX_THEIL_SEN_POINTS:
+        keep = np.linspace(0, len(x) - 1, MAX_THEIL_SEN_POINTS).astype(np.int64)
+        x, y = x[keep], y[keep]
+    i, j = np.triu_indices(len(x), k=1)
+    dx = x[j] - x[i]
+    valid = dx != 0
+    if not valid.any():
+        return np.nan
+    return float(np.median((y[j] - y[i])[valid] / dx[valid]))
+
+
+def rolling_theil_sen(x: np.ndarray, y: np.ndarray, window: int = DEFAULT_WINDOW) -> np.ndarray:
+    """
+    Theil-Sen slope of every run of ``window`` consecutive points.
+
+    All windows and all point pairs are evaluated in one broadcast over a
+    ``(windows, window, window)`` array of pairwise slopes.
+    """
+    if len(x) < window:
+        return np.array([])
+    xs = np.lib.stride_tricks.sliding_window_view(x.astype(np.float64), window)
+    ys = np.lib.stride_tricks.sliding_window_view(y.astype(np.float64), window)
+    i, j = np.triu_indices(window, k=1)
+    dx = xs[:, j] - xs[:, i]
+    dy = ys[:, j] - ys[:, i]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slopes = np.where(dx != 0, dy / dx, np.nan)
+    return np.nanmedian(slopes, axis=1)
+
+
+def heap_growth(resources: pd.DataFrame, min_drop_bytes: float = DEFAULT_MIN_DROP_BYTES,
+                window: int = DEFAULT_WINDOW, slope_threshold_mb_per_hour: float = DEFAULT_SLOPE_THRESHOLD_MB_PER_HOUR,
+                sustained_fraction: float = DEFAULT_SUSTAINED_FRACTION, warmup_s: float = DEFAULT_WARMUP_S,
+                min_duration_s: float = DEFAULT_MIN_DURATION_S) -> Dict:
+    """
+    Heap growth metrics of one resource log.
+
+    Returns:
+        Dict with duration, GC count, post-GC heap at start and end, the
+        overall and rolling robust slopes (MB/hour), a status and the leak flag
+    """
+    timestamps = resources['timestamp'].to_numpy(dtype=np.float64)
+    heap_used = resources['heapUsed'].to_numpy(dtype=np.float64)
+    minima_t, minima_heap = post_gc_minima(timestamps, heap_used, min_drop_bytes)
+    after_warmup = minima_t >= timestamps[0] + warmup_s * 1000
+    minima_t, minima_heap = minima_t[after_warmup], minima_heap[after_warmup]
+    hours = (minima_t - timestamps[0]) / 3_600_000 if len(timestamps) else minima_t
+    result = {
+        'duration_s': (timestamps[-1] - timestamps[0]) / 1000 if len(timestamps) > 1 else 0.0,
+        'gc_count': len(minima_t),
+        'minima_span_s': (minima_t[-1] - minima_t[0]) / 1000 if len(minima_t) else 0.0,
+        'post_gc_start_mb': minima_heap[0] / BYTES_PER_MB if len(minima_heap) else np.nan,
+        'post_gc_end_mb': minima_heap[-1] / BYTES_PER_MB if len(minima_heap) else np.nan,
+        'slope_mb_per_hour': np.nan,
+        'rising_fraction': np.nan,
+        'status': 'too short',
+        'leak_suspected': False,
+    }
+    if len(minima_t) < MIN_MINIMA:
+        return result
+
+    slope = theil_sen_slope(hours, minima_heap / BYTES_PER_MB)
+    rolling = rolling_theil_sen(hours, minima_heap / BYTES_PER_MB, min(window, len(minima_t)))
+    rolling = rolling[np.isfinite(rolling)]
+    rising = float((rolling > 0).mean()) if len(rolling) else np.nan
+    growing = bool(slope > slope_threshold_mb_per_hour and rising >= sustained_fraction)
+    long_enough = result['minima_span_s'] >= min_duration_s
+    result.update({
+        'slope_mb_per_hour': slope,
+        'rising_fraction': rising,
+        'status': 'too short' if not long_enough else 'sustained growth' if growing else 'stable',
+        'leak_suspected': growing and long_enough,
+    })
+    return result
+
+
+def analyze_run(job: Dict) -> Optional[Dict]:
+    run = job['run']
+    paths = run_log_paths(Path(run['path']), run['approach'])
+    if not paths['resources'].exists():
+        return None
+    resources = read_resource_log(paths['resources'])
+    if len(resources) < 2:
+        return None
+    return {**{key: run[key] for key in RUN_KEYS}, **heap_growth(resources, **job['options'])}
+
+
+def detect_heap_growth(log_root: str, workers: Optional[int] = None, **options) -> pd.DataFrame:
+    """Heap growth metrics of every run under a log root, one process per run batch."""
+    runs = discover_runs(log_root)
+    jobs = [{'run': run, 'options': options} for run in runs.to_dict('records')]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        results = [r for r in executor.map(analyze_run, jobs, chunksize=4) if r is not None]
+    return pd.DataFrame(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flag sustained heap growth from post-GC heap minima")
+    parser.add_argument("--log-root", default="tools/experiment-logs", help="Root of the experiment log tree")
+    parser.add_argument("--min-drop", type=float, default=DEFAULT_MIN_DROP_BYTES / 1024,
+                        help="Smallest heapUsed drop (KB) counted as a GC")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW, help="Post-GC minima per rolling slope")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_SLOPE_THRESHOLD_MB_PER_HOUR,
+                        help="Growth (MB/hour) above which a run is flagged")
+    parser.add_argument("--sustained", type=float, default=DEFAULT_SUSTAINED_FRACTION,
+                        help="Share of rolling windows that must be rising")
+    parser.add_argument("--warmup", type=float, default=DEFAULT_WARMUP_S, help="Seconds of warm-up to ignore")
+    parser.add_argument("--min-duration", type=float, default=DEFAULT_MIN_DURATION_S,
+                        help="Shortest span (s) of post-GC minima that can be flagged")
+    parser.add_argument("--workers", type=int, help="Process pool size")
+    parser.add_argument("--output", help="Optional per-run CSV output path")
+    args = parser.parse_args()
+
+    growth = detect_heap_growth(args.log_root, args.workers, min_drop_bytes=args.min_drop * 1024,
+                                window=args.window, slope_threshold_mb_per_hour=args.threshold,
+                                sustained_fraction=args.sustained, warmup_s=args.warmup,
+                                min_duration_s=args.min_duration)
+    if growth.empty:
+        print(f"No resource logs found under {args.log_root}")
+        return
+
+    pd.set_option('display.width', 200)
+    print(growth.drop(columns=['experiment']).to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+    per_approach = growth.groupby('approach').agg(runs=('leak_suspected', 'size'),
+                                                  flagged=('leak_suspected', 'sum'),
+                                                  median_slope_mb_per_hour=('slope_mb_per_hour', 'median'))
+    print("\nPer approach:")
+    print(per_approach.to_string(float_format=lambda v: f"{v:.2f}"))
+    flagged = growth[growth['leak_suspected']]
+    for _, run in flagged.iterrows():
+        print(f"[!] Sustained heap growth: {run['approach']} {run['dataset']} iteration{run['iteration']} "
+              f"({run['slope_mb_per_hour']:+.1f} MB/hour over {run['minima_span_s'] / 60:.0f} min)")
+    if args.output:
+        growth.to_csv(args.output, index=False)
+        print(f"\nHeap growth results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
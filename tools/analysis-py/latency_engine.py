@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+
+import argparse
+import re
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from experiment_logs import RUN_KEYS, discover_runs, read_message_log, run_log_paths
+from nt_stream import parse_timestamps
+
+PERCENTILES = [0.5, 0.95, 0.99]
+
+# Slide of the windows whose closes bring new observations into each approach's results: the registered
+# query STEP for fetching, the sub-query STEP for approximation and the GCD chunk for chunked
+CONTENT_STEP_MS = {'approximation': 30000, 'fetching': 60000, 'chunked': 30000}
+
+_NUMBER = r'(-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)'
+
+# Messages that mark a result leaving each approach, with the value they carry
+OUTPUT_PATTERNS = {
+    'approximation': re.compile(r'^Final aggregation results: .*?"window":\{"start":' + _NUMBER
+                                + r',"end":' + _NUMBER + r'\},"unifiedResult":' + _NUMBER),
+    'fetching': re.compile(r'^Successfully published result: ' + _NUMBER),
+    'chunked': re.compile(r'^calculated result .*?hasValue> "' + _NUMBER + r'"'),
+}
+
+_REPLAY_STARTED = re.compile(r'^Starting replay for (\w+) stream')
+_REPLAY_COMPLETED = re.compile(r'^Replay completed for (\w+) stream')
+_REPLAY_SUMMARY = re.compile(r'^(\d+),(\d+),(\d+)$')
+_PUBLISHED = re.compile(r'^Published observation to (\S+) with timestamp (\S+)$')
+
+
+def extract_outputs(messages: pd.DataFrame, approach: str) -> pd.DataFrame:
+    """
+    Extract one row per emitted window result from an approach log.
+
+    Returns:
+        DataFrame with emitted_at, window_end and value; window_end falls back
+        to the emission time when the approach does not log window bounds.
+    """
+    pattern = OUTPUT_PATTERNS[approach]
+    groups = messages['message'].str.extract(pattern)
+    matched = groups.notna().all(axis=1)
+    groups = groups[matched].astype(float)
+    emitted_at = messages.loc[matched, 'timestamp'].to_numpy()
+    if approach == 'approximation':
+        window_end = groups[1].to_numpy().astype(np.int64)
+        value = groups[2].to_numpy()
+    else:
+        window_end = emitted_at
+        value = groups[0].to_numpy()
+    return pd.DataFrame({'emitted_at': emitted_at, 'window_end': window_end, 'value': value})
+
+
+def read_publishes(replayer: pd.DataFrame) -> pd.DataFrame:
+    """
+    Every publish the replayer logged, with the time it was actually made.
+
+    Returns:
+        DataFrame with stream (topic), observation (publish order within the
+        stream), event_ms (timestamp the observation carried) and published_at
+        (epoch ms); empty for replayer logs without per-publish lines
+    """
+    groups = replayer['message'].str.extract(_PUBLISHED)
+    matched = groups[0].notna()
+    publishes = pd.DataFrame({
+        'stream': groups.loc[matched, 0].to_numpy(),
+        'event_ms': parse_timestamps(groups.loc[matched, 1]),
+        'published_at': replayer.loc[matched, 'timestamp'].to_numpy(),
+    })
+    publishes.insert(1, 'observation', publishes.groupby('stream').cumcount())
+    return publishes
+
+
+def replay_summaries(replayer: pd.DataFrame) -> pd.DataFrame:
+    """One row per ``intended,successful,failed`` summary line (one per replayed stream)."""
+    summaries = replayer['message'].str.extract(_REPLAY_SUMMARY)
+    valid = summaries.notna().all(axis=1)
+    summaries = summaries[valid].astype(np.int64)
+    summaries.columns = ['intended', 'successful', 'failed']
+    summaries.insert(0, 'timestamp', replayer.loc[valid, 'timestamp'].to_numpy())
+    return summaries.reset_index(drop=True)
+
+
+def replay_counts(replayer: pd.DataFrame) -> Dict[str, int]:
+    """Intended, successful and failed publishes summed over the replayed streams."""
+    totals = replay_summaries(replayer)[['intended', 'successful', 'failed']].sum()
+    return {key: int(value) for key, value in totals.items()}
+
+
+def replay_bounds(replayer: pd.DataFrame) -> Tuple[Optional[int], Optional[int]]:
+    """Time the first stream started replaying and the last one completed (epoch ms)."""
+    started = replayer.loc[replayer['message'].str.match(_REPLAY_STARTED), 'timestamp']
+    completed = replayer.loc[replayer['message'].str.match(_REPLAY_COMPLETED), 'timestamp']
+    return (int(started.min()) if len(started) else None,
+            int(completed.max()) if len(completed) else None)
+
+
+def compute_window_latencies(outputs: pd.DataFrame, publishes: pd.DataFrame, step_ms: int) -> pd.DataFrame:
+    """
+    Join every emitted window with the publish of the newest observation it
+    contains and compute end-to-end latency from that publish.
+
+    Windows close on event-time multiples of ``step_ms`` and fire once an
+    observation at or after the close arrives, so each result belongs to the
+    latest close whose first later observation had been published when the
+    result was emitted. The window holds the observations logged before that
+    first later publish; observations published after it missed the window.
+    Both lookups are ``searchsorted`` as-of joins, linear in the publishes.
+
+    Returns:
+        ``outputs`` with content_end (window close), published_at and
+        latency_ms, for the results a window could be attributed to
+    """
+    columns = list(outputs.columns) + ['content_end', 'published_at', 'latency_ms']
+    if outputs.empty or publishes.empty:
+        return pd.DataFrame(columns=columns)
+    # Publishes are logged in publish order; the running maximum keeps their times non-decreasing
+    published_at = np.maximum.accumulate(publishes['published_at'].to_numpy())
+    by_event = np.argsort(publishes['event_ms'].to_numpy(), kind='stable')
+    event_ms = publishes['event_ms'].to_numpy()[by_event]
+    closes = np.arange(event_ms[0] // step_ms + 1, event_ms[-1] // step_ms + 1, dtype=np.int64) * step_ms
+    if len(closes) == 0:
+        return pd.DataFrame(columns=columns)
+    # Publish position of the first observation at or after each close (suffix minimum over event time);
+    # every publish before it belongs to an earlier close, so the one right before is the newest content
+    first_after = np.minimum.accumulate(by_event[::-1])[::-1]
+    trigger = first_after[np.searchsorted(event_ms, closes, side='left')]
+    triggered_at = published_at[trigger]
+    newest = np.where(trigger > 0, published_at[np.maximum(trigger - 1, 0)], -1)
+
+    # Triggers are non-decreasing, so the latest fired close is an as-of lookup on the emit time
+    close_index = np.searchsorted(triggered_at, outputs['emitted_at'].to_numpy(), side='right') - 1
+    attributed = (close_index >= 0) & (newest[np.maximum(close_index, 0)] >= 0)
+    joined = outputs[attributed].copy()
+    close_index = close_index[attributed]
+    joined['content_end'] = closes[close_index]
+    joined['published_at'] = newest[close_index].astype(np.int64)
+    joined['latency_ms'] = joined['emitted_at'] - joined['published_at']
+    return joined
+
+
+def load_run_latencies(run: pd.Series) -> pd.DataFrame:
+    """Compute the per-window latencies of a single run directory."""
+    paths = run_log_paths(Path(run['path']), run['approach'])
+    if not paths['messages'].exists() or not paths['replayer'].exists():
+        return pd.DataFrame()
+    outputs = extract_outputs(read_message_log(paths['messages']), run['approach'])
+    publishes = read_publishes(read_message_log(paths['replayer']))
+    if outputs.empty or publishes.empty:
+        return pd.DataFrame()
+    latencies = compute_window_latencies(outputs, publishes, CONTENT_STEP_MS[run['approach']])
+    for key in RUN_KEYS:
+        latencies[key] = run[key]
+    return latencies
+
+
+def load_latencies(log_root: str) -> pd.DataFrame:
+    """Compute per-window latencies for every run found under a log root."""
+    runs = discover_runs(log_root)
+    frames = [load_run_latencies(run) for _, run in runs.iterrows()]
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame(columns=RUN_KEYS + ['emitted_at', 'window_end', 'value', 'content_end', 'published_at',
+                                                'latency_ms'])
+    return pd.concat(frames, ignore_index=True)
+
+
+def summarize_latencies(latencies: pd.DataFrame, by: list = RUN_KEYS) -> pd.DataFrame:
+    """Report p50/p95/p99/max latency per group."""
+    grouped = latencies.groupby(by)['latency_ms']
+    quantiles = grouped.quantile(PERCENTILES).unstack()
+    quantiles.columns = [f'p{int(q * 100)}' for q in PERCENTILES]
+    summary = pd.concat([grouped.count().rename('windows'), grouped.mean().rename('mean'),
+                         quantiles, grouped.max().rename('max')], axis=1)
+    return summary.reset_index()
+
+
+def plot_latency_percentiles(summary: pd.DataFrame, output_path: str):
+    """Plot latency percentiles per approach, pooled over datasets and iterations."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    pooled = summary.groupby('approach')[['p50', 'p95', 'p99', 'max']].median()
+    ax = pooled.plot.bar(figsize=(8, 6), edgecolor='black', rot=0)
+    ax.set_ylabel('Latency (ms)', fontsize=14)
+    ax.set_xlabel('')
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+    plt.tight_layout()
+    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute per-window end-to-end latency percentiles from experiment logs")
+    parser.add_argument("--log-root", default="logs", help="Root of the experiment log tree")
+    parser.add_argument("--output", default="latency_percentiles.csv", help="Summary CSV output path")
+    parser.add_argument("--windows-output", help="Optional CSV with every per-window latency")
+    parser.add_argument("--plot", help="Optional path for a percentile bar chart")
+    args = parser.parse_args()
+
+    latencies = load_latencies(args.log_root)
+    if latencies.empty:
+        print(f"No runs with both approach logs and per-publish replayer logs found under {args.log_root}")
+        return
+
+    summary = summarize_latencies(latencies)
+    summary.to_csv(args.output, index=False)
+    print(summary.to_string(index=False))
+    print(f"\nLatency summary saved to: {args.output}")
+
+    if args.windows_output:
+        latencies.to_csv(args.windows_output, index=False)
+        print(f"Per-window latencies saved to: {args.windows_output}")
+    if args.plot:
+        plot_latency_percentiles(summary, args.plot)
+        print(f"Latency percentile chart saved to: {args.plot}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from nt_stream import COMPACT_STREAM_FILE, HAS_TIMESTAMP, HAS_VALUE, STREAM_FILE
+
+COMPACT_SUFFIX = Path(COMPACT_STREAM_FILE).suffix
+MAGIC = '#ntc 1'
+TEMPLATE_DIRECTIVE = '#template '
+NO_FINAL_NEWLINE = '#no-final-newline'
+# Lines that do not fit the stream template are kept as they are behind this marker
+VERBATIM = '!'
+
+_SUBJECT = re.compile(r'^<([^<>]*?)(\d+)> ')
+_TIMESTAMP_LITERAL = re.compile(r'(<' + re.escape(HAS_TIMESTAMP) + r'> ")([^"\t]*)(")')
+_VALUE_LITERAL = re.compile(r'(<' + re.escape(HAS_VALUE) + r'> ")([^"\t]*)(")')
+_SLOT = re.compile(r'\{([stv])\}')
+_SLOTS = ('{s}', '{t}', '{v}')
+
+
+def line_template(line: str) -> Optional[Tuple[str, Tuple[str, str, str]]]:
+    """
+    Split one observation line into its stream template and varying fields.
+
+    The template is the line with the numeric subject suffix, the timestamp
+    literal and the value literal replaced by ``{s}``, ``{t}`` and ``{v}``.
+
+    Returns:
+        Tuple of (template, (subject suffix, timestamp, value)), or None when
+        the line is not a single observation
+    """
+    if any(slot in line for slot in _SLOTS):
+        return None
+    subject = _SUBJECT.match(line)
+    timestamps = _TIMESTAMP_LITERAL.findall(line)
+    values = _VALUE_LITERAL.findall(line)
+    if not subject or len(timestamps) != 1 or len(values) != 1:
+        return None
+    prefix, suffix = subject.groups()
+    template = line.replace(f'<{prefix}{suffix}>', f'<{prefix}{{s}}>')
+    template = _TIMESTAMP_LITERAL.sub(r'\1{t}\3', template)
+    template = _VALUE_LITERAL.sub(r'\1{v}\3', template)
+    return template, (suffix, timestamps[0][1], values[0][1])
+
+
+def _compile_template(template: str) -> Tuple[List[str], List[int]]:
+    """Literal pieces and the field index (0 subject, 1 timestamp, 2 value) between them."""
+    split = _SLOT.split(template)
+    return split[0::2], ['stv'.index(slot) for slot in split[1::2]]
+
+
+def _fill(pieces: List[str], slots: List[int], fields: List[str]) -> str:
+    out = [pieces[0]]
+    for slot, piece in zip(slots, pieces[1:]):
+        out.append(fields[slot])
+        out.append(piece)
+    return ''.join(out)
+
+
+def encode_lines(lines: Iterator[str]) -> Iterator[str]:
+    """
+    Encode the lines of a ``data.nt`` stream (with their line endings).
+
+    The first observation line fixes the stream template; every line that
+    expands back to exactly itself from that template becomes a
+    ``suffix<TAB>timestamp<TAB>value`` record, anything else is kept verbatim.
+    """
+    compiled = None
+    yield MAGIC + '\n'
+    last = ''
+    for last in lines:
+        text = last[:-1] if last.endswith('\n') else last
+        parsed = line_template(text)
+        if parsed and compiled is None:
+            compiled = _compile_template(parsed[0])
+            yield TEMPLATE_DIRECTIVE + parsed[0] + '\n'
+        if parsed and _fill(*compiled, list(parsed[1])) == text:
+            yield '\t'.join(parsed[1]) + '\n'
+        else:
+            yield VERBATIM + text + '\n'
+    if last and not last.endswith('\n'):
+        yield NO_FINAL_NEWLINE + '\n'
+
+
+def expand_lines(lines: Iterator[str]) -> Iterator[str]:
+    """
+    Expand compact lines back into the exact N-Triples lines they encode.
+
+    Works one line at a time, so arbitrarily large streams are expanded
+    without being held in memory.
+    """
+    compiled = None
+    previous = None
+    final_newline = True
+    for line in lines:
+        line = line[:-1] if line.endswith('\n') else line
+        if line.startswith('#'):
+            if line.startswith(TEMPLATE_DIRECTIVE):
+                compiled = _compile_template(line[len(TEMPLATE_DIRECTIVE):])
+            elif line == NO_FINAL_NEWLINE:
+                final_newline = False
+            continue
+        if previous is not None:
+            yield previous + '\n'
+        previous = line[1:] if line.startswith(VERBATIM) else _fill(*compiled, line.split('\t'))
+    if previous is not None:
+        yield previous + ('\n' if final_newline else '')
+
+
+def encode_file(source: str, target: Optional[str] = None) -> Dict:
+    """
+    Write the compact encoding of a ``data.nt`` file next to it (``data.ntc``).
+
+    Returns:
+        Dict with source/target paths and sizes and the number of verbatim lines
+    """
+    source = Path(source)
+    target = Path(target) if target else source.with_suffix(COMPACT_SUFFIX)
+    verbatim = 0
+    with open(source, newline='') as reader, open(target, 'w', newline='') as writer:
+        for line in encode_lines(reader):
+            verbatim += line.startswith(VERBATIM)
+            writer.write(line)
+    return {'source': str(source), 'target': str(target), 'source_bytes': source.stat().st_size,
+            'target_bytes': target.stat().st_size, 'verbatim_lines': verbatim}
+
+
+def expand_file(source: str, target: str):
+    """Write the N-Triples a compact file encodes."""
+    with open(source, newline='') as reader, open(target, 'w', newline='') as writer:
+        writer.writelines(expand_lines(reader))
+
+
+def verify_file(original: str, compact: str) -> bool:
+    """Whether a compact file expands to exactly the bytes of the original."""
+    with open(original, newline='') as reader, open(compact, newline='') as encoded:
+        return ''.join(expand_lines(encoded)) == reader.read()
+
+
+def read_compact_observations(filepath: str) -> pd.DataFrame:
+    """
+    Subject, timestamp and value literals of a compact stream, in file order.
+
+    Records already hold the varying fields, so no triple is expanded or
+    matched; only verbatim lines go through the template parser.
+    """
+    rows = []
+    prefix = ''
+    with open(filepath, newline='') as reader:
+        for line in reader:
+            line = line.rstrip('\n')
+            if line.startswith(TEMPLATE_DIRECTIVE):
+                match = re.search(r'<([^<>]*)\{s\}>', line)
+                prefix = match.group(1) if match else ''
+            elif line.startswith(VERBATIM):
+                parsed = line_template(line[1:])
+                if parsed:
+                    suffix, timestamp, value = parsed[1]
+                    subject = _SUBJECT.match(line[1:]).group(1) + suffix
+                    rows.append((subject, timestamp, value))
+            elif line and not line.startswith('#'):
+                suffix, timestamp, value = line.split('\t')
+                rows.append((prefix + suffix, timestamp, value))
+    return pd.DataFrame(rows, columns=['subject', 'time', 'value'])
+
+
+def _encode_job(job: Dict) -> Dict:
+    result = encode_file(job['path'])
+    result['verified'] = verify_file(result['source'], result['target'])
+    if job['replace'] and result['verified']:
+        Path(result['source']).unlink()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact observation-only encoding of data.nt streams")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    encode = subparsers.add_parser("encode", help="Write data.ntc next to every data.nt")
+    encode.add_argument("paths", nargs='*', help="data.nt files (default: every stream under --data-root)")
+    encode.add_argument("--data-root", default="src/streamer/data", help="Root of the dataset families")
+    encode.add_argument("--replace", action='store_true', help="Delete each data.nt once its encoding is verified")
+    encode.add_argument("--workers", type=int, help="Process pool size")
+
+    expand = subparsers.add_parser("expand", help="Expand a data.ntc back into N-Triples")
+    expand.add_argument("source", help="Compact file")
+    expand.add_argument("--output", help="Output N-Triples file (default: next to it as data.nt)")
+    args = parser.parse_args()
+
+    if args.command == "expand":
+        target = args.output or str(Path(args.source).with_suffix('.nt'))
+        expand_file(args.source, target)
+        print(f"Expanded {args.source} -> {target}")
+        return
+
+    paths = args.paths or [str(p) for p in sorted(Path(args.data_root).rglob(STREAM_FILE))]
+    if not paths:
+        print(f"No data.nt streams found under {args.data_root}")
+        return
+    jobs = [{'path': path, 'replace': args.replace} for path in paths]
+    with ProcessPoolExecutor(max_workers=args.workers or os.cpu_count()) as executor:
+        results = pd.DataFrame(executor.map(_encode_job, jobs, chunksize=4))
+
+    failed = results[~results['verified']]
+    for row in failed.itertuples():
+        print(f"[!] {row.source}: compact encoding does not expand to the original, kept both")
+    source_bytes, target_bytes = results['source_bytes'].sum(), results['target_bytes'].sum()
+    print(f"Encoded {len(results)} streams: {source_bytes / 1e6:.1f} MB -> {target_bytes / 1e6:.1f} MB "
+          f"({source_bytes / max(target_bytes, 1):.1f}x smaller), {int(results['verbatim_lines'].sum())} verbatim lines")
+
+
+if __name__ == "__main__":
+    main()
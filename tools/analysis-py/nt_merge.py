@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+
+import argparse
+import heapq
+import re
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from nt_compact import TEMPLATE_DIRECTIVE, expand_lines
+from nt_stream import COMPACT_STREAM_FILE, HAS_TIMESTAMP, parse_timestamps
+
+# Graph IRI prefix that tags every merged quad with the stream it came from
+GRAPH_PREFIX = 'urn:stream:'
+# First line of a merged file, read by the replayer to pace the merged stream
+STREAMS_DIRECTIVE = '#streams '
+# Sorted (timestamp, byte offset, byte length) of every observation of a stream
+INDEX_DTYPE = np.dtype([('timestamp', np.int64), ('offset', np.int64), ('length', np.int64)])
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_SUBJECT = re.compile(r'^(<[^>]*>|_:\S+)\s')
+_TIMESTAMP_LITERAL = re.compile(r'<' + re.escape(HAS_TIMESTAMP) + r'> "([^"]+)"')
+_TRIPLE = re.compile(r'(<[^>]*>|_:\S+)\s+(<[^>]*>)\s+'
+                     r'(<[^>]*>|_:\S+|"(?:[^"\\]|\\.)*"(?:\^\^<[^>]*>|@[A-Za-z0-9-]+)?)\s*\.')
+
+
+class Observation(NamedTuple):
+    """One observation of a stream: every consecutive line about the same subject."""
+    timestamp: int
+    offset: int
+    length: int
+    lines: List[str]
+
+
+def epoch_ms(literal: str) -> int:
+    """Epoch milliseconds of one xsd:dateTime literal (UTC when it has no offset)."""
+    try:
+        parsed = datetime.fromisoformat(literal)
+    except ValueError:
+        return int(parse_timestamps([literal])[0])
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return (parsed - _EPOCH) // timedelta(milliseconds=1)
+
+
+def _is_compact(filepath: str) -> bool:
+    return Path(filepath).name.endswith(Path(COMPACT_STREAM_FILE).suffix)
+
+
+def _expand_record(template: Optional[str], record: str) -> str:
+    return next(expand_lines([template, record] if template else [record])).rstrip('\n')
+
+
+def _stream_lines(filepath: str) -> Iterator[Tuple[int, int, str]]:
+    """(byte offset, byte length, N-Triples line) of every line; compact records are expanded."""
+    compact = _is_compact(filepath)
+    template = None
+    offset = 0
+    with open(filepath, 'rb') as reader:
+        for raw in reader:
+            start, offset = offset, offset + len(raw)
+            line = raw.decode('utf-8').rstrip('\r\n')
+            if compact:
+                if line.startswith(TEMPLATE_DIRECTIVE):
+                    template = line
+                if line.startswith('#'):
+                    continue
+                line = _expand_record(template, line)
+            yield start, len(raw), line
+
+
+def _observation(lines: List[str], offset: int, end: int) -> Optional[Observation]:
+    match = _TIMESTAMP_LITERAL.search('\n'.join(lines))
+    return Observation(epoch_ms(match.group(1)), offset, end - offset, lines) if match else None
+
+
+def observations(filepath: str) -> Iterator[Observation]:
+    """
+    Every observation of a stream in file order, read one line at a time.
+
+    Consecutive lines that start with the same subject form one observation;
+    lines without a ``hasTimestamp`` triple (blank lines, comments, stream
+    metadata) are skipped.
+    """
+    subject, lines, start, end = None, [], 0, 0
+    for offset, length, line in _stream_lines(filepath):
+        match = _SUBJECT.match(line)
+        if not match:
+            continue
+        if lines and match.group(1) != subject:
+            observation = _observation(lines, start, end)
+            if observation:
+                yield observation
+            lines = []
+        if not lines:
+            start = offset
+        subject = match.group(1)
+        lines.append(line)
+        end = offset + length
+    if lines:
+        observation = _observation(lines, start, end)
+        if observation:
+            yield observation
+
+
+def build_index(filepath: str) -> np.ndarray:
+    """
+    Time-ordered index of a stream: timestamp, byte offset and byte length of
+    each observation (``INDEX_DTYPE``), sorted stably by timestamp.
+
+    Holds 24 bytes per observation instead of its triples, so unsorted streams
+    can be merged without loading them.
+    """
+    index = np.fromiter(((o.timestamp, o.offset, o.length) for o in observations(filepath)), dtype=INDEX_DTYPE)
+    return index[np.argsort(index['timestamp'], kind='stable')]
+
+
+def is_time_ordered(index: np.ndarray) -> bool:
+    """Whether the file already holds its observations in timestamp order."""
+    return bool((np.diff(index['offset']) > 0).all())
+
+
+def indexed_observations(filepath: str, index: np.ndarray) -> Iterator[Observation]:
+    """Observations of a stream in index order, each read from its byte range."""
+    template = None
+    if _is_compact(filepath):
+        with open(filepath) as reader:
+            template = next((line.rstrip('\n') for line in reader if line.startswith(TEMPLATE_DIRECTIVE)), None)
+    with open(filepath, 'rb') as reader:
+        for timestamp, offset, length in index:
+            reader.seek(offset)
+            lines = reader.read(length).decode('utf-8').splitlines()
+            if template is not None:
+                lines = [_expand_record(template, line) for line in lines if not line.startswith('#')]
+            lines = [line for line in lines if _SUBJECT.match(line)]
+            yield Observation(int(timestamp), int(offset), int(length), lines)
+
+
+def time_ordered_observations(filepath: str, assume_sorted: bool = False) -> Iterator[Observation]:
+    """
+    Observations of one stream in timestamp order.
+
+    Streams already in order in the file are read sequentially; otherwise the
+    stream is indexed once and read back by seeking in index order.
+    """
+    if assume_sorted:
+        return observations(filepath)
+    index = build_index(filepath)
+    if is_time_ordered(index):
+        return observations(filepath)
+    return indexed_observations(filepath, index)
+
+
+def _keyed(position: int, stream: Iterator[Observation]) -> Iterator[Tuple[int, int, Observation]]:
+    for observation in stream:
+        yield observation.timestamp, position, observation
+
+
+def merge_streams(filepaths: Sequence[str], assume_sorted: bool = False) -> Iterator[Tuple[int, Observation]]:
+    """
+    K-way merge of several streams into one globally time-ordered iterator.
+
+    Keeps one pending observation per stream in a heap, so merging n
+    observations from k streams costs O(n log k) and holds k observations
+    in memory. Ties are broken by stream order, making the merge
+    deterministic.
+
+    Yields:
+        Tuple of (index of the source stream in ``filepaths``, observation)
+    """
+    sources = [_keyed(position, time_ordered_observations(path, assume_sorted))
+               for position, path in enumerate(filepaths)]
+    for timestamp, position, observation in heapq.merge(*sources, key=lambda item: item[:2]):
+        yield position, observation
+
+
+def to_quads(line: str, graph: str) -> str:
+    """Rewrite an N-Triples line as N-Quads in ``graph``."""
+    return ' '.join(f'{s} {p} {o} <{graph}> .' for s, p, o in _TRIPLE.findall(line))
+
+
+def write_merged(filepaths: Sequence[str], names: Sequence[str], output: str, assume_sorted: bool = False) -> Dict:
+    """
+    Write the merged streams as N-Quads, one observation per line.
+
+    Every quad is placed in the ``urn:stream:<name>`` graph of its stream, so
+    observations whose subjects collide across streams stay apart and the
+    replayer knows which topic each one belongs to.
+
+    Returns:
+        Dict with the number of observations written per stream name
+    """
+    counts = {name: 0 for name in names}
+    graphs = [GRAPH_PREFIX + name for name in names]
+    with open(output, 'w') as writer:
+        writer.write(STREAMS_DIRECTIVE + ' '.join(names) + '\n')
+        for position, observation in merge_streams(filepaths, assume_sorted):
+            writer.write(' '.join(to_quads(line, graphs[position]) for line in observation.lines) + '\n')
+            counts[names[position]] += 1
+    return counts
+
+
+def _stream_argument(argument: str) -> Tuple[str, str]:
+    """``path[=name]``; the name defaults to the stream directory (e.g. smartphone.acceleration.x)."""
+    path, _, name = argument.partition('=')
+    return path, name or Path(path).parent.name
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge data.nt streams into one time-ordered N-Quads stream")
+    parser.add_argument("streams", nargs='+', help="Stream files as path[=name] (name defaults to the stream directory)")
+    parser.add_argument("--output", required=True, help="Merged N-Quads file")
+    parser.add_argument("--assume-sorted", action='store_true',
+                        help="Skip indexing, the streams are known to be in timestamp order")
+    args = parser.parse_args()
+
+    streams = [_stream_argument(argument) for argument in args.streams]
+    names = [name for _, name in streams]
+    if len(set(names)) != len(names):
+        parser.error(f"stream names must be unique, got {names}")
+
+    counts = write_merged([path for path, _ in streams], names, args.output, args.assume_sorted)
+    print(f"Merged {sum(counts.values())} observations from {len(counts)} streams into {args.output}")
+    for name, count in counts.items():
+        print(f"  {name}: {count}")
+
+
+if __name__ == "__main__":
+    main()
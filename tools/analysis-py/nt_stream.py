@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+import re
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+HAS_TIMESTAMP = 'https://saref.etsi.org/core/hasTimestamp'
+HAS_VALUE = 'https://saref.etsi.org/core/hasValue'
+
+STREAM_FILE = 'data.nt'
+# Observation-only encoding written by nt_compact.py
+COMPACT_STREAM_FILE = 'data.ntc'
+
+_TIMESTAMP_TRIPLE = re.compile(r'<([^>]+)> <' + re.escape(HAS_TIMESTAMP) + r'> "([^"]+)"')
+_VALUE_TRIPLE = re.compile(r'<([^>]+)> <' + re.escape(HAS_VALUE) + r'> "([^"]+)"')
+
+
+def parse_timestamps(iso_timestamps) -> np.ndarray:
+    """Convert xsd:dateTime literals to epoch milliseconds (int64)."""
+    parsed = pd.to_datetime(pd.Series(iso_timestamps, dtype=str), format='ISO8601', utc=True)
+    return ((parsed - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(milliseconds=1)).to_numpy(dtype=np.int64)
+
+
+def read_observations(filepath: str) -> pd.DataFrame:
+    """
+    Extract every observation of a ``data.nt`` stream.
+
+    Timestamps and values are matched per subject, so the result does not
+    depend on how the triples are spread over lines. Compact ``data.ntc``
+    streams are read from their records without expanding any triple.
+
+    Returns:
+        DataFrame with subject, timestamp (epoch ms) and value, in file order
+    """
+    if Path(filepath).name.endswith('.ntc'):
+        from nt_compact import read_compact_observations
+        observations = read_compact_observations(filepath)
+    else:
+        text = Path(filepath).read_text()
+        timestamps = pd.DataFrame(_TIMESTAMP_TRIPLE.findall(text), columns=['subject', 'time'])
+        values = pd.DataFrame(_VALUE_TRIPLE.findall(text), columns=['subject', 'value'])
+        observations = timestamps.merge(values, on='subject', how='inner', sort=False)
+    return pd.DataFrame({
+        'subject': observations['subject'].to_numpy(),
+        'timestamp': parse_timestamps(observations['time']),
+        'value': pd.to_numeric(observations['value'], errors='coerce').to_numpy(),
+    })
+
+
+def read_stream(filepath: str, sort: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Read the (timestamp, value) series of one ``data.nt`` stream.
+
+    Returns:
+        Tuple of int64 epoch-millisecond timestamps and float64 values,
+        sorted by time unless ``sort`` is False
+    """
+    observations = read_observations(filepath)
+    timestamps = observations['timestamp'].to_numpy()
+    values = observations['value'].to_numpy(dtype=float)
+    if sort:
+        order = np.argsort(timestamps, kind='stable')
+        timestamps, values = timestamps[order], values[order]
+    return timestamps, values
+
+
+def read_streams(filepaths: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Read several streams and combine them into one time-ordered series (UNION of the windows)."""
+    series = [read_stream(path) for path in filepaths]
+    timestamps = np.concatenate([s[0] for s in series])
+    values = np.concatenate([s[1] for s in series])
+    order = np.argsort(timestamps, kind='stable')
+    return timestamps[order], values[order]
+
+
+def _one_per_stream(files: List[Path]) -> List[Path]:
+    """Keep ``data.nt`` over ``data.ntc`` when a stream directory holds both."""
+    streams = {}
+    for path in sorted(files):
+        if path.name == STREAM_FILE or path.parent not in streams:
+            streams[path.parent] = path
+    return sorted(streams.values())
+
+
+def find_streams(dataset_dir: str) -> List[Path]:
+    """List the ``<stream>/data.nt`` files of a dataset directory (``data.ntc`` where only that exists)."""
+    root = Path(dataset_dir)
+    return _one_per_stream(list(root.glob(f'*/{STREAM_FILE}')) + list(root.glob(f'*/{COMPACT_STREAM_FILE}')))
+
+
+def find_all_streams(root: str) -> List[Path]:
+    """Every stream file anywhere under a directory, one per stream directory."""
+    root = Path(root)
+    return _one_per_stream(list(root.rglob(STREAM_FILE)) + list(root.rglob(COMPACT_STREAM_FILE)))
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+
+import argparse
+from collections import deque
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from nt_stream import read_streams
+
+AGGREGATIONS = ['AVG', 'MAX', 'MIN', 'SUM', 'COUNT']
+
+
+def window_bounds(first_timestamp: int, last_timestamp: int, range_ms: int, step_ms: int,
+                  align: bool = False, complete_only: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Enumerate the RSP-QL ``[RANGE range_ms STEP step_ms]`` windows over a time span.
+
+    Windows are half-open ``[start, start + range_ms)`` and open every
+    ``step_ms`` from the first timestamp, or from the last multiple of
+    ``step_ms`` before it when ``align`` is set.
+
+    Args:
+        complete_only: Drop trailing windows that close after the last timestamp
+
+    Returns:
+        Tuple of window start and end arrays (epoch ms)
+    """
+    origin = (first_timestamp // step_ms) * step_ms if align else first_timestamp
+    count = (last_timestamp - origin) // step_ms + 1
+    starts = origin + np.arange(count, dtype=np.int64) * step_ms
+    ends = starts + range_ms
+    if complete_only:
+        keep = ends <= last_timestamp + 1
+        starts, ends = starts[keep], ends[keep]
+    return starts, ends
+
+
+def sliding_extreme(values: np.ndarray, lo: np.ndarray, hi: np.ndarray, largest: bool = True) -> np.ndarray:
+    """
+    MAX (or MIN) of ``values[lo[w]:hi[w]]`` for every window with a monotonic deque.
+
+    ``lo`` and ``hi`` must be non-decreasing, which holds for sliding windows,
+    so every value enters and leaves the deque once: amortized O(1) per window.
+    """
+    signed = values if largest else -values
+    result = np.full(len(lo), np.nan)
+    window = deque()
+    added = 0
+    for w in range(len(lo)):
+        while added < hi[w]:
+            while window and signed[window[-1]] <= signed[added]:
+                window.pop()
+            window.append(added)
+            added += 1
+        while window and window[0] < lo[w]:
+            window.popleft()
+        if window:
+            result[w] = values[window[0]]
+    return result
+
+
+def aggregate_windows(timestamps: np.ndarray, values: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                      aggregations: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Exact aggregates of a time-ordered series over half-open ``[start, end)`` windows.
+
+    SUM, COUNT and AVG come from prefix sums and MAX/MIN from monotonic
+    deques, so the cost is O(points + windows) regardless of the overlap.
+    Starts and ends must be non-decreasing. Non-finite values (literals that
+    did not parse) are skipped, like ``chunk_aggregates.build_chunks`` does.
+
+    Returns:
+        DataFrame with window_start, window_end and one column per aggregation
+        (lower-case); windows without finite values have count 0 and NaN for the others
+    """
+    aggregations = [a.upper() for a in (aggregations or AGGREGATIONS)]
+    lo = np.searchsorted(timestamps, starts, side='left')
+    hi = np.searchsorted(timestamps, ends, side='left')
+    finite = np.isfinite(values)
+    finite_prefix = np.concatenate(([0], np.cumsum(finite)))
+    counts = finite_prefix[hi] - finite_prefix[lo]
+    prefix = np.concatenate(([0.0], np.cumsum(np.where(finite, values, 0.0), dtype=np.float64)))
+    sums = prefix[hi] - prefix[lo]
+
+    result = {'window_start': starts, 'window_end': ends}
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for aggregation in aggregations:
+            if aggregation == 'COUNT':
+                result['count'] = counts
+            elif aggregation == 'SUM':
+                result['sum'] = sums
+            elif aggregation == 'AVG':
+                result['avg'] = np.where(counts > 0, sums / counts, np.nan)
+            elif aggregation == 'MAX':
+                extreme = sliding_extreme(np.where(finite, values, -np.inf), lo, hi, largest=True)
+                result['max'] = np.where(counts > 0, extreme, np.nan)
+            elif aggregation == 'MIN':
+                extreme = sliding_extreme(np.where(finite, values, np.inf), lo, hi, largest=False)
+                result['min'] = np.where(counts > 0, extreme, np.nan)
+            else:
+                raise ValueError(f"Unsupported aggregation: {aggregation}")
+    return pd.DataFrame(result)
+
+
+def compute_reference(timestamps: np.ndarray, values: np.ndarray, range_ms: int, step_ms: int,
+                      aggregations: Optional[List[str]] = None, align: bool = False,
+                      complete_only: bool = False) -> pd.DataFrame:
+    """Exact aggregates of every RANGE/STEP window over a time-ordered series."""
+    if len(timestamps) == 0:
+        aggregations = aggregations or AGGREGATIONS
+        return pd.DataFrame(columns=['window_start', 'window_end'] + [a.lower() for a in aggregations])
+    starts, ends = window_bounds(int(timestamps[0]), int(timestamps[-1]), range_ms, step_ms, align, complete_only)
+    return aggregate_windows(timestamps, values, starts, ends, aggregations)
+
+
+def reference_for_files(filepaths: List[str], range_ms: int, step_ms: int,
+                        aggregations: Optional[List[str]] = None, align: bool = False,
+                        complete_only: bool = False) -> pd.DataFrame:
+    """Exact window aggregates over the union of one or more ``data.nt`` streams."""
+    timestamps, values = read_streams(filepaths)
+    return compute_reference(timestamps, values, range_ms, step_ms, aggregations, align, complete_only)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exact RANGE/STEP sliding-window ground truth for data.nt streams")
+    parser.add_argument("files", nargs='+', help="data.nt streams, combined as in a UNION query")
+    parser.add_argument("--range", type=int, default=120000, help="Window RANGE in ms")
+    parser.add_argument("--step", type=int, default=60000, help="Window STEP in ms")
+    parser.add_argument("--aggregations", nargs='+', default=AGGREGATIONS, help="Aggregations to compute")
+    parser.add_argument("--align", action='store_true', help="Align window starts to multiples of STEP")
+    parser.add_argument("--complete-only", action='store_true', help="Skip windows that end after the data")
+    parser.add_argument("--output", help="Optional CSV output path")
+    args = parser.parse_args()
+
+    reference = reference_for_files(args.files, args.range, args.step, args.aggregations, args.align, args.complete_only)
+    print(reference.to_string(index=False))
+    if args.output:
+        reference.to_csv(args.output, index=False)
+        print(f"\nReference windows saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent
+
+# Searched in order; the first script producing a given set of figures wins over later copies
+DEFAULT_FIGURE_ROOTS = [
+    TOOLS_DIR / 'analysis-py',
+    TOOLS_DIR / 'scripts',
+    TOOLS_DIR / 'legacy-analysis' / 'visualization',
+]
+
+CACHE_FILE = '.figure_cache.json'
+RENDER_TIMEOUT_S = 600
+
+_OUTPUT_PATTERN = re.compile(r'savefig\(\s*[\'"]([^\'"]+)[\'"]')
+_INPUT_PATTERN = re.compile(r'[\'"]([^\'"\s]+\.(?:csv|json|parquet))[\'"]')
+
+
+def discover_figures(roots: Optional[List[Path]] = None) -> List[Dict]:
+    """
+    Find every plotting script and the data files it reads and writes.
+
+    A figure definition is any script calling ``savefig`` with a literal
+    path; literal ``.csv``/``.json``/``.parquet`` paths it mentions are its inputs.
+    """
+    figures = []
+    seen_outputs = set()
+    for root in roots or DEFAULT_FIGURE_ROOTS:
+        for script in sorted(Path(root).glob('*.py')):
+            source = script.read_text()
+            outputs = sorted(set(_OUTPUT_PATTERN.findall(source)))
+            if not outputs or script.resolve() == Path(__file__).resolve():
+                continue
+            if tuple(outputs) in seen_outputs:
+                continue
+            seen_outputs.add(tuple(outputs))
+            inputs = sorted(set(_INPUT_PATTERN.findall(source)) - set(outputs))
+            figures.append({
+                'name': script.stem,
+                'script': str(script),
+                'inputs': inputs,
+                'outputs': outputs,
+            })
+    return figures
+
+
+def figure_hash(figure: Dict, workdir: Path) -> Optional[str]:
+    """Hash the script and all of its inputs; None when an input is missing."""
+    digest = hashlib.sha256(Path(figure['script']).read_bytes())
+    for name in figure['inputs']:
+        path = workdir / name
+        if not path.exists():
+            return None
+        digest.update(name.encode())
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def render_figure(job: Dict) -> Dict:
+    """Run one plotting script headless (Agg backend, so plt.show() returns immediately)."""
+    workdir = Path(job['workdir'])
+    for output in job['outputs']:
+        (workdir / output).parent.mkdir(parents=True, exist_ok=True)
+    env = {**os.environ, 'MPLBACKEND': 'Agg'}
+    start = time.time()
+    try:
+        completed = subprocess.run([sys.executable, job['script']], cwd=workdir, env=env,
+                                   capture_output=True, text=True, timeout=RENDER_TIMEOUT_S)
+        ok = completed.returncode == 0
+        detail = '' if ok else (completed.stderr.strip().splitlines() or ['failed'])[-1]
+    except subprocess.TimeoutExpired:
+        ok, detail = False, f'timed out after {RENDER_TIMEOUT_S}s'
+    return {'name': job['name'], 'status': 'rendered' if ok else 'failed',
+            'seconds': round(time.time() - start, 2), 'detail': detail, 'hash': job['hash']}
+
+
+def render_all(workdir: str, roots: Optional[List[Path]] = None, force: bool = False,
+               jobs: Optional[int] = None, only: Optional[List[str]] = None) -> List[Dict]:
+    """
+    Render every stale figure in parallel and update the hash cache.
+
+    A figure is stale when its script or input hash changed since the last
+    successful render or one of its outputs is missing.
+    """
+    workdir = Path(workdir).resolve()
+    cache_path = workdir / CACHE_FILE
+    cache = json.loads(cache_path.read_text()) if cache_path.exists() else {}
+
+    results, pending = [], []
+    for figure in discover_figures(roots):
+        if only and figure['name'] not in only:
+            continue
+        current = figure_hash(figure, workdir)
+        if current is None:
+            results.append({'name': figure['name'], 'status': 'missing input', 'seconds': 0,
+                            'detail': ', '.join(i for i in figure['inputs'] if not (workdir / i).exists())})
+            continue
+        outputs_exist = all((workdir / output).exists() for output in figure['outputs'])
+        if not force and outputs_exist and cache.get(figure['script']) == current:
+            results.append({'name': figure['name'], 'status': 'up to date', 'seconds': 0, 'detail': ''})
+            continue
+        pending.append({**figure, 'workdir': str(workdir), 'hash': current})
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+            for job, result in zip(pending, executor.map(render_figure, pending)):
+                if result['status'] == 'rendered':
+                    cache[job['script']] = result['hash']
+                results.append({k: v for k, v in result.items() if k != 'hash'})
+        cache_path.write_text(json.dumps(cache, indent=2, sort_keys=True))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render all report figures headless, skipping unchanged ones")
+    parser.add_argument("--workdir", default=".", help="Directory the plotting scripts read from and write to")
+    parser.add_argument("--roots", nargs='*', type=Path, help="Directories to discover plotting scripts in")
+    parser.add_argument("--only", nargs='*', help="Only render these figures (script names)")
+    parser.add_argument("--jobs", type=int, help="Process pool size")
+    parser.add_argument("--force", action='store_true', help="Re-render even if inputs are unchanged")
+    parser.add_argument("--list", action='store_true', help="List discovered figure definitions and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for figure in discover_figures(args.roots):
+            print(f"{figure['name']}: {', '.join(figure['inputs']) or '-'} -> {', '.join(figure['outputs'])}")
+        return
+
+    results = render_all(args.workdir, args.roots, args.force, args.jobs, args.only)
+    for result in sorted(results, key=lambda r: r['name']):
+        detail = f" ({result['detail']})" if result['detail'] else ''
+        print(f"  {result['status']:<13} {result['name']:<40} {result['seconds']:>6.2f}s{detail}")
+    counts = {}
+    for result in results:
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+    print("\n" + ", ".join(f"{count} {status}" for status, count in sorted(counts.items())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from bootstrap_comparison import resource_metrics
+from dataset_catalog import parse_dataset_name
+from evaluate_accuracy_matrix import (DEFAULT_RANGE_MS, approach_aggregation, dataset_aliases, discover_datasets,
+                                      evaluate_cell)
+from experiment_logs import RUN_KEYS, discover_runs, read_message_log, read_resource_log, run_log_paths
+from latency_engine import (CONTENT_STEP_MS, PERCENTILES, compute_window_latencies, extract_outputs, read_publishes,
+                            replay_summaries)
+
+DEFAULT_DATABASE = 'results_warehouse.sqlite'
+
+# Family of a dataset that is not under the data root, from its parameter name
+PARAMETER_FAMILIES = {'rate': 'rate_comparison', 'freq': 'frequency_comparison', 'noise': 'noisy_datasets'}
+# Parameter names used by the JSON summaries, mapped to the dataset naming
+SUMMARY_PARAMETERS = {'rate': 'rate', 'frequency': 'freq', 'noise': 'noise', 'noiseLevel': 'noise'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    experiment TEXT NOT NULL,
+    family TEXT,
+    dataset TEXT NOT NULL,
+    pattern TEXT,
+    parameter_name TEXT,
+    parameter REAL,
+    approach TEXT NOT NULL,
+    iteration INTEGER NOT NULL,
+    path TEXT,
+    windows INTEGER,
+    latency_p50_ms REAL,
+    latency_p95_ms REAL,
+    latency_p99_ms REAL,
+    aggregation TEXT,
+    mean_abs_error REAL,
+    cpu_percent REAL,
+    heap_used_mb REAL,
+    heap_peak_mb REAL,
+    intended INTEGER,
+    successful INTEGER,
+    failed INTEGER,
+    UNIQUE (experiment, dataset, approach, iteration)
+);
+CREATE INDEX IF NOT EXISTS runs_lookup ON runs (approach, family, parameter, iteration);
+
+CREATE TABLE IF NOT EXISTS windows (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    window_index INTEGER NOT NULL,
+    window_end INTEGER,
+    emitted_at INTEGER,
+    value REAL,
+    latency_ms REAL,
+    reference REAL,
+    error REAL,
+    PRIMARY KEY (run_id, window_index)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS resource_samples (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    timestamp INTEGER NOT NULL,
+    cpu_user REAL,
+    cpu_system REAL,
+    rss INTEGER,
+    heap_total INTEGER,
+    heap_used INTEGER,
+    external INTEGER
+);
+CREATE INDEX IF NOT EXISTS resource_samples_run ON resource_samples (run_id, timestamp);
+
+CREATE TABLE IF NOT EXISTS replayer_summaries (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    timestamp INTEGER,
+    intended INTEGER,
+    successful INTEGER,
+    failed INTEGER
+);
+CREATE INDEX IF NOT EXISTS replayer_summaries_run ON replayer_summaries (run_id);
+
+CREATE TABLE IF NOT EXISTS summary_metrics (
+    source TEXT NOT NULL,
+    family TEXT,
+    pattern TEXT,
+    parameter_name TEXT,
+    parameter REAL,
+    approach TEXT,
+    iteration INTEGER,
+    metric TEXT NOT NULL,
+    value REAL
+);
+CREATE INDEX IF NOT EXISTS summary_metrics_lookup ON summary_metrics (approach, family, parameter, iteration);
+"""
+
+RUN_COLUMNS = ['experiment', 'family', 'dataset', 'pattern', 'parameter_name', 'parameter', 'approach', 'iteration',
+               'path', 'windows', 'latency_p50_ms', 'latency_p95_ms', 'latency_p99_ms', 'aggregation',
+               'mean_abs_error', 'cpu_percent', 'heap_used_mb', 'heap_peak_mb', 'intended', 'successful', 'failed']
+WINDOW_COLUMNS = ['window_index', 'window_end', 'emitted_at', 'value', 'latency_ms', 'reference', 'error']
+RESOURCE_COLUMNS = ['timestamp', 'cpu_user', 'cpu_system', 'rss', 'heap_total', 'heap_used', 'external']
+SUMMARY_COLUMNS = ['source', 'family', 'pattern', 'parameter_name', 'parameter', 'approach', 'iteration',
+                   'metric', 'value']
+
+# Ready-made cross-experiment questions for ``query --named``
+NAMED_QUERIES = {
+    'latency-vs-parameter': """
+        SELECT approach, family, parameter_name, parameter, COUNT(*) AS runs,
+               AVG(latency_p50_ms) AS latency_p50_ms, AVG(latency_p99_ms) AS latency_p99_ms
+        FROM runs WHERE latency_p99_ms IS NOT NULL
+        GROUP BY approach, family, parameter_name, parameter ORDER BY family, approach, parameter""",
+    'resources-vs-parameter': """
+        SELECT approach, family, parameter_name, parameter, COUNT(*) AS runs,
+               AVG(cpu_percent) AS cpu_percent, MAX(heap_peak_mb) AS heap_peak_mb
+        FROM runs GROUP BY approach, family, parameter_name, parameter ORDER BY family, approach, parameter""",
+    'error-vs-parameter': """
+        SELECT approach, family, parameter_name, parameter, COUNT(*) AS runs, AVG(mean_abs_error) AS mean_abs_error
+        FROM runs WHERE mean_abs_error IS NOT NULL
+        GROUP BY approach, family, parameter_name, parameter ORDER BY family, approach, parameter""",
+    'summary-accuracy': """
+        SELECT source, family, pattern, parameter_name, parameter, approach, value AS accuracy
+        FROM summary_metrics WHERE metric = 'accuracy' ORDER BY family, pattern, parameter""",
+}
+
+
+def connect(database: str) -> sqlite3.Connection:
+    """Open (and create) the warehouse."""
+    connection = sqlite3.connect(database)
+    connection.execute('PRAGMA journal_mode = WAL')
+    connection.executescript(SCHEMA)
+    if 'aggregation' not in {column[1] for column in connection.execute('PRAGMA table_info(runs)')}:
+        # Warehouses created before runs recorded the aggregation their errors were scored with
+        connection.execute('ALTER TABLE runs ADD COLUMN aggregation TEXT')
+    return connection
+
+
+def describe_dataset(dataset: str, experiment: str, aliases: Dict[str, Tuple[str, str]]) -> Dict:
+    """
+    Family, pattern and (single) parameter of a logged dataset name.
+
+    Datasets that are not under the data root fall back to the family of
+    their parameter when they carry a pattern, else to the experiment name.
+    """
+    family, name = aliases.get(dataset, (None, dataset))
+    pattern, parameters = parse_dataset_name(name)
+    parameter_name, parameter = next(iter(parameters.items()), (None, None))
+    if family is None:
+        family = PARAMETER_FAMILIES.get(parameter_name) if pattern else None
+        family = family or experiment
+    return {'family': family, 'pattern': pattern or None, 'parameter_name': parameter_name, 'parameter': parameter}
+
+
+def load_run(job: Dict) -> Dict:
+    """Parse every log of one run into warehouse rows (runs on a worker process)."""
+    run = job['run']
+    paths = run_log_paths(Path(run['path']), run['approach'])
+    row = {column: None for column in RUN_COLUMNS}
+    row.update({key: run[key] for key in RUN_KEYS}, path=run['path'], **job['dataset'])
+    windows = pd.DataFrame(columns=WINDOW_COLUMNS)
+    resources = pd.DataFrame(columns=RESOURCE_COLUMNS)
+    summaries = pd.DataFrame(columns=['timestamp', 'intended', 'successful', 'failed'])
+
+    replay = pd.DataFrame()
+    if paths['replayer'].exists():
+        replayer = read_message_log(paths['replayer'])
+        summaries = replay_summaries(replayer)
+        row.update(summaries[['intended', 'successful', 'failed']].sum().astype(int).to_dict())
+        replay = read_publishes(replayer)
+
+    if paths['messages'].exists():
+        outputs = extract_outputs(read_message_log(paths['messages']), run['approach'])
+        outputs = outputs.sort_values('window_end').reset_index(drop=True)
+        outputs['window_index'] = np.arange(len(outputs))
+        windows = outputs.assign(latency_ms=np.nan, reference=np.nan, error=np.nan)
+        if not outputs.empty and not replay.empty:
+            latencies = compute_window_latencies(outputs, replay, CONTENT_STEP_MS[run['approach']])
+            latencies = latencies.set_index('window_index')['latency_ms']
+            windows['latency_ms'] = windows['window_index'].map(latencies)
+            quantiles = np.quantile(latencies, PERCENTILES) if len(latencies) else [None] * len(PERCENTILES)
+            row.update({f'latency_p{int(q * 100)}_ms': v for q, v in zip(PERCENTILES, quantiles)})
+        if job.get('cell') and not outputs.empty:
+            # Same window order (sorted by window_end) as evaluate_cell
+            reference = evaluate_cell({**job['cell'], 'run_path': run['path']})['windows']
+            row['aggregation'] = job['cell']['aggregation']
+            if len(reference) == len(windows):
+                windows['reference'] = reference['reference'].to_numpy()
+                windows['error'] = reference['error'].to_numpy()
+                row['mean_abs_error'] = float(np.nanmean(np.abs(windows['error']))) if windows['error'].notna().any() else None
+        row['windows'] = len(windows)
+        windows = windows[WINDOW_COLUMNS]
+
+    if paths['resources'].exists():
+        samples = read_resource_log(paths['resources'])
+        if len(samples) > 1:
+            row.update(resource_metrics(samples))
+        resources = samples.rename(columns={'heapTotal': 'heap_total', 'heapUsed': 'heap_used'})
+        resources = resources.reindex(columns=RESOURCE_COLUMNS)
+    return {'run': row, 'windows': windows, 'resources': resources, 'summaries': summaries}
+
+
+def _records(frame: pd.DataFrame, run_id: Optional[int] = None) -> List[Tuple]:
+    """Rows as tuples of plain Python values (NaN -> NULL), optionally prefixed with the run id."""
+    frame = frame.astype(object).where(frame.notna(), None)
+    rows = frame.itertuples(index=False, name=None)
+    return [(run_id,) + row for row in rows] if run_id is not None else list(rows)
+
+
+def store_run(connection: sqlite3.Connection, result: Dict) -> int:
+    """Insert one run, replacing an earlier load of the same (experiment, dataset, approach, iteration)."""
+    run = result['run']
+    existing = connection.execute(
+        'SELECT run_id FROM runs WHERE experiment = ? AND dataset = ? AND approach = ? AND iteration = ?',
+        (run['experiment'], run['dataset'], run['approach'], int(run['iteration']))).fetchone()
+    if existing:
+        for table in ('windows', 'resource_samples', 'replayer_summaries', 'runs'):
+            connection.execute(f'DELETE FROM {table} WHERE run_id = ?', existing)
+    values = _records(pd.DataFrame([run], columns=RUN_COLUMNS))[0]
+    cursor = connection.execute(f"INSERT INTO runs ({', '.join(RUN_COLUMNS)}) "
+                                f"VALUES ({', '.join('?' * len(RUN_COLUMNS))})", values)
+    run_id = cursor.lastrowid
+    connection.executemany(f"INSERT INTO windows (run_id, {', '.join(WINDOW_COLUMNS)}) "
+                           f"VALUES ({', '.join('?' * (len(WINDOW_COLUMNS) + 1))})",
+                           _records(result['windows'], run_id))
+    connection.executemany(f"INSERT INTO resource_samples (run_id, {', '.join(RESOURCE_COLUMNS)}) "
+                           f"VALUES ({', '.join('?' * (len(RESOURCE_COLUMNS) + 1))})",
+                           _records(result['resources'], run_id))
+    connection.executemany('INSERT INTO replayer_summaries (run_id, timestamp, intended, successful, failed) '
+                           'VALUES (?, ?, ?, ?, ?)', _records(result['summaries'], run_id))
+    return run_id
+
+
+def load_logs(connection: sqlite3.Connection, log_root: str, data_root: Optional[str] = None,
+              range_ms: int = DEFAULT_RANGE_MS, aggregation: Optional[str] = None,
+              workers: Optional[int] = None) -> int:
+    """
+    Bulk-load every run under a log root, parsing runs on a process pool.
+
+    With a data root, logged dataset names are resolved to their family and
+    every window gets its exact reference value and error, for the
+    aggregation the run's approach registers unless ``aggregation``
+    overrides it; runs record the aggregation they were scored with.
+
+    Returns:
+        Number of runs loaded
+    """
+    runs = discover_runs(log_root)
+    datasets = pd.DataFrame(columns=['family', 'dataset', 'path'])
+    if data_root:
+        # Every family directory, including generated ones such as capacity_sweep
+        families = [d.name for d in sorted(Path(data_root).iterdir()) if d.is_dir() and not (d / 'data.nt').exists()]
+        datasets = discover_datasets(data_root, families)
+    aliases, paths = {}, {}
+    for row in datasets.itertuples():
+        for alias in dataset_aliases(row.dataset):
+            aliases.setdefault(alias, (row.family, row.dataset))
+            paths.setdefault(alias, row.path)
+
+    jobs = []
+    for run in runs.to_dict('records'):
+        described = describe_dataset(run['dataset'], run['experiment'], aliases)
+        cell = None
+        if run['dataset'] in paths:
+            family, dataset = aliases[run['dataset']]
+            cell = {'family': family, 'dataset': dataset, 'approach': run['approach'], 'iteration': run['iteration'],
+                    'path': paths[run['dataset']], 'range_ms': range_ms,
+                    'aggregation': approach_aggregation(run['approach'], aggregation)}
+        jobs.append({'run': run, 'dataset': described, 'cell': cell})
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        results = list(executor.map(load_run, jobs, chunksize=4))
+    with connection:
+        for result in results:
+            store_run(connection, result)
+    return len(results)
+
+
+def _summary_record_rows(source: str, record: Dict, defaults: Dict) -> List[Dict]:
+    """Metric rows of one result record of a JSON summary (nested dicts are flattened)."""
+    keys = dict(defaults)
+    for name, parameter in SUMMARY_PARAMETERS.items():
+        if isinstance(record.get(name), (int, float)):
+            keys.update(parameter_name=parameter, parameter=float(record[name]),
+                        family=PARAMETER_FAMILIES.get(parameter, keys.get('family')))
+    if isinstance(record.get('pattern'), str):
+        keys['pattern'] = record['pattern']
+    if isinstance(record.get('iteration'), int):
+        keys['iteration'] = record['iteration']
+
+    rows = []
+    flat = {**{k: v for k, v in record.items() if not isinstance(v, dict)},
+            **{k: v for nested in record.values() if isinstance(nested, dict) for k, v in nested.items()}}
+    for metric, value in flat.items():
+        if metric in SUMMARY_PARAMETERS or metric == 'iteration':
+            continue
+        if isinstance(value, bool):
+            value = float(value)
+        if isinstance(value, (int, float)):
+            rows.append({**keys, 'source': source, 'metric': metric, 'value': float(value)})
+    return rows
+
+
+def summary_rows(filepath: Path) -> List[Dict]:
+    """
+    Long metric rows of one experiment summary.
+
+    JSON summaries written by the experiment runners contribute every numeric
+    field of their ``results`` / ``detailedResults`` records; comparison CSVs
+    every numeric column per pattern. The approach is taken from the file name
+    prefix, other files compare approaches.
+    """
+    approach = next((a for a in ('approximation', 'fetching', 'chunked') if filepath.name.startswith(a)), 'comparison')
+    defaults = {column: None for column in SUMMARY_COLUMNS}
+    defaults['approach'] = approach
+    if filepath.suffix == '.csv':
+        table = pd.read_csv(filepath)
+        pattern_column = next((c for c in table.columns if c.lower() == 'pattern'), None)
+        numeric = table.select_dtypes('number')
+        rows = []
+        for index, values in numeric.iterrows():
+            pattern = str(table.at[index, pattern_column]).replace(' ', '_', 1) if pattern_column else None
+            rows.extend({**defaults, 'source': filepath.name, 'pattern': pattern, 'metric': metric, 'value': value}
+                        for metric, value in values.items() if pd.notna(value))
+        return rows
+
+    summary = json.loads(filepath.read_text())
+    if isinstance(summary.get('oscillationType'), str):
+        defaults['pattern'] = summary['oscillationType']
+    rows = []
+    for key in ('results', 'detailedResults'):
+        for record in summary.get(key) or []:
+            if isinstance(record, dict):
+                rows.extend(_summary_record_rows(filepath.name, record, defaults))
+    return rows
+
+
+def load_summaries(connection: sqlite3.Connection, filepaths: List[Path]) -> int:
+    """Replace the metric rows of every given summary file; returns the number of rows loaded."""
+    total = 0
+    with connection:
+        for filepath in filepaths:
+            rows = pd.DataFrame(summary_rows(filepath), columns=SUMMARY_COLUMNS)
+            connection.execute('DELETE FROM summary_metrics WHERE source = ?', (filepath.name,))
+            connection.executemany(f"INSERT INTO summary_metrics ({', '.join(SUMMARY_COLUMNS)}) "
+                                   f"VALUES ({', '.join('?' * len(SUMMARY_COLUMNS))})", _records(rows))
+            total += len(rows)
+    return total
+
+
+def query(connection: sqlite3.Connection, sql: str, params: Tuple = ()) -> pd.DataFrame:
+    """Run a SQL query against the warehouse."""
+    return pd.read_sql_query(sql, connection, params=params)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedded SQLite warehouse of runs, windows, resources and summaries")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    load = subparsers.add_parser("load", help="Bulk-load experiment logs and summaries")
+    load.add_argument("--log-root", default="tools/experiment-logs", help="Root of the experiment log tree")
+    load.add_argument("--data-root", default="src/streamer/data", help="Dataset root (families and references)")
+    load.add_argument("--summaries", nargs='*', help="Summary JSON/CSV files (default: every JSON under the log "
+                                                     "root and tools/temp-results/comparison-results.csv)")
+    load.add_argument("--range", type=int, default=DEFAULT_RANGE_MS, help="Registered query RANGE in ms")
+    load.add_argument("--aggregation",
+                      help="Aggregation to score every run against (default: the one each approach registers)")
+    load.add_argument("--workers", type=int, help="Process pool size")
+
+    ask = subparsers.add_parser("query", help="Query the warehouse")
+    ask.add_argument("sql", nargs='?', help="SQL statement")
+    ask.add_argument("--named", choices=list(NAMED_QUERIES), help="Run a ready-made query")
+    ask.add_argument("--output", help="Optional CSV output path")
+
+    for sub in (load, ask):
+        sub.add_argument("--database", default=DEFAULT_DATABASE, help="SQLite database file")
+    args = parser.parse_args()
+
+    connection = connect(args.database)
+    if args.command == "load":
+        start = time.perf_counter()
+        runs = load_logs(connection, args.log_root, args.data_root if Path(args.data_root).is_dir() else None,
+                         args.range, args.aggregation, args.workers)
+        if args.summaries is None:
+            summaries = sorted(Path(args.log_root).rglob('*.json'))
+            legacy = Path('tools/temp-results/comparison-results.csv')
+            summaries += [legacy] if legacy.exists() else []
+        else:
+            summaries = [Path(p) for p in args.summaries]
+        metrics = load_summaries(connection, summaries)
+        counts = {table: connection.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                  for table in ('runs', 'windows', 'resource_samples', 'replayer_summaries', 'summary_metrics')}
+        print(f"Loaded {runs} runs and {metrics} summary metrics from {len(summaries)} files "
+              f"in {time.perf_counter() - start:.1f}s")
+        print("Warehouse rows: " + ", ".join(f"{table} {count}" for table, count in counts.items()))
+        print(f"Warehouse saved to: {args.database}")
+        return
+
+    if not args.sql and not args.named:
+        parser.error("query needs SQL or --named")
+    start = time.perf_counter()
+    result = query(connection, NAMED_QUERIES[args.named] if args.named else args.sql)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    pd.set_option('display.width', 200)
+    print(result.to_string(index=False) if not result.empty else "No rows")
+    print(f"\n{len(result)} rows in {elapsed_ms:.1f} ms")
+    if args.output:
+        result.to_csv(args.output, index=False)
+        print(f"Query result saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
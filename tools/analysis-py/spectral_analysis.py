@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from evaluate_accuracy_matrix import DATASET_FAMILIES, discover_datasets
+from nt_stream import find_streams, read_stream
+
+DEFAULT_SEGMENT = 128
+DEFAULT_OVERLAP = 0.5
+# Bins either side of an expected component still counted as that component (window leakage)
+DEFAULT_TOLERANCE_BINS = 2
+# Share of power folded from above Nyquist from which a stream counts as aliased
+ALIAS_THRESHOLD = 0.05
+
+# Harmonic model of HighFrequencyOscillationGenerator.generate_complex_oscillation
+COMPLEX_HARMONICS = [1, 3, 5]
+COMPLEX_AMPLITUDES = [1.0, 0.3, 0.1]
+
+ALIASING_COLUMNS = ['family', 'dataset', 'stream', 'samples', 'fs_hz', 'nyquist_hz', 'dominant_hz', 'expected_hz',
+                    'apparent_shift_hz', 'predicted_alias_power', 'measured_alias_power', 'aliased']
+
+_FREQUENCY_PATTERN = re.compile(r'freq_(\d+(?:\.\d+)?)')
+
+
+def welch(x: np.ndarray, fs: float, nperseg: int = DEFAULT_SEGMENT,
+          overlap: float = DEFAULT_OVERLAP) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Welch power spectral density of every row of ``x`` at once.
+
+    Rows are split into Hann-windowed, mean-detrended segments, all segments
+    of all rows go through one ``rfft`` call and the periodograms are averaged
+    per row (one-sided density, as ``scipy.signal.welch``).
+
+    Returns:
+        Tuple of (frequencies, PSD with shape ``x.shape[:-1] + (frequencies,)``)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    n = x.shape[-1]
+    nperseg = min(nperseg, n)
+    step = max(nperseg - int(nperseg * overlap), 1)
+    n_segments = 1 + (n - nperseg) // step
+    index = np.arange(nperseg)[None, :] + step * np.arange(n_segments)[:, None]
+    segments = x[..., index]
+    segments = segments - segments.mean(axis=-1, keepdims=True)
+    window = 0.5 - 0.5 * np.cos(2 * np.pi * np.arange(nperseg) / nperseg)
+    spectrum = np.abs(np.fft.rfft(segments * window, axis=-1)) ** 2 / (fs * (window ** 2).sum())
+    if nperseg % 2 == 0:
+        spectrum[..., 1:-1] *= 2
+    else:
+        spectrum[..., 1:] *= 2
+    return np.fft.rfftfreq(nperseg, 1 / fs), spectrum.mean(axis=-2)
+
+
+def folded_frequency(frequency: np.ndarray, fs: float) -> np.ndarray:
+    """Frequency a component appears at after sampling at ``fs`` (folded into ``[0, fs/2]``)."""
+    return np.abs(frequency - fs * np.round(np.asarray(frequency) / fs))
+
+
+def expected_components(dataset: str) -> Optional[List[Tuple[float, float]]]:
+    """
+    (frequency, amplitude) components a generated dataset was built from.
+
+    Derived from the ``*_freq_<hz>`` naming of the frequency-comparison
+    generator; None when the dataset name carries no frequency.
+    """
+    match = _FREQUENCY_PATTERN.search(dataset)
+    if not match:
+        return None
+    frequency = float(match.group(1))
+    if 'complex' in dataset:
+        return [(frequency * h, a) for h, a in zip(COMPLEX_HARMONICS, COMPLEX_AMPLITUDES)]
+    return [(frequency, 1.0)]
+
+
+def _load_stream(path: str) -> Tuple[np.ndarray, np.ndarray]:
+    return read_stream(path)
+
+
+def aliasing_metrics(freqs: np.ndarray, psd: np.ndarray, fs: float,
+                     components: Optional[List[Tuple[float, float]]],
+                     tolerance_bins: int = DEFAULT_TOLERANCE_BINS) -> Dict:
+    """
+    Compare the measured spectrum of one stream with the components it was built from.
+
+    ``predicted_alias_power`` is the share of the source power at or above
+    Nyquist. ``measured_alias_power`` is the share of the measured (non-DC)
+    power that does not sit on an in-band source component, i.e. power that
+    was folded down from above Nyquist (or is noise).
+    """
+    nyquist = fs / 2
+    power = psd[1:]
+    dominant = float(freqs[1:][np.argmax(power)]) if power.size and power.max() > 0 else np.nan
+    metrics = {'fs_hz': fs, 'nyquist_hz': nyquist, 'dominant_hz': dominant,
+               'expected_hz': np.nan, 'apparent_shift_hz': np.nan,
+               'predicted_alias_power': np.nan, 'measured_alias_power': np.nan}
+    if not components:
+        return metrics
+
+    component_freqs = np.array([f for f, _ in components])
+    component_power = np.array([a for _, a in components]) ** 2
+    in_band = component_freqs < nyquist
+    resolution = freqs[1] - freqs[0]
+    near_in_band = np.zeros(len(freqs), dtype=bool)
+    for frequency in component_freqs[in_band]:
+        near_in_band |= np.abs(freqs - frequency) <= tolerance_bins * resolution
+    total = power.sum()
+    metrics.update({
+        'expected_hz': float(component_freqs[0]),
+        'apparent_shift_hz': abs(dominant - float(component_freqs[0])),
+        'predicted_alias_power': float(component_power[~in_band].sum() / component_power.sum()),
+        'measured_alias_power': float(power[~near_in_band[1:]].sum() / total) if total > 0 else np.nan,
+    })
+    return metrics
+
+
+def analyze_datasets(data_root: str, families: List[str] = DATASET_FAMILIES, nperseg: int = DEFAULT_SEGMENT,
+                     tolerance_bins: int = DEFAULT_TOLERANCE_BINS, workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    Spectral aliasing metrics for every stream of every generated dataset.
+
+    Streams are read on a process pool and grouped by length, and each
+    group's spectra come from a single batched Welch computation.
+    """
+    datasets = discover_datasets(data_root, families)
+    streams = [{'family': row.family, 'dataset': row.dataset, 'stream': path.parent.name, 'path': str(path)}
+               for row in datasets.itertuples() for path in find_streams(row.path)]
+    if not streams:
+        return pd.DataFrame(columns=ALIASING_COLUMNS)
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        loaded = list(executor.map(_load_stream, [s['path'] for s in streams], chunksize=8))
+
+    rows = []
+    by_shape = {}
+    for stream, (timestamps, values) in zip(streams, loaded):
+        if len(values) < 8:
+            continue
+        fs = 1000.0 / float(np.median(np.diff(timestamps))) if len(timestamps) > 1 else np.nan
+        if not np.isfinite(fs) or fs <= 0:
+            continue
+        by_shape.setdefault((len(values), round(fs, 6)), []).append((stream, values))
+
+    for (length, fs), members in by_shape.items():
+        freqs, psd = welch(np.stack([values for _, values in members]), fs, nperseg)
+        for (stream, _), stream_psd in zip(members, psd):
+            metrics = aliasing_metrics(freqs, stream_psd, fs, expected_components(stream['dataset']), tolerance_bins)
+            rows.append({'family': stream['family'], 'dataset': stream['dataset'], 'stream': stream['stream'],
+                         'samples': length, **metrics})
+    if not rows:
+        return pd.DataFrame(columns=ALIASING_COLUMNS)
+    result = pd.DataFrame(rows)
+    result['aliased'] = ((result['measured_alias_power'] > ALIAS_THRESHOLD)
+                         | (result['predicted_alias_power'] > ALIAS_THRESHOLD))
+    return result.sort_values(['family', 'dataset', 'stream'], ignore_index=True)
+
+
+def spectral_distortion(windows: pd.DataFrame, keys: List[str], nperseg: int = 64) -> pd.DataFrame:
+    """
+    Spectral distortion of approach outputs against the exact reference window series.
+
+    Both series are taken on the window index (one sample per emitted window).
+    Reports the log-spectral distance (dB), the relative L1 spectral error and
+    the output/reference power ratio.
+    """
+    rows = []
+    for key, group in windows.dropna(subset=['value', 'reference']).groupby(keys, observed=True):
+        if len(group) < 8:
+            continue
+        ends = group['window_end'].to_numpy(dtype=np.float64) if 'window_end' in group else np.array([])
+        spacing = np.median(np.diff(ends)) if len(ends) > 1 and np.isfinite(ends).all() else 1000.0
+        fs = 1000.0 / spacing if spacing > 0 else 1.0
+        freqs, psd = welch(np.stack([group['value'].to_numpy(), group['reference'].to_numpy()]), fs, nperseg)
+        output, reference = psd[0, 1:], psd[1, 1:]
+        # 60 dB dynamic range, so empty reference bins do not dominate the distance
+        floor = max(reference.max(), output.max(), 1e-300) * 1e-6
+        lsd = np.sqrt(np.mean((10 * np.log10((output + floor) / (reference + floor))) ** 2))
+        total = reference.sum()
+        rows.append({**dict(zip(keys, key if isinstance(key, tuple) else (key,))), 'windows': len(group),
+                     'log_spectral_distance_db': lsd,
+                     'spectral_error': np.abs(output - reference).sum() / total if total > 0 else np.nan,
+                     'power_ratio': output.sum() / total if total > 0 else np.nan})
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batched FFT/Welch aliasing analysis of generated and received streams")
+    parser.add_argument("--data-root", default="src/streamer/data", help="Root of the dataset families")
+    parser.add_argument("--families", nargs='+', default=DATASET_FAMILIES, help="Dataset families to analyze")
+    parser.add_argument("--segment", type=int, default=DEFAULT_SEGMENT, help="Welch segment length (samples)")
+    parser.add_argument("--tolerance-bins", type=int, default=DEFAULT_TOLERANCE_BINS, help="Leakage tolerance in bins")
+    parser.add_argument("--windows", help="Per-window results (CSV from evaluate_accuracy_matrix or a Parquet store)")
+    parser.add_argument("--workers", type=int, help="Process pool size")
+    parser.add_argument("--output", default="spectral_analysis.csv", help="Per-stream aliasing CSV")
+    parser.add_argument("--distortion-output", default="spectral_distortion.csv", help="Output distortion CSV")
+    args = parser.parse_args()
+
+    aliasing = analyze_datasets(args.data_root, args.families, args.segment, args.tolerance_bins, args.workers)
+    if aliasing.empty:
+        print(f"No data.nt streams found under {args.data_root}")
+    else:
+        columns = ['dataset', 'stream', 'expected_hz', 'dominant_hz', 'predicted_alias_power', 'measured_alias_power']
+        print(aliasing[columns].to_string(index=False))
+        aliasing.to_csv(args.output, index=False)
+        print(f"\n{int(aliasing['aliased'].sum())} of {len(aliasing)} streams aliased; saved to: {args.output}")
+
+    if args.windows:
+        windows = pd.read_parquet(args.windows) if args.windows.endswith('.parquet') else pd.read_csv(args.windows)
+        keys = [k for k in ['pattern', 'family', 'dataset', 'approach', 'iteration'] if k in windows]
+        distortion = spectral_distortion(windows, keys)
+        if distortion.empty:
+            print("No run has enough windows (8) for a spectral comparison")
+        else:
+            print(distortion.to_string(index=False))
+            distortion.to_csv(args.distortion_output, index=False)
+            print(f"Spectral distortion saved to: {args.distortion_output}")
+
+
+if __name__ == "__main__":
+    main()
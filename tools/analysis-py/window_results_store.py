@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+
+import argparse
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+STORE_COLUMNS = ['pattern', 'approach', 'iteration', 'window_index',
+                 'window_start', 'window_end', 'value', 'reference', 'error']
+
+STORE_DTYPES = {
+    'pattern': 'category',
+    'approach': 'category',
+    'iteration': 'int16',
+    'window_index': 'int32',
+    'window_start': 'Int64',
+    'window_end': 'Int64',
+    'value': 'float64',
+    'reference': 'float64',
+    'error': 'float64',
+}
+
+SORT_KEYS = ['pattern', 'approach', 'iteration', 'window_index']
+
+# Pipe-joined per-window columns of comparison-results-detailed.csv
+_LEGACY_APPROX_COLUMN = 'All Approx Results'
+_LEGACY_REFERENCE_COLUMN = 'All Fetching Results'
+
+
+def normalize(frame: pd.DataFrame) -> pd.DataFrame:
+    """Coerce a per-window frame to the store schema, filling derivable columns."""
+    frame = frame.copy()
+    if 'window_index' not in frame:
+        frame['window_index'] = frame.groupby(['pattern', 'approach', 'iteration']).cumcount()
+    for column in ['window_start', 'window_end']:
+        if column not in frame:
+            frame[column] = pd.NA
+    if 'error' not in frame:
+        frame['error'] = frame['value'] - frame['reference']
+    frame = frame[STORE_COLUMNS].astype(STORE_DTYPES)
+    return frame.sort_values(SORT_KEYS, ignore_index=True)
+
+
+def from_comparison_csv(filepath: str, approach: str = 'approximation', iteration: int = 1) -> pd.DataFrame:
+    """
+    Explode the pipe-joined strings of ``comparison-results-detailed.csv``.
+
+    Each ``"a|b|..."`` cell becomes one row per window; the fetching client
+    side results are the reference, as in the original comparison.
+    """
+    legacy = pd.read_csv(filepath, dtype={_LEGACY_APPROX_COLUMN: str, _LEGACY_REFERENCE_COLUMN: str})
+    values = legacy[_LEGACY_APPROX_COLUMN].fillna('').str.split('|')
+    references = legacy[_LEGACY_REFERENCE_COLUMN].fillna('').str.split('|')
+    # Pad to the same number of windows per pattern so both lists explode together
+    lengths = np.maximum(values.str.len(), references.str.len())
+    values = [v + [''] * (n - len(v)) for v, n in zip(values, lengths)]
+    references = [r + [''] * (n - len(r)) for r, n in zip(references, lengths)]
+    exploded = pd.DataFrame({
+        'pattern': legacy['Pattern'].str.replace(' ', '_', n=1),
+        'value': values,
+        'reference': references,
+    }).explode(['value', 'reference'], ignore_index=True)
+    exploded['value'] = pd.to_numeric(exploded['value'], errors='coerce')
+    exploded['reference'] = pd.to_numeric(exploded['reference'], errors='coerce')
+    exploded['approach'] = approach
+    exploded['iteration'] = iteration
+    return normalize(exploded)
+
+
+def from_matrix_windows(windows: pd.DataFrame) -> pd.DataFrame:
+    """Convert the per-window table of evaluate_accuracy_matrix to the store schema."""
+    frame = windows.rename(columns={'dataset': 'pattern'})
+    frame['pattern'] = frame['family'] + '/' + frame['pattern'] if 'family' in frame else frame['pattern']
+    return normalize(frame)
+
+
+def write_store(frame: pd.DataFrame, path: str, append: bool = False):
+    """
+    Write per-window results to a Parquet file sorted by the store keys.
+
+    With ``append`` the new rows replace any existing rows of the same
+    (pattern, approach, iteration) runs.
+    """
+    frame = normalize(frame)
+    if append and Path(path).exists():
+        existing = load_store(path)
+        runs = frame[['pattern', 'approach', 'iteration']].drop_duplicates().astype(str)
+        keys = existing[['pattern', 'approach', 'iteration']].astype(str)
+        replaced = keys.merge(runs, how='left', indicator=True)['_merge'].eq('both').to_numpy()
+        frame = normalize(pd.concat([existing[~replaced].astype(object), frame.astype(object)], ignore_index=True))
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    frame.to_parquet(path, index=False, row_group_size=100000)
+
+
+def load_store(path: str, patterns: Optional[List[str]] = None, approaches: Optional[List[str]] = None,
+               iterations: Optional[List[int]] = None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Load per-window results, pushing pattern/approach/iteration filters down to Parquet.
+
+    Example:
+        store = load_store('windows.parquet', approaches=['approximation'])
+        store.assign(abs_error=store['error'].abs()).groupby(['approach', 'pattern'], observed=True)['abs_error'].mean()
+    """
+    filters = []
+    if patterns:
+        filters.append(('pattern', 'in', list(patterns)))
+    if approaches:
+        filters.append(('approach', 'in', list(approaches)))
+    if iterations:
+        filters.append(('iteration', 'in', [int(i) for i in iterations]))
+    return pd.read_parquet(path, columns=columns, filters=filters or None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Long-format per-window results store")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_csv = subparsers.add_parser("import-csv", help="Convert comparison-results-detailed.csv")
+    import_csv.add_argument("csv", help="Path to comparison-results-detailed.csv")
+    import_csv.add_argument("--iteration", type=int, default=1, help="Iteration the CSV belongs to")
+
+    import_windows = subparsers.add_parser("import-windows", help="Import evaluate_accuracy_matrix per-window CSV")
+    import_windows.add_argument("csv", help="Per-window CSV written with --windows-output")
+
+    show = subparsers.add_parser("show", help="Summarize the store")
+    show.add_argument("--pattern", nargs='*', help="Only these patterns")
+    show.add_argument("--approach", nargs='*', help="Only these approaches")
+
+    for sub in (import_csv, import_windows, show):
+        sub.add_argument("--store", default="window_results.parquet", help="Store file")
+    for sub in (import_csv, import_windows):
+        sub.add_argument("--replace", action='store_true', help="Overwrite the store instead of merging into it")
+    args = parser.parse_args()
+
+    if args.command == "show":
+        windows = load_store(args.store, args.pattern, args.approach)
+        summary = windows.groupby(['pattern', 'approach', 'iteration'], observed=True).agg(
+            windows=('value', 'size'), mean_abs_error=('error', lambda e: e.abs().mean()))
+        print(summary.to_string())
+        return
+
+    if args.command == "import-csv":
+        frame = from_comparison_csv(args.csv, iteration=args.iteration)
+    else:
+        frame = from_matrix_windows(pd.read_csv(args.csv))
+    write_store(frame, args.store, append=not args.replace)
+    print(f"Stored {len(frame)} windows in {args.store}")
+
+
+if __name__ == "__main__":
+    main()
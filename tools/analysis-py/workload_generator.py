@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Streams replayed by publish.ts, with the sensor each one relates to
+STREAMS = {'smartphone.acceleration.x': 'smartphoneX', 'wearable.acceleration.x': 'wearableX'}
+WORKLOAD_FAMILY = 'workloads'
+# Parameters and delivery statistics written next to the streams of every generated dataset
+WORKLOAD_FILE = 'workload.json'
+DEFAULT_OBSERVATIONS = 480
+DEFAULT_INTERVAL_MS = 250
+# Relative noise of the wearable stream, as in the other generators
+WEARABLE_NOISE = 0.02
+
+ARRIVAL_PROCESSES = ('poisson', 'onoff', 'ramp', 'diurnal')
+# Resolution of the cumulative intensity that arrival times are inverted from
+INTENSITY_STEP_S = 0.005
+
+PROTEGO = 'https://dahcc.idlab.ugent.be/Protego'
+SENSORS = 'https://dahcc.idlab.ugent.be/Homelab/SensorsAndActuators'
+PARTICIPANT = f'{PROTEGO}/_participant1'
+DEVICE = f'{SENSORS}/SM-G950F'
+# Properties the sensors of a high-cardinality workload relate to, in turn
+PROPERTIES = list(STREAMS.values())
+
+# Value patterns over the elapsed time (s) of each observation
+PATTERNS = {
+    'sine': lambda t, rng: 50 * np.sin(2 * np.pi * t / 30) + 50,
+    'linear': lambda t, rng: 10 + 90 * t / max(t[-1], 1e-9),
+    'random_walk': lambda t, rng: 50 + np.cumsum(rng.normal(0, 1, len(t))),
+    'constant': lambda t, rng: np.full(len(t), 50.0),
+}
+
+
+def iso_timestamps(timestamps: np.ndarray) -> np.ndarray:
+    """xsd:dateTime literals (UTC, millisecond precision) of epoch-millisecond timestamps."""
+    return np.datetime_as_string(np.asarray(timestamps).astype('datetime64[ms]'), unit='ms', timezone='UTC')
+
+
+def line_template(participant: str, device: str, property_name: str) -> str:
+    """
+    ``str.format`` template of one observation line; ``{0}`` is the subject
+    IRI, ``{1}`` the xsd:dateTime literal and ``{2}`` the value.
+    """
+    return (f'{{0}} <http://rdfs.org/ns/void#inDataset> <{participant}> . '
+            f'{{0}} <https://saref.etsi.org/core/measurementMadeBy> <{device}> . '
+            f'{{0}} <http://purl.org/dc/terms/isVersionOf> <https://saref.etsi.org/core/Measurement> . '
+            f'{{0}} <https://saref.etsi.org/core/relatesToProperty> <{SENSORS}/{property_name}> . '
+            f'{{0}} <https://saref.etsi.org/core/hasTimestamp> "{{1}}"^^<http://www.w3.org/2001/XMLSchema#dateTime> . '
+            f'{{0}} <https://saref.etsi.org/core/hasValue> "{{2}}"^^<http://www.w3.org/2001/XMLSchema#float> .\n')
+
+
+def write_stream(filepath: Path, timestamps: np.ndarray, values: np.ndarray, device_name: str,
+                 subjects: Optional[np.ndarray] = None):
+    """
+    Write one stream in the N-Triples layout of the dataset generators, one
+    observation per line in the given order.
+
+    Subjects default to ``obs<i>``; pass them to control the order or to repeat
+    an observation under another subject.
+    """
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    subjects = subjects if subjects is not None else np.char.add('obs', np.arange(len(timestamps)).astype(str))
+    template = line_template(PARTICIPANT, DEVICE, device_name)
+    with open(filepath, 'w') as f:
+        for subject, timestamp, value in zip(subjects, iso_timestamps(timestamps), values):
+            f.write(template.format(f"<{PARTICIPANT}/{subject}>", timestamp, f"{value:.6f}"))
+
+
+def jittered_timestamps(n: int, interval_ms: float, jitter_ms: float, start_ms: int,
+                        rng: np.random.Generator) -> np.ndarray:
+    """
+    Event timestamps ``interval_ms`` apart, with every interval drawn uniformly
+    from ``interval_ms ± jitter_ms`` (never negative, so event time stays ordered).
+    """
+    intervals = np.full(n, float(interval_ms))
+    if jitter_ms > 0:
+        intervals += rng.uniform(-jitter_ms, jitter_ms, n)
+    intervals[0] = 0
+    return start_ms + np.round(np.cumsum(np.maximum(intervals, 0))).astype(np.int64)
+
+
+def deliveries(timestamps: np.ndarray, displaced_fraction: float, max_lateness_ms: float,
+               duplicate_fraction: float, interval_ms: float, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+    """
+    Order in which the observations reach the broker.
+
+    A ``displaced_fraction`` of the observations arrives up to
+    ``max_lateness_ms`` after its event time, the rest on time. A
+    ``duplicate_fraction`` is delivered a second time, up to
+    ``max(max_lateness_ms, interval_ms)`` after its first delivery.
+
+    Returns:
+        Dict of arrays in arrival order: ``source`` (index of the observation),
+        ``copy`` (0 for first deliveries, 1 for duplicates) and ``arrival_ms``
+    """
+    n = len(timestamps)
+    arrival = timestamps.astype(np.float64)
+    displaced = rng.random(n) < displaced_fraction
+    arrival[displaced] += rng.uniform(0, max_lateness_ms, int(displaced.sum()))
+
+    duplicated = np.flatnonzero(rng.random(n) < duplicate_fraction)
+    source = np.concatenate([np.arange(n), duplicated])
+    copy = np.concatenate([np.zeros(n, dtype=np.int64), np.ones(len(duplicated), dtype=np.int64)])
+    arrival = np.concatenate([arrival, arrival[duplicated] + rng.uniform(0, max(max_lateness_ms, interval_ms),
+                                                                          len(duplicated))])
+    order = np.lexsort((copy, source, arrival))
+    return {'source': source[order], 'copy': copy[order], 'arrival_ms': arrival[order]}
+
+
+def disorder_stats(timestamps: np.ndarray, delivered: Dict[str, np.ndarray]) -> Dict:
+    """
+    How disordered a delivery sequence is: first deliveries that arrive after
+    an observation with a later event time, how far behind that maximum they
+    are, and duplicates.
+    """
+    event = timestamps[delivered['source']]
+    behind = np.maximum.accumulate(event) - event
+    late = (behind > 0) & (delivered['copy'] == 0)
+    return {
+        'delivered': int(len(event)),
+        'out_of_order': int(late.sum()),
+        'out_of_order_fraction': float(late.sum() / len(timestamps)) if len(timestamps) else 0.0,
+        'max_lateness_ms': int(behind[late].max()) if late.any() else 0,
+        'mean_lateness_ms': float(behind[late].mean()) if late.any() else 0.0,
+        'duplicates': int(delivered['copy'].sum()),
+    }
+
+
+def arrival_intensity(process: str, t: np.ndarray, rate: float, peak_rate: float, on_s: float, off_s: float,
+                      period_s: float) -> np.ndarray:
+    """
+    Arrival rate (Hz) of a process at elapsed times ``t`` (s).
+
+    ``poisson``: constant ``rate``. ``onoff``: ``peak_rate`` for ``on_s``, then
+    ``rate`` for ``off_s``, repeating. ``ramp``: linear from ``rate`` to
+    ``peak_rate`` over the run. ``diurnal``: a sinusoidal envelope between
+    ``rate`` and ``peak_rate`` with period ``period_s``, starting at its trough.
+    """
+    if process == 'poisson':
+        return np.full(len(t), float(rate))
+    if process == 'onoff':
+        return np.where(t % (on_s + off_s) < on_s, peak_rate, rate).astype(np.float64)
+    if process == 'ramp':
+        return rate + (peak_rate - rate) * t / max(t[-1], 1e-9)
+    if process == 'diurnal':
+        return rate + (peak_rate - rate) * (1 - np.cos(2 * np.pi * t / period_s)) / 2
+    raise ValueError(f"Unknown arrival process {process!r}, expected one of {ARRIVAL_PROCESSES}")
+
+
+def arrival_times(intensity: np.ndarray, grid: np.ndarray, streams: int, rng: np.random.Generator) -> List[np.ndarray]:
+    """
+    Arrival times (s) of ``streams`` independent Poisson processes with the
+    given intensity on ``grid``, drawn for all streams at once.
+
+    Each stream gets a Poisson number of points spread uniformly over the
+    cumulative intensity, which are mapped back to time through its inverse
+    (time rescaling), so bursts and envelopes come out exactly as specified.
+    """
+    cumulative = np.concatenate([[0.0], np.cumsum((intensity[1:] + intensity[:-1]) / 2 * np.diff(grid))])
+    counts = rng.poisson(cumulative[-1], streams)
+    # Offsetting every stream by its id sorts all streams with one flat sort
+    offsets = np.repeat(np.arange(streams) * 2 * max(cumulative[-1], 1.0), counts)
+    points = np.sort(rng.uniform(0, cumulative[-1], counts.sum()) + offsets) - offsets
+    return np.split(np.interp(points, cumulative, grid), np.cumsum(counts)[:-1])
+
+
+def arrival_stats(times_s: np.ndarray, duration_s: float) -> Dict:
+    """Observed rate of one stream: mean, busiest second and inter-arrival variability (1 for Poisson)."""
+    gaps = np.diff(times_s)
+    per_second = np.bincount(times_s.astype(np.int64), minlength=int(np.ceil(duration_s))) if len(times_s) else np.zeros(1)
+    return {
+        'observations': int(len(times_s)),
+        'mean_rate_hz': float(len(times_s) / duration_s),
+        'peak_rate_hz': int(per_second.max()),
+        'interarrival_cv': float(gaps.std() / gaps.mean()) if len(gaps) > 1 and gaps.mean() > 0 else 0.0,
+    }
+
+
+def stream_names(streams: int) -> Dict[str, str]:
+    """The replayed streams first, then ``stream<i>.acceleration.x`` for any further stream."""
+    names = dict(list(STREAMS.items())[:streams])
+    for i in range(len(names), streams):
+        names[f'stream{i}.acceleration.x'] = f'stream{i}X'
+    return names
+
+
+def arrivals_name(process: str, rate: float, peak_rate: float, on_s: float, off_s: float, period_s: float) -> str:
+    """Dataset directory name, parseable by dataset_catalog.parse_dataset_name."""
+    name = f"{process}_rate_{rate:g}"
+    if process == 'onoff':
+        name += f"_peak_{peak_rate:g}_on_{on_s:g}_off_{off_s:g}"
+    elif process == 'ramp':
+        name += f"_peak_{peak_rate:g}"
+    elif process == 'diurnal':
+        name += f"_peak_{peak_rate:g}_period_{period_s:g}"
+    return name
+
+
+def generate_arrivals(output_dir: Path, process: str = 'poisson', duration_s: float = 120, streams: int = 2,
+                      rate: float = 4, peak_rate: float = 40, on_s: float = 5, off_s: float = 25,
+                      period_s: float = 120, pattern: str = 'sine', seed: int = 0,
+                      start_ms: Optional[int] = None) -> Dict:
+    """
+    Generate one dataset whose timestamps follow an arrival process.
+
+    Streams are written in time order; replaying them with
+    ``REPLAY_PACING=event`` publishes on the event timestamps so the bursts
+    reach the broker and the operators. The same seed gives the same files.
+
+    Returns:
+        The parameters and per-stream arrival statistics written to ``workload.json``
+    """
+    start_ms = start_ms if start_ms is not None else int(np.datetime64('now', 'ms').astype(np.int64))
+    parameters = {'process': process, 'duration_s': duration_s, 'rate': rate, 'peak_rate': peak_rate, 'on_s': on_s,
+                  'off_s': off_s, 'period_s': period_s, 'pattern': pattern, 'seed': seed, 'start_ms': start_ms}
+    rng = np.random.default_rng(seed)
+    grid = np.linspace(0, duration_s, max(int(duration_s / INTENSITY_STEP_S), 1) + 1)
+    intensity = arrival_intensity(process, grid, rate, peak_rate, on_s, off_s, period_s)
+    stats = {}
+    for position, ((stream, device_name), times_s) in enumerate(zip(stream_names(streams).items(),
+                                                                   arrival_times(intensity, grid, streams, rng))):
+        timestamps = start_ms + np.round(times_s * 1000).astype(np.int64)
+        values = PATTERNS[pattern](times_s, rng) if len(times_s) else np.empty(0)
+        if position > 0:
+            values = values + rng.normal(0, 1, len(values)) * np.abs(values) * WEARABLE_NOISE
+        write_stream(output_dir / stream / 'data.nt', timestamps, values, device_name)
+        stats[stream] = arrival_stats(times_s, duration_s)
+
+    workload = {**parameters, 'streams': stats}
+    (output_dir / WORKLOAD_FILE).write_text(json.dumps(workload, indent=2))
+    return workload
+
+
+def workload_name(pattern: str, displaced_fraction: float, max_lateness_ms: float, jitter_ms: float,
+                  duplicate_fraction: float) -> str:
+    """Dataset directory name, parseable by dataset_catalog.parse_dataset_name."""
+    return (f"{pattern}_displaced_{displaced_fraction:g}_lateness_{max_lateness_ms:g}"
+            f"_jitter_{jitter_ms:g}_duplicates_{duplicate_fraction:g}")
+
+
+def generate_disorder(output_dir: Path, pattern: str = 'sine', observations: int = DEFAULT_OBSERVATIONS,
+                      interval_ms: float = DEFAULT_INTERVAL_MS, displaced_fraction: float = 0.0,
+                      max_lateness_ms: float = 0.0, jitter_ms: float = 0.0, duplicate_fraction: float = 0.0,
+                      seed: int = 0, start_ms: Optional[int] = None) -> Dict:
+    """
+    Generate both streams of one disordered dataset under ``output_dir``.
+
+    Each stream is written in arrival order with its event timestamps, so
+    replaying it with ``REPLAY_ORDER=file`` delivers the disorder to the
+    operators. Duplicates are written under ``obs<i>_dup`` so they survive
+    loading into an RDF store. The same seed gives the same files.
+
+    Returns:
+        The parameters and per-stream disorder statistics written to ``workload.json``
+    """
+    start_ms = start_ms if start_ms is not None else int(np.datetime64('now', 'ms').astype(np.int64))
+    parameters = {'pattern': pattern, 'observations': observations, 'interval_ms': interval_ms,
+                  'displaced_fraction': displaced_fraction, 'max_lateness_ms': max_lateness_ms,
+                  'jitter_ms': jitter_ms, 'duplicate_fraction': duplicate_fraction, 'seed': seed,
+                  'start_ms': start_ms}
+    streams = {}
+    for position, (stream, device_name) in enumerate(STREAMS.items()):
+        rng = np.random.default_rng([seed, position])
+        timestamps = jittered_timestamps(observations, interval_ms, jitter_ms, start_ms, rng)
+        values = PATTERNS[pattern]((timestamps - start_ms) / 1000.0, rng)
+        if position > 0:
+            values = values + rng.normal(0, 1, observations) * np.abs(values) * WEARABLE_NOISE
+        delivered = deliveries(timestamps, displaced_fraction, max_lateness_ms, duplicate_fraction, interval_ms, rng)
+        source = delivered['source']
+        subjects = np.char.add('obs', source.astype(str))
+        subjects = np.where(delivered['copy'] > 0, np.char.add(subjects, '_dup'), subjects)
+        write_stream(output_dir / stream / 'data.nt', timestamps[source], values[source], device_name, subjects)
+        streams[stream] = disorder_stats(timestamps, delivered)
+
+    workload = {**parameters, 'streams': streams}
+    (output_dir / WORKLOAD_FILE).write_text(json.dumps(workload, indent=2))
+    return workload
+
+
+def participant_iri(participant: int) -> str:
+    return sys.intern(f"{PROTEGO}/_participant{participant}")
+
+
+def sensor_iri(participant: int, sensor: int) -> str:
+    return sys.intern(f"{DEVICE}-{participant}-{sensor}")
+
+
+def partition_participants(participants: int, partitions: int, partition: int) -> np.ndarray:
+    """Participants written to one partition: every participant lands in ``participant % partitions``."""
+    return np.arange(partition, participants, partitions)
+
+
+def generate_partition(job: Dict) -> Dict:
+    """
+    Write one partition of a high-cardinality workload, in timestamp order.
+
+    Every sensor samples the shared schedule at its own phase, with its own
+    gain and offset on the value pattern. Subjects are
+    ``_participant<p>/obs<sensor * observations + i>``, unique across the
+    whole workload. IRI prefixes and line templates are built once per sensor
+    and ids, timestamps and values are formatted as arrays, so each line costs
+    one ``str.format``.
+    """
+    rng = np.random.default_rng([job['seed'], job['partition']])
+    participants = partition_participants(job['participants'], job['partitions'], job['partition'])
+    sensors, n, interval_ms = job['sensors'], job['observations'], job['interval_ms']
+    sensor_count = len(participants) * sensors
+
+    base = PATTERNS[job['pattern']](np.arange(n) * interval_ms / 1000.0, rng)
+    phase = np.round(rng.uniform(0, interval_ms, sensor_count)).astype(np.int64)
+    gain = rng.lognormal(0, 0.25, sensor_count)
+    offset = rng.normal(0, 5, sensor_count)
+    timestamps = job['start_ms'] + phase[:, None] + np.round(np.arange(n) * interval_ms).astype(np.int64)[None, :]
+    values = base[None, :] * gain[:, None] + offset[:, None] + rng.normal(0, 0.5, (sensor_count, n))
+
+    flat_order = np.argsort(timestamps, axis=None, kind='stable')
+    sensor_index, step = np.divmod(flat_order, n)
+    obs_ids = ((sensor_index % sensors) * n + step).astype(str)
+    iso = iso_timestamps(timestamps.ravel()[flat_order])
+    formatted = np.char.mod('%.6f', values.ravel()[flat_order])
+
+    templates, subject_prefixes = [], []
+    for participant in participants:
+        participant_prefix = f"<{participant_iri(int(participant))}/obs"
+        for sensor in range(sensors):
+            templates.append(line_template(participant_iri(int(participant)), sensor_iri(int(participant), sensor),
+                                           PROPERTIES[sensor % len(PROPERTIES)]))
+            subject_prefixes.append(participant_prefix)
+
+    filepath = Path(job['output_dir']) / f"partition_{job['partition']:04d}" / 'data.nt'
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    with open(filepath, 'w') as f:
+        f.writelines(templates[sensor].format(subject_prefixes[sensor] + obs_id + '>', timestamp, value)
+                     for sensor, obs_id, timestamp, value in zip(sensor_index.tolist(), obs_ids, iso, formatted))
+    return {'partition': job['partition'], 'path': str(filepath), 'participants': int(len(participants)),
+            'sensors': int(sensor_count), 'observations': int(sensor_count * n), 'bytes': filepath.stat().st_size}
+
+
+def cardinality_name(pattern: str, participants: int, sensors: int, partitions: int) -> str:
+    """Dataset directory name, parseable by dataset_catalog.parse_dataset_name."""
+    return f"{pattern}_participants_{participants}_sensors_{sensors}_partitions_{partitions}"
+
+
+def generate_cardinality(output_dir: Path, participants: int = 1000, sensors: int = 4,
+                         observations: int = DEFAULT_OBSERVATIONS, interval_ms: float = DEFAULT_INTERVAL_MS,
+                         partitions: int = 16, pattern: str = 'sine', seed: int = 0, start_ms: Optional[int] = None,
+                         workers: Optional[int] = None) -> Dict:
+    """
+    Generate a workload of many participants, each with several sensors,
+    split over ``partitions`` time-ordered ``partition_<k>/data.nt`` files.
+
+    A participant's observations all go to one partition, so partitions can be
+    replayed or processed independently, or merged back with nt_merge.py.
+
+    Returns:
+        The parameters and per-partition sizes written to ``workload.json``
+    """
+    start_ms = start_ms if start_ms is not None else int(np.datetime64('now', 'ms').astype(np.int64))
+    parameters = {'participants': participants, 'sensors': sensors, 'observations': observations,
+                  'interval_ms': interval_ms, 'partitions': partitions, 'pattern': pattern, 'seed': seed,
+                  'start_ms': start_ms}
+    jobs = [{**parameters, 'partition': partition, 'output_dir': str(output_dir)}
+            for partition in range(min(partitions, participants))]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        written = list(executor.map(generate_partition, jobs, chunksize=4))
+
+    workload = {**parameters, 'partition_files': written}
+    (output_dir / WORKLOAD_FILE).write_text(json.dumps(workload, indent=2))
+    return workload
+
+
+def run_disorder(args):
+    family_dir = Path(args.data_root) / WORKLOAD_FAMILY
+    for displaced in args.displaced:
+        for lateness in args.max_lateness_ms:
+            for jitter in args.jitter_ms:
+                for duplicates in args.duplicates:
+                    name = workload_name(args.pattern, displaced, lateness, jitter, duplicates)
+                    workload = generate_disorder(family_dir / name, args.pattern, args.observations, args.interval_ms,
+                                                 displaced, lateness, jitter, duplicates, args.seed, args.start_ms)
+                    stats = workload['streams']['smartphone.acceleration.x']
+                    print(f"{WORKLOAD_FAMILY}/{name}: {stats['out_of_order']} out of order "
+                          f"(max {stats['max_lateness_ms']} ms late), {stats['duplicates']} duplicates")
+    print(f"\nReplay with DATA_PATH={WORKLOAD_FAMILY}/<dataset> REPLAY_ORDER=file to keep the delivery order")
+
+
+def run_arrivals(args):
+    family_dir = Path(args.data_root) / WORKLOAD_FAMILY
+    for process in args.process:
+        name = arrivals_name(process, args.rate, args.peak_rate, args.on_s, args.off_s, args.period_s)
+        workload = generate_arrivals(family_dir / name, process, args.duration_s, args.streams, args.rate,
+                                     args.peak_rate, args.on_s, args.off_s, args.period_s, args.pattern, args.seed,
+                                     args.start_ms)
+        stats = workload['streams']['smartphone.acceleration.x']
+        print(f"{WORKLOAD_FAMILY}/{name}: {stats['observations']} observations, mean {stats['mean_rate_hz']:.1f} Hz, "
+              f"peak {stats['peak_rate_hz']} Hz, inter-arrival CV {stats['interarrival_cv']:.2f}")
+    print(f"\nReplay with DATA_PATH={WORKLOAD_FAMILY}/<dataset> REPLAY_PACING=event to publish on the event timestamps")
+
+
+def run_cardinality(args):
+    name = cardinality_name(args.pattern, args.participants, args.sensors, args.partitions)
+    workload = generate_cardinality(Path(args.data_root) / WORKLOAD_FAMILY / name, args.participants, args.sensors,
+                                    args.observations, args.interval_ms, args.partitions, args.pattern, args.seed,
+                                    args.start_ms, args.workers)
+    files = workload['partition_files']
+    observations = sum(f['observations'] for f in files)
+    print(f"{WORKLOAD_FAMILY}/{name}: {observations} observations from {sum(f['sensors'] for f in files)} sensors "
+          f"in {len(files)} partitions ({sum(f['bytes'] for f in files) / 1e6:.1f} MB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate disordered and bursty replay workloads")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--data-root", default="src/streamer/data", help="Root of the dataset families")
+    common.add_argument("--pattern", choices=sorted(PATTERNS), default='sine', help="Value pattern")
+    common.add_argument("--seed", type=int, default=0, help="Random seed")
+    common.add_argument("--start-ms", type=int, help="Event time of the first observation (default: now)")
+
+    disorder = subparsers.add_parser("disorder", parents=[common],
+                                     help="Out-of-order, late, jittered and duplicate deliveries")
+    disorder.add_argument("--observations", type=int, default=DEFAULT_OBSERVATIONS, help="Observations per stream")
+    disorder.add_argument("--interval-ms", type=float, default=DEFAULT_INTERVAL_MS, help="Nominal sampling interval")
+    disorder.add_argument("--displaced", type=float, nargs='+', default=[0.0],
+                          help="Fractions of observations delivered late")
+    disorder.add_argument("--max-lateness-ms", type=float, nargs='+', default=[0.0],
+                          help="Maximum delay of a displaced observation")
+    disorder.add_argument("--jitter-ms", type=float, nargs='+', default=[0.0],
+                          help="Maximum deviation of each interval")
+    disorder.add_argument("--duplicates", type=float, nargs='+', default=[0.0],
+                          help="Fractions of observations delivered twice")
+
+    arrivals = subparsers.add_parser("arrivals", parents=[common], help="Timestamps from an arrival process")
+    arrivals.add_argument("--process", choices=ARRIVAL_PROCESSES, nargs='+', default=['poisson'],
+                          help="Arrival processes to generate")
+    arrivals.add_argument("--duration-s", type=float, default=120, help="Length of the workload")
+    arrivals.add_argument("--streams", type=int, default=2, help="Independent streams to generate")
+    arrivals.add_argument("--rate", type=float, default=4, help="Base arrival rate (Hz)")
+    arrivals.add_argument("--peak-rate", type=float, default=40,
+                          help="Burst rate (onoff), final rate (ramp) or envelope peak (diurnal), in Hz")
+    arrivals.add_argument("--on-s", type=float, default=5, help="Burst length (onoff)")
+    arrivals.add_argument("--off-s", type=float, default=25, help="Time between bursts (onoff)")
+    arrivals.add_argument("--period-s", type=float, default=120, help="Envelope period (diurnal)")
+
+    cardinality = subparsers.add_parser("cardinality", parents=[common],
+                                        help="Many participants and sensors with unique subjects, partitioned")
+    cardinality.add_argument("--participants", type=int, default=1000, help="Participants to generate")
+    cardinality.add_argument("--sensors", type=int, default=4, help="Sensors per participant")
+    cardinality.add_argument("--observations", type=int, default=DEFAULT_OBSERVATIONS, help="Observations per sensor")
+    cardinality.add_argument("--interval-ms", type=float, default=DEFAULT_INTERVAL_MS, help="Sampling interval")
+    cardinality.add_argument("--partitions", type=int, default=16, help="Output files, split by participant")
+    cardinality.add_argument("--workers", type=int, help="Process pool size")
+    args = parser.parse_args()
+
+    if args.command == "disorder":
+        run_disorder(args)
+    elif args.command == "arrivals":
+        run_arrivals(args)
+    else:
+        run_cardinality(args)
+
+
+if __name__ == "__main__":
+    main()
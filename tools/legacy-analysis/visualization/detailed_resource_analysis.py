@@ -3,6 +3,15 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 import seaborn as sns
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'analysis-py'))
+from downsampling import downsample
+
+def plot_series(ax, x, y, **kwargs):
+    """Plot a long series after min/max downsampling so peaks and GC drops are kept"""
+    return ax.plot(*downsample(x, y), **kwargs)
 
 def load_and_analyze_resource_usage():
     """Load and create comprehensive resource usage comparison charts"""
@@ -29,9 +38,9 @@ def load_and_analyze_resource_usage():
     fig.suptitle('Resource Usage Comparison: Approximation vs Chunked Approach', fontsize=16, fontweight='bold')
     
     # 1. Memory Usage Over Time
-    axes[0,0].plot(approx_df['relative_time'], approx_df['heapUsedMB'], 
+    plot_series(axes[0,0], approx_df['relative_time'], approx_df['heapUsedMB'], 
                   label='Approximation', alpha=0.8, linewidth=1.5, color='#FF6B6B')
-    axes[0,0].plot(chunked_df['relative_time'], chunked_df['heapUsedMB'], 
+    plot_series(axes[0,0], chunked_df['relative_time'], chunked_df['heapUsedMB'], 
                   label='Chunked', alpha=0.8, linewidth=1.5, color='#4ECDC4')
     axes[0,0].set_title('Heap Memory Usage Over Time', fontweight='bold')
     axes[0,0].set_xlabel('Time (seconds)')
@@ -59,9 +68,9 @@ def load_and_analyze_resource_usage():
     axes[0,1].grid(True, alpha=0.3)
     
     # 3. RSS Memory Comparison
-    axes[0,2].plot(approx_df['relative_time'], approx_df['rss'] / (1024*1024), 
+    plot_series(axes[0,2], approx_df['relative_time'], approx_df['rss'] / (1024*1024), 
                   label='Approximation RSS', alpha=0.8, linewidth=1.5, color='#FF6B6B')
-    axes[0,2].plot(chunked_df['relative_time'], chunked_df['rss'] / (1024*1024), 
+    plot_series(axes[0,2], chunked_df['relative_time'], chunked_df['rss'] / (1024*1024), 
                   label='Chunked RSS', alpha=0.8, linewidth=1.5, color='#4ECDC4')
     axes[0,2].set_title('Resident Set Size (RSS)', fontweight='bold')
     axes[0,2].set_xlabel('Time (seconds)')
@@ -70,9 +79,9 @@ def load_and_analyze_resource_usage():
     axes[0,2].grid(True, alpha=0.3)
     
     # 4. CPU Usage Comparison
-    axes[1,0].plot(approx_df['relative_time'], approx_df['cpu_user'], 
+    plot_series(axes[1,0], approx_df['relative_time'], approx_df['cpu_user'], 
                   label='Approximation CPU', alpha=0.8, linewidth=1.5, color='#FF6B6B')
-    axes[1,0].plot(chunked_df['relative_time'], chunked_df['cpu_user'], 
+    plot_series(axes[1,0], chunked_df['relative_time'], chunked_df['cpu_user'], 
                   label='Chunked CPU', alpha=0.8, linewidth=1.5, color='#4ECDC4')
     axes[1,0].set_title('CPU User Time', fontweight='bold')
     axes[1,0].set_xlabel('Time (seconds)')
@@ -82,7 +91,7 @@ def load_and_analyze_resource_usage():
     
     # 5. Memory Efficiency Box Plot
     memory_data = [approx_df['heapUsedMB'], chunked_df['heapUsedMB']]
-    box_plot = axes[1,1].boxplot(memory_data, labels=['Approximation', 'Chunked'], 
+    box_plot = axes[1,1].boxplot(memory_data, tick_labels=['Approximation', 'Chunked'], 
                                 patch_artist=True)
     box_plot['boxes'][0].set_facecolor('#FF6B6B')
     box_plot['boxes'][1].set_facecolor('#4ECDC4')
@@ -168,11 +177,11 @@ def create_memory_trend_analysis(approx_df, chunked_df):
     approx_df['memory_trend'] = approx_df['heapUsedMB'].rolling(window=window_size).mean()
     chunked_df['memory_trend'] = chunked_df['heapUsedMB'].rolling(window=window_size).mean()
     
-    axes[0,0].plot(approx_df['relative_time'], approx_df['heapUsedMB'], 
+    plot_series(axes[0,0], approx_df['relative_time'], approx_df['heapUsedMB'], 
                   alpha=0.3, color='#FF6B6B', label='Raw Data')
-    axes[0,0].plot(approx_df['relative_time'], approx_df['memory_trend'], 
+    plot_series(axes[0,0], approx_df['relative_time'], approx_df['memory_trend'], 
                   linewidth=2, color='#FF6B6B', label='Approximation Trend')
-    axes[0,0].plot(chunked_df['relative_time'], chunked_df['memory_trend'], 
+    plot_series(axes[0,0], chunked_df['relative_time'], chunked_df['memory_trend'], 
                   linewidth=2, color='#4ECDC4', label='Chunked Trend')
     axes[0,0].set_title('Memory Usage Trends (Smoothed)', fontweight='bold')
     axes[0,0].set_xlabel('Time (seconds)')
@@ -215,9 +224,9 @@ def create_memory_trend_analysis(approx_df, chunked_df):
     approx_variance = approx_df['heapUsedMB'].rolling(window=100).std()
     chunked_variance = chunked_df['heapUsedMB'].rolling(window=100).std()
     
-    axes[1,0].plot(approx_df['relative_time'], approx_variance, 
+    plot_series(axes[1,0], approx_df['relative_time'], approx_variance, 
                   color='#FF6B6B', label='Approximation Variance', linewidth=1.5)
-    axes[1,0].plot(chunked_df['relative_time'], chunked_variance, 
+    plot_series(axes[1,0], chunked_df['relative_time'], chunked_variance, 
                   color='#4ECDC4', label='Chunked Variance', linewidth=1.5)
     axes[1,0].set_title('Memory Usage Stability', fontweight='bold')
     axes[1,0].set_xlabel('Time (seconds)')